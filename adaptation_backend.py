@@ -0,0 +1,483 @@
+#####################################################################
+# adaptation_backend.py
+# ------------------------------------------------------------------
+# This module provides the backends that perform the adaptation step,
+# i.e. the update operation of a misinformation game (MG) at a
+# position vector, together with the computation of the agents'
+# knowledge in the resulting MG. The AdaptationProcedure class only
+# talks to a backend through the following three methods:
+#
+#	1. compute_knowledge(MG):
+#		Computes the knowledge of an MG, without any update
+#		(used for the root).
+#
+#	2. unchanged_pos_vecs(MG):
+#		Returns the (sorted) list of all the position vectors, i.e.
+#		strategy profiles, where the update operation does NOT
+#		change the MG, computed in a single pass (used in
+#		preprocessing, see adaptation_procedure.preprocess_mg()).
+#
+#	3. adaptation_step(parent_MG, MG, pos_vec):
+#		Fills the utilities and the knowledge of the (empty) MG,
+#		applying the update operation on the parent_MG at pos_vec.
+#
+# The clingo backends have a delta mode (see the -dlt argument), where
+# adaptation_delta.lp is solved instead of adaptation.lp. The answer
+# set of a step has only the overwritten utilities (at most n * n),
+# instead of all the (n+1) * n * |SP| utilities, and the new MG is
+# the parent MG, where the overwritten utilities are replaced (see
+# MisinformationGame.utilities_from_clingo_delta()).
+#
+# The position vectors are tuples of integers, starting from 1, e.g.
+# (1, 2, 1), as computed by MisinformationGame.compute_pos_vecs().
+#
+# Classes:
+#
+#	1) ClingoBackend:		The reference backend. A system call to
+#							clingo (see clingo_subprocess.py,
+#							adaptation.lp and preprocessing.lp).
+#
+#	2) ClingoSessionBackend:
+#							Uses the clingo python API (pip install
+#							clingo), in-process. The axioms of
+#							adaptation.lp and the utilities of an MG are
+#							grounded once, in a clingo.Control object
+#							(a session). The pos/1 predicate is declared
+#							as an external atom, which is switched on
+#							and off across the solves. The sessions are
+#							kept in a bounded LRU cache, by the id of
+#							the MG, thus a parent MG rebuilt from its
+#							payload (see process_traversal.py) reuses
+#							its session.
+#
+#	3) NumpyBackend:		Implements the rule of adaptation.lp
+#							in-process, on the utilities tensor of the
+#							MG (see MisinformationGame.get_utilities_tensor()).
+#							Namely, the utilities of the actual game at
+#							the position vector are copied to every
+#							player's game.
+#
+#	4) CrossCheckBackend:	Uses the NumpyBackend, and cross-checks
+#							every result against the ClingoBackend.
+#							Useful for debugging.
+#####################################################################
+
+
+#############
+# Libraries #
+#############
+
+## Custom Libraries
+import clingo_subprocess
+import auxiliary_functions as ax
+from misinformation_game import MisinformationGame
+
+## Python Libraries
+import time
+import re
+from collections import OrderedDict
+from threading import Lock
+
+## 3rd party libraries
+import numpy as np
+
+## Optional 3rd party libraries
+try:
+	import clingo		# the clingo python API, i.e. pip install clingo
+	clingo_api_available = True
+except ImportError:
+	clingo_api_available = False
+
+
+#############
+# Constants #
+#############
+
+## The unchanged_at/1 predicate of preprocessing.lp, e.g.
+## unchanged_at(sp(1,sp(2,nul)))
+unchanged_at_clingo_regex = re.compile("unchanged_at\\((.*)\\)")
+
+## The pos/1 predicate as an external atom, one for every strategy
+## profile of the MG (see misinformation_game.lp)
+pos_external_clingo_rule = "#external pos(SP) : strategy_profile(SP)."
+
+## The axioms of the delta mode, see adaptation_delta.lp
+clingo_delta_axioms = "./adaptation_delta.lp"
+
+## The maximum number of clingo sessions (i.e. grounded MGs) to keep
+max_clingo_sessions = 64
+
+
+class backend_vals:
+	clingo	= 0
+	numpy	= 1
+	check	= 2
+	session	= 3
+
+backend_vals_list = [
+	backend_vals.clingo,
+	backend_vals.numpy,
+	backend_vals.check,
+	backend_vals.session
+]
+
+class backend_names:
+	clingo	= "Clingo"
+	numpy	= "NumPy"
+	check	= "NumPy (cross-checked with Clingo)"
+	session	= "Clingo (multi-shot session)"
+
+## Appended to the name of a backend, in the delta mode
+delta_name_suffix = ", delta"
+
+backend_names_list = [
+	backend_names.clingo,
+	backend_names.numpy,
+	backend_names.check,
+	backend_names.session
+]
+
+
+#############
+# Functions #
+#############
+
+## Create a backend, given its value (see backend_vals). The delta
+## mode is available only for the backends that call clingo.
+def create_backend(backend_val, debugging, delta = False):
+	assert backend_val in backend_vals_list
+	assert not delta or backend_val != backend_vals.numpy
+
+	if backend_val == backend_vals.clingo:
+		return ClingoBackend(debugging, delta=delta)
+
+	if backend_val == backend_vals.numpy:
+		return NumpyBackend(debugging)
+
+	if backend_val == backend_vals.check:
+		return CrossCheckBackend(debugging, delta=delta)
+
+	if backend_val == backend_vals.session:
+		return ClingoSessionBackend(debugging, delta=delta)
+
+
+## From a position vector, e.g. (1, 2), to the symbol of the
+## pos/1 predicate, i.e. pos(sp(1,sp(2,nul))). See also
+## auxiliary_functions.pos_vec2clingo().
+def pos_vec2symbol(pos_vec):
+	strategy_profile = clingo.Function("nul")
+	for strategy in reversed(pos_vec):
+		strategy_profile = clingo.Function("sp", [clingo.Number(strategy), strategy_profile])
+
+	return clingo.Function("pos", [strategy_profile])
+
+
+## From an answer set of preprocessing.lp to the sorted list of
+## the position vectors in the unchanged_at/1 predicates.
+def answer_set_to_unchanged_pos_vecs(answer_set):
+	pos_vecs = []
+	for token in answer_set.split(" "):
+		match = unchanged_at_clingo_regex.fullmatch(token)
+		if match == None: continue
+
+		# sp(1,sp(2,nul)) --> (1, 2)
+		pos_vecs.append(tuple(int(strategy) for strategy in re.findall("[0-9]+", match.group(1))))
+
+	pos_vecs.sort()
+	return pos_vecs
+
+
+###########
+# Classes #
+###########
+
+class ClingoBackend:
+
+	def __init__(self, debugging, clingo_axioms="./adaptation.lp", clingo_preprocessing="./preprocessing.lp", delta=False):
+		self.debugging				= debugging
+		self.clingo_axioms			= clingo_axioms
+		self.clingo_preprocessing	= clingo_preprocessing
+		self.delta					= delta
+
+		if delta: self.clingo_axioms = clingo_delta_axioms
+
+	def get_name(self):
+		if self.delta: return backend_names.clingo + delta_name_suffix
+		return backend_names.clingo
+
+	def get_backend_val(self):
+		return backend_vals.clingo
+
+	def is_delta(self):
+		return self.delta
+
+	## A timed call to clingo
+	def _clingo_call(self, clingo_mg_file, clingo_pos_vec, clingo_axioms):
+		clingo_call_start_t = time.time()
+		answer_set = clingo_subprocess.addaptation_step(clingo_mg_file, clingo_pos_vec, clingo_axioms)
+		clingo_call_end_t = time.time()
+		self.debugging.clingo_call(clingo_call_end_t - clingo_call_start_t)
+
+		return answer_set
+
+	## The answer set of adaptation.lp for the MG at the
+	## pos_vec. If pos_vec == None, no pos/1 predicate holds.
+	def _answer_set(self, MG, pos_vec):
+		if pos_vec is None: return self._clingo_call(MG.get_clingo_format_bytes(), "", self.clingo_axioms)
+
+		return self._clingo_call(MG.get_clingo_format_bytes(), ax.pos_vec2clingo(pos_vec), self.clingo_axioms)
+
+	## The answer set of preprocessing.lp for the MG
+	def _preprocessing_answer_set(self, MG):
+		return self._clingo_call(MG.get_clingo_format_bytes(), "", self.clingo_preprocessing)
+
+	def compute_knowledge(self, MG):
+		answer_set = self._answer_set(MG, None)
+		MG.compute_knowledge_from_answer_set(answer_set)
+
+	def unchanged_pos_vecs(self, MG):
+		answer_set = self._preprocessing_answer_set(MG)
+
+		return answer_set_to_unchanged_pos_vecs(answer_set)
+
+	def adaptation_step(self, parent_MG, MG, pos_vec):
+		answer_set = self._answer_set(parent_MG, pos_vec)
+
+		if self.delta:	MG.utilities_from_clingo_delta(parent_MG, answer_set)
+		else:			MG.utilities_from_clingo(answer_set)
+
+
+## A single clingo.Control object, where the axioms and the
+## utilities of an MG are grounded once. Every solve assigns
+## (at most) a single pos/1 external atom to true.
+class ClingoSession:
+
+	def __init__(self, clingo_program):
+		self.control = clingo.Control()
+		self.control.add("base", [], clingo_program)
+		self.control.ground([("base", [])])
+
+		self.pos_symbol	= None		# the pos/1 atom currently assigned to true
+		self.lock		= Lock()	# a Control object is not thread safe
+
+	## The answer set, as a string, in the format of the clingo
+	## command's output, e.g. "v(0,1,sp(1,sp(1,nul)),3) ... answer_set"
+	def solve(self, pos_symbol):
+		with self.lock:
+			if self.pos_symbol is not None:
+				self.control.assign_external(self.pos_symbol, False)
+
+			if pos_symbol is not None:
+				self.control.assign_external(pos_symbol, True)
+
+			self.pos_symbol = pos_symbol
+
+			answer_sets = []
+			self.control.solve(
+				on_model=lambda model: answer_sets.append(
+					" ".join(str(symbol) for symbol in model.symbols(shown=True))
+				)
+			)
+
+		return answer_sets[-1]
+
+
+class ClingoSessionBackend(ClingoBackend):
+
+	def __init__(self, debugging, clingo_axioms="./adaptation.lp", clingo_preprocessing="./preprocessing.lp", max_sessions=max_clingo_sessions, delta=False):
+		assert clingo_api_available, "ClingoSessionBackend: the clingo python package is not installed!"
+		super().__init__(debugging, clingo_axioms, clingo_preprocessing, delta)
+
+		self.clingo_axioms_program = \
+			clingo_subprocess.get_axioms(self.clingo_axioms).decode() + "\n" + pos_external_clingo_rule + "\n"
+		self.clingo_preprocessing_program = \
+			clingo_subprocess.get_axioms(clingo_preprocessing).decode() + "\n"
+
+		self.max_sessions	= max_sessions
+		self.sessions		= OrderedDict()		# MG id --> ClingoSession, in LRU order
+		self.sessions_lock	= Lock()
+
+	def get_name(self):
+		if self.delta: return backend_names.session + delta_name_suffix
+		return backend_names.session
+
+	def get_backend_val(self):
+		return backend_vals.session
+
+	## The session of the MG. If the MG has no session, it is
+	## grounded. The least recently used session is dropped,
+	## when there are more than max_sessions sessions.
+	## NOTE: the sessions are keyed by the id of the MG, not by
+	## the MG object, since on the process pool every task rebuilds
+	## its parent MG from the payload. The ids are unique within an
+	## adaptation procedure.
+	def _session(self, MG):
+		mg_id = MG.get_game_id()
+
+		with self.sessions_lock:
+			if mg_id in self.sessions:
+				self.sessions.move_to_end(mg_id)
+				return self.sessions[mg_id]
+
+		# grounding out of the lock, other threads may solve meanwhile
+		session = ClingoSession(self.clingo_axioms_program + MG.get_clingo_format())
+
+		with self.sessions_lock:
+			# another thread may have grounded the same MG
+			session = self.sessions.setdefault(mg_id, session)
+			self.sessions.move_to_end(mg_id)
+			if len(self.sessions) > self.max_sessions:
+				self.sessions.popitem(last=False)
+
+		return session
+
+	## A timed solve in the session of the MG
+	def _answer_set(self, MG, pos_vec):
+		clingo_call_start_t = time.time()
+
+		pos_symbol = None
+		if pos_vec is not None: pos_symbol = pos_vec2symbol(pos_vec)
+		answer_set = self._session(MG).solve(pos_symbol)
+
+		clingo_call_end_t = time.time()
+		self.debugging.clingo_call(clingo_call_end_t - clingo_call_start_t)
+
+		return answer_set
+
+	## A timed, single (one-shot) solve of preprocessing.lp
+	def _preprocessing_answer_set(self, MG):
+		clingo_call_start_t = time.time()
+
+		session = ClingoSession(self.clingo_preprocessing_program + MG.get_clingo_format())
+		answer_set = session.solve(None)
+
+		clingo_call_end_t = time.time()
+		self.debugging.clingo_call(clingo_call_end_t - clingo_call_start_t)
+
+		return answer_set
+
+
+class NumpyBackend:
+
+	def __init__(self, debugging):
+		self.debugging = debugging
+
+	def get_name(self):
+		return backend_names.numpy
+
+	def get_backend_val(self):
+		return backend_vals.numpy
+
+	def is_delta(self):
+		return False
+
+	## From a position vector, e.g. (1, 2), to an index of the
+	## utilities tensor, e.g. (0, 1). If the position vector is
+	## not a strategy profile of the MG, returns None. (In this
+	## case, the pos/1 predicate matches no strategy profile
+	## in adaptation.lp, i.e. the MG remains unchanged.)
+	def _index(self, strategies, pos_vec):
+		if len(pos_vec) != len(strategies): return None
+
+		for strategy, num_strategies in zip(pos_vec, strategies):
+			if strategy < 1 or strategy > num_strategies: return None
+
+		return tuple(strategy - 1 for strategy in pos_vec)
+
+	## The knowledge of the agents, as the new_frac_knowledge/2
+	## predicate of adaptation.lp, i.e. the number of (player's game,
+	## player, strategy profile) entries that agree with the actual
+	## game, and the total number of such entries.
+	def _knowledge(self, tensor):
+		num_players = tensor.shape[-1]
+
+		knowledge		= int(np.count_nonzero(tensor[1:] == tensor[0]))
+		total_knowledge	= tensor[0].size * num_players
+
+		return knowledge, total_knowledge
+
+	def compute_knowledge(self, MG):
+		knowledge, total_knowledge = self._knowledge(MG.get_utilities_tensor())
+		MG.set_knowledge(knowledge, total_knowledge)
+
+	def unchanged_pos_vecs(self, MG):
+		tensor = MG.get_utilities_tensor()
+
+		# unchanged[index] == True, iff every player's game agrees
+		# with the actual game at the strategy profile index, i.e.
+		# a single comparison of games[0] against games[1..n].
+		unchanged = np.all(tensor[1:] == tensor[0], axis=(0, tensor.ndim - 1))
+
+		pos_vecs = [tuple(int(strategy) + 1 for strategy in index) for index in np.argwhere(unchanged)]
+		pos_vecs.sort()
+
+		return pos_vecs
+
+	def adaptation_step(self, parent_MG, MG, pos_vec):
+		tensor		= parent_MG.get_utilities_tensor()
+		new_tensor	= tensor.copy()
+
+		index = self._index(parent_MG.get_strategies(), pos_vec)
+		if index is not None:
+			new_tensor[(slice(None),) + index] = tensor[(0,) + index]
+
+		MG.utilities_from_tensor(new_tensor)
+
+		knowledge, total_knowledge = self._knowledge(new_tensor)
+		MG.set_knowledge(knowledge, total_knowledge)
+
+
+class CrossCheckBackend:
+
+	def __init__(self, debugging, delta=False):
+		self.debugging			= debugging
+		self.numpy_backend		= NumpyBackend(debugging)
+		self.clingo_backend		= ClingoBackend(debugging, delta=delta)
+
+	def get_name(self):
+		if self.is_delta(): return backend_names.check + delta_name_suffix
+		return backend_names.check
+
+	def get_backend_val(self):
+		return backend_vals.check
+
+	def is_delta(self):
+		return self.clingo_backend.is_delta()
+
+	## An empty copy of the MG, to be filled by the reference backend
+	def _reference_mg(self, MG):
+		return MisinformationGame(
+			MG.gambit_pac,
+			MG.debugging,
+			MG.domain,
+			MG.get_game_id(),
+			MG.get_num_players(),
+			MG.get_strategies()
+		)
+
+	def compute_knowledge(self, MG):
+		self.numpy_backend.compute_knowledge(MG)
+		knowledge = MG.get_knowledge_percentage()
+
+		self.clingo_backend.compute_knowledge(MG)
+		assert knowledge == MG.get_knowledge_percentage(), \
+			"CrossCheckBackend: knowledge differs for MG " + MG.get_game_id() + "!"
+
+	def unchanged_pos_vecs(self, MG):
+		pos_vecs = self.numpy_backend.unchanged_pos_vecs(MG)
+
+		assert pos_vecs == self.clingo_backend.unchanged_pos_vecs(MG), \
+			"CrossCheckBackend: unchanged position vectors differ for MG " + MG.get_game_id() + "!"
+
+		return pos_vecs
+
+	def adaptation_step(self, parent_MG, MG, pos_vec):
+		self.numpy_backend.adaptation_step(parent_MG, MG, pos_vec)
+
+		reference_MG = self._reference_mg(MG)
+		self.clingo_backend.adaptation_step(parent_MG, reference_MG, pos_vec)
+
+		assert np.array_equal(MG.get_utilities_tensor(), reference_MG.get_utilities_tensor()), \
+			"CrossCheckBackend: utilities differ after update of MG " + parent_MG.get_game_id() + " at " + str(pos_vec) + "!"
+		assert MG.get_knowledge_percentage() == reference_MG.get_knowledge_percentage(), \
+			"CrossCheckBackend: knowledge differs after update of MG " + parent_MG.get_game_id() + " at " + str(pos_vec) + "!"
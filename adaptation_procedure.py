@@ -78,33 +78,34 @@
 
 # custom libraries
 from misinformation_game import MisinformationGame
-import clingo
+import adaptation_backend as ab
+import scheduler as sch
+from adaptation_tree import AdaptationTree
 import gambit
 import auxiliary_functions as ax
+import process_traversal
+from debugging import histogram_names, skipped_names, gauge_names
 
 # python libraries
-import itertools	# itertools.product for preprocessing
 import re  			# regex
 import math  		# prod
 import time  		# process_time
 import sys
 from os import path	# is dir
+import os			# replace
+import pickle
 import pprint
+import json
 import threading
+import itertools		# count
+from array import array
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, wait, FIRST_COMPLETED
 
 # 3rd party libraries
 # NOTE: Simple, lightweight and extensible Tree data structure.
 # See Doc: https://anytree.readthedocs.io/en/latest/
-from anytree import NodeMixin, RenderTree
-
-#############
-# Constants #
-#############
-
-changed_clingo_predicate = "changed"
-unchanged_clingo_predicate = "unchanged"
-
-
+from anytree import RenderTree
 
 ####################
 # Helper Functions #
@@ -116,18 +117,13 @@ unchanged_clingo_predicate = "unchanged"
 # the agents in an MG. Namely, the position vectors, of
 # some MG, such that, when applied the update operation
 # on MG at the position designated by pos_vec, no change
-# occurs.
+# occurs. The update operation is performed by the given
+# adaptation backend (see adaptation_backend.py).
 ###########################################################
-def preprocess_mg(mg, strategies):
-	num_players = len(strategies)
-
-	unique_key = []
-	for pos_vec in itertools.product(*[strategies] * num_players):
-		clingo_pos_vec = ax.pos_vec2clingo(pos_vec)
-		answer_set = clingo.addaptation_step(mg.get_clingo_format(), clingo_pos_vec)
-
-		if unchanged_clingo_predicate in answer_set:
-			unique_key.append(pos_vec)
+def preprocess_mg(mg, adaptation_backend):
+	# all the strategy profiles (1-based), where the update
+	# operation leaves the MG unchanged, in a single pass
+	unique_key = adaptation_backend.unchanged_pos_vecs(mg)
 
 	return ax.path_to_set(unique_key)
 
@@ -135,45 +131,45 @@ def preprocess_mg(mg, strategies):
 # Classes #
 ###########
 
-class AdaptationNode(NodeMixin):
-
-	def __init__(self, node_id, nme_path, unique_key, MG, parent=None, changed_from_parent=True, new_mg=True):
-		assert MG != None
+## A view of a node of the Adaptation Tree, i.e. of a row of the
+## (columnar) AdaptationTree, see adaptation_tree.py. The views are
+## created on demand; only the nodes waiting to be expanded are kept.
+class AdaptationNode:
 
-		# some bookkeeping
-		self.node_id = node_id
-
-		# initialize anytree node
-		NodeMixin.__init__(self)
-		self.parent = parent  # set parent, if any
-		self.name = "N_" + node_id + ", MG_" + MG.get_game_id() + ", (" + str(MG.get_knowledge_percentage()) + "%)" # set name to be printed, when
-		# we render the tree
+	def __init__(self, tree, index, unique_key=None):
+		# the row of the node in the tree
+		self.tree	= tree
+		self.index	= index
 
 		# "pointer" to a misinformation game
-		self.misinformation_game = MG
-
-		# We keep the path of NMEs that got us to
-		# this node in the adaptation tree, starting
-		# from the root.
-		self.nme_path = nme_path
+		self.misinformation_game = tree.get_mg(index)
 
 		# We create a set from the path of NMEs.
-		# We encode the set as tuple, i.e.
-		# we delete duplicates and sort.
+		# We encode the set as an integer bitmask
+		# over the strategy profiles (see
+		# ax.path_to_mask()), i.e. we delete
+		# duplicates and forget the order.
 		# The unique key is the "key" of the
 		# mis_game_pool dictionary
 		# (see below class AdaptationProcedure)
+		# If not given, it is reconstructed from
+		# the tree.
+		if unique_key is None:
+			unique_key = tree.get_unique_key(index)
 		self.unique_key = unique_key
 
-		## State
-		# We keep a boolean variable, that's true
-		# iff this node is different from it's
-		# parent.
-		# By default the root is different.
-		self.changed_from_parent = changed_from_parent
+	################
+	# Tree (Views) #
+	################
 
-		# is a new MG, by default the root is
-		self.new_mg = new_mg
+	# The name and the children of the node, as used by RenderTree
+	@property
+	def name(self):
+		return self.tree.get_name(self.index)
+
+	@property
+	def children(self):
+		return [AdaptationNode(self.tree, child) for child in self.tree.get_children(self.index)]
 
 	##########
 	# String #
@@ -183,8 +179,8 @@ class AdaptationNode(NodeMixin):
 		hline = "-" * 40
 		return "| Node Name: " + self.name + "\n" \
 			   + "| Unique MG id: " + str(self.misinformation_game.game_id) + "\n" \
-			   + "| Previous NMEs Path: " + str(self.nme_path) + "\n" \
-			   + "| Unique Key: " + str(self.unique_key) + "\n" \
+			   + "| Previous NMEs Path: " + str(self.get_nme_path()) + "\n" \
+			   + "| Unique Key: " + str(self.get_unique_key_set()) + "\n" \
 			   + "| NMEs: " + str(self.misinformation_game.nme.keys()) + "\n"
 
 	#############
@@ -192,13 +188,16 @@ class AdaptationNode(NodeMixin):
 	#############
 
 	def is_changed_from_father(self):
-		return self.changed_from_parent
+		return self.tree.is_changed_from_parent(self.index)
 
 	def is_new_mg(self):
-		return self.new_mg
+		return self.tree.is_new_mg(self.index)
+
+	def get_index(self):
+		return self.index
 
 	def get_node_id(self):
-		return self.node_id
+		return self.tree.get_node_id(self.index)
 
 	def get_mg_id(self):
 		return self.misinformation_game.get_game_id()
@@ -206,12 +205,18 @@ class AdaptationNode(NodeMixin):
 	def get_mg_pointer(self):
 		return self.misinformation_game
 
+	# The path of NMEs that got us to this node
+	# in the adaptation tree, starting from the root
 	def get_nme_path(self):
-		return self.nme_path
+		return self.tree.get_nme_path(self.index)
 
 	def get_unique_key(self):
 		return self.unique_key
 
+	# The unique key in the (human-readable) form of ax.path_to_set()
+	def get_unique_key_set(self):
+		return ax.mask_to_set(self.unique_key, self.get_strategies())
+
 	def get_num_players(self):
 		return self.misinformation_game.get_num_players()
 
@@ -242,13 +247,27 @@ class AdaptationNode(NodeMixin):
 # ------------------------------------------------------------------
 # Data Members:
 #	1. mis_game_pool:	A dictionary of the form
-#							dict: (nme_1, ...,nme_k) --> MG
+#							dict: {nme_1, ...,nme_k} --> MG
 #						Observe that the nmes are strategy profiles,
 #						i.e.: positions in the original game. We keep
 #						the positions that changed from the original
 #						game.
-#						We force the tuple of tuples (nme_1, ...,nme_k)
-#						to be a set, i.e. no duplicates.
+#						The set {nme_1, ...,nme_k} is encoded as an
+#						integer bitmask over the strategy profiles
+#						(see ax.path_to_mask()). Use ax.mask_to_set()
+#						for the human-readable form.
+#						The pool contains only completed MGs.
+#
+#	2. mis_game_futures:	A dictionary of the form
+#							dict: {nme_1, ...,nme_k} --> Future
+#						of the MGs that a traversal thread currently
+#						computes. A thread that requests such a MG
+#						waits on its future, see get_mis_game().
+#
+#	3. checkpoint_path:	(Optional) The state of the procedure is
+#						saved to this file, every checkpoint_interval
+#						seconds, see export_checkpoint(). A saved
+#						procedure continues with root_from_checkpoint().
 #
 #####################################################################
 class AdaptationProcedure:
@@ -264,7 +283,11 @@ class AdaptationProcedure:
 			domain,
 			num_mult_threads_traversal = 4,
 			quiet = False,
-			fast_mode = False
+			fast_mode = False,
+			adaptation_backend = None,
+			num_processes = 1,
+			scheduler = None,
+			mg_store = None
 	):
 
 		# Prelimineries: Fast mode
@@ -281,45 +304,64 @@ class AdaptationProcedure:
 
 		# Prelimineries: Domain
 		self.domain = domain
+
+		# Prelimineries: Adaptation Backend (by default, clingo)
+		if adaptation_backend is None:
+			adaptation_backend = ab.ClingoBackend(debugging)
+		self.adaptation_backend = adaptation_backend
 		
 
 		## A pool of Misinformation Games
 		self.mis_game_pool = dict()
-		self.uniq_mg_counter = 0
-		## Lock for mg_pool
-		self.mis_game_pool_lock = threading.Lock()
-
-
-		## Initial set of nodes
-		self.queue = []
-		## Lock for queue
-		self.queue_lock		= threading.Lock()
+		## The MGs in flight, i.e. the futures of the MGs being computed
+		self.mis_game_futures = dict()
+		## Lock for mg_pool and mg_futures
+		self.mis_game_pool_lock = debugging.new_lock("mis_game_pool_lock")
+		## The ids of the MGs, see _next_mg_id()
+		self.uniq_mg_ids = itertools.count()
+
+		## (Optional) The out-of-core store of the MGs, i.e. the
+		## completed MGs are spilled to disk, see mg_store.py
+		self.mg_store = mg_store
+
+
+		## The nodes to be expanded, the order of the expansion is
+		## decided by the scheduler (by default, DFS), see scheduler.py
+		if scheduler is None:
+			scheduler = sch.DFSScheduler()
+		## (Optional) Profiling of the lock of the scheduler, the work
+		## stealing scheduler has no lock
+		if debugging.is_profiling() and hasattr(scheduler, "lock"):
+			scheduler.lock = debugging.new_lock("scheduler_lock")
+		self.scheduler = scheduler
+		## Lock for waiting new nodes, see traversal_thread_operate()
+		self.queue_lock		= debugging.new_lock("queue_lock")
 		self.queue_empty	= threading.Condition(self.queue_lock)
+		self.idle_workers	= 0		# the threads waiting on queue_empty
 
-		## List of leaves
-		self.leaves = []
+		## List of leaves, i.e. their indices in the tree
+		self.leaves = array("q")
 		## Lock for leaves
-		self.leaves_lock = threading.Lock()
+		self.leaves_lock = debugging.new_lock("leaves_lock")
 
 		## Terminal Set,
 		## set of the stable games
 		self.terminal_set = set()
 		## Lock for Terminal Set
-		self.terminal_set_lock = threading.Lock()
+		self.terminal_set_lock = debugging.new_lock("terminal_set_lock")
 
 		## Stable misinformed equilibria
 		self.smes = set()
 		## Lock for SMEs
-		self.smes_lock = threading.Lock()
+		self.smes_lock = debugging.new_lock("smes_lock")
 
 		# the root of the adaptation procedure
 		# initialized to None at the beginning
 		self.root = None
 
-		## We keep a list of the nodes
-		self.node_list = []
-		## Node List Lock
-		self.node_list_lock = threading.Lock()
+		## We keep the nodes in a compact (columnar)
+		## tree, see adaptation_tree.py
+		self.tree = AdaptationTree(debugging.new_lock("tree_lock"))
 
 		## Statistics
 		self.cpu_time	= time.process_time()  # CPU time (not including GAMBIT or CLINGO)
@@ -337,23 +379,62 @@ class AdaptationProcedure:
 		# Multithreading #
 		##################
 		self.tasks			= 0
-		self.tasks_lock		= threading.Lock()
+		self.tasks_lock		= debugging.new_lock("tasks_lock")
 		self.pending_tasks	= threading.Condition(self.tasks_lock)
 
 		self.traversal_threading_operation_on = True
 		self.num_mult_threads_traversal = num_mult_threads_traversal
 
 		assert num_mult_threads_traversal >= 1
+		assert num_processes >= 1
+		assert num_processes == 1 or num_mult_threads_traversal == 1
+
+		################
+		# Process Pool #
+		################
+		# With more than one process, the adaptation procedure is
+		# traversed by the main thread, while the new MGs are computed
+		# on a pool of processes, see _process_pool_traversal()
+		self.num_processes	= num_processes
+		self.process_pool	= None
+		self.in_flight		= dict()	# unique key --> [(child_num, parent, pos_vec)],
+										# the nodes waiting the MG of the key
+		self.futures		= dict()	# future --> unique key
+
+		##############
+		# Checkpoint #
+		##############
+		# (Optional) The state is saved periodically, see
+		# set_checkpoint(). The traversal threads are paused during
+		# a checkpoint, i.e. no thread is in the middle of an
+		# adaptation step, see _begin_step().
+		self.checkpoint_path		= None
+		self.checkpoint_interval	= None
+		self.last_checkpoint_t		= None
+		self.num_checkpoints		= 0
+
+		self.paused			= False
+		self.active_steps	= 0		# the threads doing an adaptation step
+		self.pause_lock		= debugging.new_lock("pause_lock")
+		self.pause_cond		= threading.Condition(self.pause_lock)
+
+		## The nodes waiting a MG, when the checkpoint was saved,
+		## see root_from_checkpoint()
+		self.resumed_in_flight = []
+
 		self.workers = []
-		for i in range(num_mult_threads_traversal):
-			self.workers.append(threading.Thread(target=self.traversal_thread_operate))
+		if not self.is_process_pool_on():
+			for i in range(num_mult_threads_traversal):
+				self.workers.append(threading.Thread(target=self.traversal_thread_operate, args=(i,)))
 
 	
 	##################
 	# Multithreading #
 	##################
 	
-	def traversal_thread_operate(self):
+	def traversal_thread_operate(self, worker_id):
+
+		self.scheduler.register_worker(worker_id)
 
 		while self.traversal_threading_operation_on:
 
@@ -361,40 +442,50 @@ class AdaptationProcedure:
 			# Acquire Adaptation Node #
 			###########################
 
+			## Get an Adaptation Node from the scheduler
+			self._begin_step()
+			parent = self._pop()
 
-			## Acquire the lock
-			self.queue_lock.acquire()
 
+			## If no node is available, wait. The idle_workers counter
+			## is increased before checking the scheduler, thus a thread
+			## pushing a node after the check will wake us, see
+			## _insert_child()
+			if parent is None:
+				self._end_step()
 
-			## If the queue is empty, wait
-			while self.queue == [] and self.traversal_threading_operation_on:
-				self.tasks_lock.acquire()
-				self.pending_tasks.notify_all()
-				self.tasks_lock.release()
+				wait_start_t = time.time()
+				self.queue_lock.acquire()
+				self.idle_workers += 1
 
-				self.queue_empty.wait()
+				while self.scheduler.is_empty() and self.traversal_threading_operation_on:
+					self.tasks_lock.acquire()
+					self.pending_tasks.notify_all()
+					self.tasks_lock.release()
 
-			## If you woke from waiting, with an empty queue return
-			if self.queue == [] and not self.traversal_threading_operation_on:
-				self.queue_lock.release()
-				return
-
-			## Get an Adaptation Node from the queue
-			parent = self.queue.pop()
+					self.queue_empty.wait()
 
+				self.idle_workers -= 1
+				self.queue_lock.release()
 
-			## Release the lock
-			self.queue_lock.release()
+				wait_t = time.time() - wait_start_t
+				self.debugging.observe(histogram_names.queue_wait, wait_t)
+				self.debugging.worker_idle(worker_id, wait_t)
+				continue
 
 
 			#########################
 			# Do an Adaptation Step #
 			#########################
 
+			self.debugging.add_gauge(gauge_names.active_workers, 1)
+			step_start_t = time.time()
 			self._adaptation_step(parent)
+			self.debugging.worker_busy(worker_id, time.time() - step_start_t)
+			self.debugging.add_gauge(gauge_names.active_workers, -1)
 
 			if not self.quiet:
-				print("# Progress Uniq MGs: " + str(self.uniq_mg_counter) + "/" + str(self.max_it), end="\r")
+				print("# Progress Uniq MGs: " + str(len(self.mis_game_pool)) + "/" + str(self.max_it), end="\r")
 
 			#############################
 			# Decrease the task counter #
@@ -408,15 +499,71 @@ class AdaptationProcedure:
 
 			self.tasks_lock.release()
 
+			self._end_step()
+
+	## With checkpoints on, the main thread wakes up every
+	## checkpoint_interval seconds, in order to save the state
 	def wait_for_results(self):
 
 		self.tasks_lock.acquire()
 		while self.tasks > 0:
-			self.pending_tasks.wait()
+			self.pending_tasks.wait(self.checkpoint_interval)
+
+			if self.tasks > 0 and self._is_checkpoint_due():
+				self.tasks_lock.release()
+				self.checkpoint()
+				self.tasks_lock.acquire()
 		self.tasks_lock.release()
 		
 		self.adaptation_procedure_completed = True
 
+	## Push (pop) a node to (from) the scheduler, and update the
+	## queue depth, see debugging.gauge_names
+	def _push(self, node):
+		self.scheduler.push(node)
+		self.debugging.add_gauge(gauge_names.queue_depth, 1)
+
+	def _pop(self):
+		node = self.scheduler.pop()
+		if node is not None: self.debugging.add_gauge(gauge_names.queue_depth, -1)
+
+		return node
+
+	## A traversal thread enters (or leaves) an adaptation step. While
+	## a checkpoint is saved, no thread enters a new step, see _pause().
+	def _begin_step(self):
+		if self.checkpoint_path is None: return
+
+		self.pause_lock.acquire()
+		while self.paused:
+			self.pause_cond.wait()
+		self.active_steps += 1
+		self.pause_lock.release()
+
+	def _end_step(self):
+		if self.checkpoint_path is None: return
+
+		self.pause_lock.acquire()
+		self.active_steps -= 1
+		if self.active_steps == 0: self.pause_cond.notify_all()
+		self.pause_lock.release()
+
+	## Waits for the traversal threads to complete their adaptation
+	## steps. A step of a thread may wait a MG computed by another
+	## thread, which is also in a step, thus the pause always completes.
+	def _pause(self):
+		self.pause_lock.acquire()
+		self.paused = True
+		while self.active_steps > 0:
+			self.pause_cond.wait()
+		self.pause_lock.release()
+
+	def _unpause(self):
+		self.pause_lock.acquire()
+		self.paused = False
+		self.pause_cond.notify_all()
+		self.pause_lock.release()
+
 
 	def turn_off(self):
 
@@ -433,8 +580,9 @@ class AdaptationProcedure:
 
 	
 	def __del__(self):
-		for i in range(self.num_mult_threads_traversal):
-			self.workers[i].join()
+		# NOTE: the last reference may be dropped by a worker
+		for worker in self.workers:
+			if worker.is_alive() and worker is not threading.current_thread(): worker.join()
 
 	
 
@@ -451,20 +599,54 @@ class AdaptationProcedure:
 		assert self.adaptation_procedure_completed == True
 		return pprint.pformat(self.smes)
 
-	def print_tree(self):
+	# The lines of the tree figure, one at a time. RenderTree keeps
+	# only the views of the current branch, thus the memory is bounded
+	# by the depth (and the branching) of the tree.
+	def iter_tree(self):
 		assert self.adaptation_procedure_completed == True
 
 		for pre, _, node in RenderTree(self.root):
-			print("%s%s" % (pre, node.name))
+			yield "%s%s" % (pre, node.name) + "\n"
+
+	def print_tree(self):
+		for line in self.iter_tree(): print(line, end="")
 
 	def str_tree(self):
+		return "".join(self.iter_tree())
+
+	def export_tree(self, file_path):
+		f = open(file_path, "w")
+		f.writelines(self.iter_tree())
+		f.close()
+
+	# The nodes of the tree, one JSON object per line (NDJSON), in the
+	# order of their insertion, i.e. a node follows its parent:
+	#	{"node": 3, "parent": 1, "mg": "2", "pos_vec": [1, 2],
+	#	 "changed": true, "new_mg": false}
+	# The root has "parent": -1, "pos_vec": null, and its "nme_path".
+	def iter_tree_ndjson(self):
 		assert self.adaptation_procedure_completed == True
 
-		output = ""
-		for pre, _, node in RenderTree(self.root):
-			output += "%s%s" % (pre, node.name) + "\n"
+		for index in range(len(self.tree)):
+			pos_vec = self.tree.get_pos_vec(index)
 
-		return output
+			record = {
+				"node"		: index,
+				"parent"	: self.tree.get_parent(index),
+				"mg"		: self.tree.get_mg(index).get_game_id(),
+				"pos_vec"	: list(pos_vec) if pos_vec is not None else None,
+				"changed"	: self.tree.is_changed_from_parent(index),
+				"new_mg"	: self.tree.is_new_mg(index)
+			}
+			if index == self.root.get_index():
+				record["nme_path"] = [list(pos_vec) for pos_vec in self.root.get_nme_path()]
+
+			yield json.dumps(record, separators=(",", ":")) + "\n"
+
+	def export_tree_ndjson(self, file_path):
+		f = open(file_path, "w")
+		f.writelines(self.iter_tree_ndjson())
+		f.close()
 
 	def print_root(self):
 
@@ -474,39 +656,37 @@ class AdaptationProcedure:
 	def root_export(self):
 		return self.root.misinformation_game.export()
 
-	def print_nodes(self):
+	def iter_nodes(self):
 		assert self.adaptation_procedure_completed == True
 
-		for node in self.node_list:
-			print(node)
+		for index in range(len(self.tree)):
+			yield str(AdaptationNode(self.tree, index)) + "\n"
+
+	def print_nodes(self):
+		for node in self.iter_nodes(): print(node, end="")
 	
 	def str_nodes(self):
-		assert self.adaptation_procedure_completed == True
-		
-		output = ""
-		for node in self.node_list: output += str(node) + "\n"
-		
-		return output
+		return "".join(self.iter_nodes())
 	
 
 	def print_leaves(self):
 		assert self.adaptation_procedure_completed == True
 
 		for leaf in self.leaves:
-			print(leaf)
+			print(AdaptationNode(self.tree, leaf))
 
 	def print_stable_set(self):
 		assert self.adaptation_procedure_completed == True
 
 		for s in self.terminal_set:
-			print("MG_" + self.mis_game_pool[s].get_game_id() + ": " + str(s))
+			print("MG_" + self.mis_game_pool[s].get_game_id() + ": " + str(self._unique_key_set(s)))
 
 	def print_mg_pool(self):
 		assert self.adaptation_procedure_completed == True
 
 		for key in self.mis_game_pool.keys():
 			print(self.mis_game_pool[key])
-			print("| Unique Key: " + str(key) + "\n")
+			print("| Unique Key: " + str(self._unique_key_set(key)) + "\n")
 	
 	def str_mg_pool(self):
 		assert self.adaptation_procedure_completed == True
@@ -514,7 +694,7 @@ class AdaptationProcedure:
 		output = ""
 		for key in self.mis_game_pool.keys():
 			output += str(self.mis_game_pool[key])
-			output += "| Unique Key: " + str(key) + "\n"
+			output += "| Unique Key: " + str(self._unique_key_set(key)) + "\n"
 		
 		return output
 
@@ -575,7 +755,7 @@ class AdaptationProcedure:
 			MG = self.mis_game_pool[unique_key]
 			ss_file_path = ss_dir_path + "stable_mg" + MG.get_game_id() + ".mg"
 			f = open(ss_file_path, "w")
-			f.write("# Unique Key: " + str(unique_key) + "\n")
+			f.write("# Unique Key: " + str(self._unique_key_set(unique_key)) + "\n")
 			f.write(MG.export())
 			f.close()
 
@@ -588,7 +768,7 @@ class AdaptationProcedure:
 
 		for unique_key in self.terminal_set:
 			MG = self.mis_game_pool[unique_key]
-			output += "# Unique Key: " + str(unique_key) + "\n"
+			output += "# Unique Key: " + str(self._unique_key_set(unique_key)) + "\n"
 			output += MG.export()
 			output += "\n\n"
 
@@ -603,9 +783,11 @@ class AdaptationProcedure:
 
 		print("+" + "-" * 39)
 		print("| NE Method: " + self.gambit_pac.get_default_method_name())
+		print("| Adaptation Backend: " + self.adaptation_backend.get_name())
+		print("| Scheduler: " + self.scheduler.get_name())
 		print("| Total: " + str(self.total_time) + "(s)")
 		print("| CPU time: " + str(self.cpu_time) + "(s)")
-		print("| Number of nodes: " + str(len(self.node_list)))
+		print("| Number of nodes: " + str(len(self.tree)))
 		print("| Number of unique MGs: " + str(len(self.mis_game_pool.items())))
 		print("| Number of leaves: " + str(len(self.leaves)))
 		print("| Number of Unique Terminal Games: " + str(len(self.terminal_set)))
@@ -619,11 +801,21 @@ class AdaptationProcedure:
 	def get_is_adaptation_concluded(self):
 		return self.adaptation_procedure_completed
 	
+	# The unique key in the (human-readable) form of ax.path_to_set()
+	def _unique_key_set(self, unique_key):
+		return ax.mask_to_set(unique_key, self.root.get_strategies())
+
+	def is_process_pool_on(self):
+		return self.num_processes > 1
+	
+	def get_num_processes(self):
+		return self.num_processes
+	
 	def get_total_mgs(self):
 		return self.max_it
 	
 	def get_progress_computed_mgs(self):
-		return self.uniq_mg_counter
+		return len(self.mis_game_pool)
 
 	def get_num_players(self):
 		assert self.root_initialized == True
@@ -644,12 +836,18 @@ class AdaptationProcedure:
 				self.gambit_pac.get_default_method_name(),  # Method's Name
 				self.total_time,  # total time
 				self.cpu_time,  # cpu time
-				len(self.node_list),  # number of nodes
+				len(self.tree),  # number of nodes
 				len(self.mis_game_pool.items()),  # number of unique misinformation games
 				len(self.leaves),  # number of leaves
 				len(self.terminal_set),  # number of terminal set, aka stable set, aka uniq leaf mis. games
 				len(self.smes)]  # number of smes
 	
+	def get_num_checkpoints(self):
+		return self.num_checkpoints
+
+	def get_mg_store(self):
+		return self.mg_store
+
 	def get_max_knowledge(self):
 		if self.max_knowledge_percentage is None:
 			self.find_gretest_knowledge()
@@ -660,18 +858,64 @@ class AdaptationProcedure:
 	# Predicates #
 	##############
 
+	# True, if the MG is in the pool, or in flight, i.e. computed by
+	# another thread. Otherwise, *this* thread claims the MG: a future
+	# is registered for the key, and the thread proceeds to compute the
+	# new MG, see _new_mis_game() and _publish_mis_game().
 	def mg_already_computed(self, new_unique_key):
 		self.mis_game_pool_lock.acquire()
-		is_already_computed = new_unique_key in self.mis_game_pool.keys()
+		is_already_computed = 	new_unique_key in self.mis_game_pool or \
+								new_unique_key in self.mis_game_futures
 
-		## If the MG is NOT already computed, then *this* thread will
-		## proceed to compute the new MG. Therefore, the lock will
-		## be released in _new_mis_game() method. (See also, the related
-		## comment there).
-		if is_already_computed: self.mis_game_pool_lock.release()
+		if not is_already_computed:
+			self.mis_game_futures[new_unique_key] = Future()
+
+		self.mis_game_pool_lock.release()
 
 		return is_already_computed
 
+	#############
+	# MG Access #
+	#############
+
+	# Returns the MG of the key, after mg_already_computed() returned
+	# True. If the MG is in flight, waits only on its future, while the
+	# rest of the threads keep going.
+	def get_mis_game(self, unique_key):
+		self.mis_game_pool_lock.acquire()
+		MG		= self.mis_game_pool.get(unique_key)
+		future	= self.mis_game_futures.get(unique_key)
+		self.mis_game_pool_lock.release()
+
+		if MG is not None: return MG
+
+		assert future is not None
+		return future.result()
+
+	# Adds the computed MG to the pool, and resolves its future, i.e.
+	# wakes the threads waiting the MG in get_mis_game().
+	def _publish_mis_game(self, unique_key, MG):
+		self.mis_game_pool_lock.acquire()
+		self.mis_game_pool[unique_key] = MG
+		future = self.mis_game_futures.pop(unique_key, None)
+		self.mis_game_pool_lock.release()
+
+		if future is not None: future.set_result(MG)
+
+	# The computation of the MG failed. The waiting threads raise the
+	# same exception, see get_mis_game().
+	def _abandon_mis_game(self, unique_key, exception):
+		self.mis_game_pool_lock.acquire()
+		future = self.mis_game_futures.pop(unique_key, None)
+		self.mis_game_pool_lock.release()
+
+		if future is not None: future.set_exception(exception)
+
+	# A new unique id of a MG. The next() of an itertools.count() is
+	# atomic (in CPython), thus no lock is needed.
+	def _next_mg_id(self):
+		return str(next(self.uniq_mg_ids))
+
 	###########
 	# Methods #
 	###########
@@ -711,9 +955,8 @@ class AdaptationProcedure:
 		# Initialize the MG #
 		#####################
 		MG = MisinformationGame(self.gambit_pac, self.debugging, self.domain,
-								str(self.uniq_mg_counter), num_players,
+								self._next_mg_id(), num_players,
 								strategies)  # Initialize the MG, num_players & strategies vector.
-		self.uniq_mg_counter += 1
 
 		num_SPs = math.prod(strategies)  # Compute the number of the stratetgy profiles.
 
@@ -733,14 +976,15 @@ class AdaptationProcedure:
 		MG.clingo_compile_nme()  	# Compile a list of clingo-predicates describing the nmes
 		
 		## Compute Knoweledge
-		answer_set = clingo.addaptation_step(MG.get_clingo_format(), "")
-		MG.compute_knowledge_from_answer_set(answer_set)
+		self.adaptation_backend.compute_knowledge(MG)
 
 		##############################
 		# Initialize Adaptation Node #
 		##############################
-		unique_key = preprocess_mg(MG, MG.get_strategies())
-		self.root = AdaptationNode("0", list(unique_key), unique_key, MG)  # Create an Addaptation Tree Node and make it point
+		nme_path = list(preprocess_mg(MG, self.adaptation_backend))
+		unique_key = ax.path_to_mask(nme_path, strategies)
+		root_index = self.tree.add_root(MG, nme_path, unique_key)
+		self.root = AdaptationNode(self.tree, root_index, unique_key)  # Create an Addaptation Tree Node and make it point
 		# to the new MG.
 		self.root_initialized = True  # Update state.
 
@@ -748,10 +992,10 @@ class AdaptationProcedure:
 		# Initialize Data Structures #
 		##############################
 		self.mis_game_pool[self.root.get_unique_key()] = MG  # The root will always be added to the dictionary.
+		self._spill(MG)
 
-		self.queue.append(self.root)  # Insert node to queue.
+		self._push(self.root)  # Insert node to the scheduler.
 
-		self.node_list.append(self.root)  # Insert to node list.
 
 		self.tasks += 1
 
@@ -777,9 +1021,8 @@ class AdaptationProcedure:
 		# Initialize the MG #
 		#####################
 		MG = MisinformationGame(self.gambit_pac, self.debugging, self.domain,
-								str(self.uniq_mg_counter), num_players,
+								self._next_mg_id(), num_players,
 								strategies)  # Initialize the MG, num_players & strategies vector.
-		self.uniq_mg_counter += 1
 
 		MG.generate_random_utilities(max_utility)  # Generate Utilities
 
@@ -789,16 +1032,17 @@ class AdaptationProcedure:
 		MG.clingo_compile_nme()  # Compile a list of clingo-predicates describing the nmes
 		
 		## Compute Knoweledge
-		answer_set = clingo.addaptation_step(MG.get_clingo_format(), "")
-		MG.compute_knowledge_from_answer_set(answer_set)
+		self.adaptation_backend.compute_knowledge(MG)
 		
 		
 		##############################
 		# Initialize Adaptation Node #
 		##############################
 		## Preprocessing
-		unique_key = preprocess_mg(MG, MG.get_strategies())
-		self.root = AdaptationNode("0", list(unique_key), unique_key, MG)  # Create an Addaptation Tree Node and make it point
+		nme_path = list(preprocess_mg(MG, self.adaptation_backend))
+		unique_key = ax.path_to_mask(nme_path, strategies)
+		root_index = self.tree.add_root(MG, nme_path, unique_key)
+		self.root = AdaptationNode(self.tree, root_index, unique_key)  # Create an Addaptation Tree Node and make it point
 		# to the new MG.
 		self.root_initialized = True  # Update state.
 
@@ -806,17 +1050,205 @@ class AdaptationProcedure:
 		# Initialize Data Structures #
 		##############################
 		self.mis_game_pool[self.root.get_unique_key()] = MG  # The root will always be added to the dictionary.
+		self._spill(MG)
 
-		self.queue.append(self.root)  # Insert node to queue.
+		self._push(self.root)  # Insert node to the scheduler.
 
 
-		self.node_list.append(self.root)  # Insert to node list.
 
 		self.tasks += 1
 
 
 
 
+	##############
+	# Checkpoint #
+	##############
+
+	## Save the state of the procedure to file_path, every
+	## interval seconds (see export_checkpoint())
+	def set_checkpoint(self, file_path, interval):
+		assert self.adaptation_procedure_completed == False
+		assert interval > 0
+
+		self.checkpoint_path		= file_path
+		self.checkpoint_interval	= interval
+		self.last_checkpoint_t		= time.time()
+
+	def _is_checkpoint_due(self):
+		if self.checkpoint_path is None: return False
+
+		return time.time() - self.last_checkpoint_t >= self.checkpoint_interval
+
+	## Pauses the traversal, saves the state, and continues
+	def checkpoint(self):
+		assert self.checkpoint_path is not None
+
+		if not self.is_process_pool_on(): self._pause()
+		try:
+			self.export_checkpoint(self.checkpoint_path)
+		finally:
+			if not self.is_process_pool_on(): self._unpause()
+
+		self.last_checkpoint_t = time.time()
+		self.num_checkpoints += 1
+
+	###############################################################
+	# export_checkpoint()
+	# ------------------------------------------------------------
+	# Saves the state of the procedure to file_path (pickle), i.e.
+	# the completed MGs (see MisinformationGame.export_payload()),
+	# the tree (see AdaptationTree.export_state()), the nodes of the
+	# scheduler, the nodes waiting a MG on the process pool, the
+	# leaves, the terminal set, the SMEs, the debugging counters and
+	# the time elapsed.
+	# The MGs are saved with their NMEs, thus the GAMBIT and the
+	# clingo calls already made are not repeated after the resume.
+	# Only the MGs in flight are computed again.
+	#
+	# The traversal must be paused, see checkpoint(). The file is
+	# written to a temporary file and then renamed, thus a crash
+	# during the checkpoint does not destroy the previous one.
+	###############################################################
+	def export_checkpoint(self, file_path):
+		assert self.root_initialized == True
+
+		## The MGs of the tree and of the pool
+		mgs = dict(self.tree.get_mgs())
+		for MG in self.mis_game_pool.values():
+			mgs.setdefault(int(MG.get_game_id()), MG)
+
+		in_flight = []
+		for unique_key, waiting_nodes in self.in_flight.items():
+			in_flight.append((
+				unique_key,
+				[(child_num, parent.get_index(), pos_vec) for child_num, parent, pos_vec in waiting_nodes]
+			))
+		in_flight += self.resumed_in_flight
+
+		checkpoint = {
+			"num_players"	: self.root.get_num_players(),
+			"strategies"	: self.root.get_strategies(),
+			"mgs"			: [mgs[mg_id].export_payload() for mg_id in sorted(mgs)],
+			"mg_pool"		: [(unique_key, int(MG.get_game_id())) for unique_key, MG in self.mis_game_pool.items()],
+			"next_mg_id"	: max(mgs) + 1,
+			"tree"			: self.tree.export_state(),
+			"pending"		: [(node.get_index(), node.get_unique_key()) for node in self.scheduler.get_nodes()],
+			"in_flight"		: in_flight,
+			"leaves"		: self.leaves.tobytes(),
+			"terminal_set"	: self.terminal_set,
+			"smes"			: self.smes,
+			"counters"		: self.debugging.get_counters(),
+			"histograms"	: self.debugging.get_histograms(),
+			"total_time"	: time.time() - self.total_time,
+			"cpu_time"		: time.process_time() - self.cpu_time
+		}
+
+		tmp_path = file_path + ".tmp"
+		f = open(tmp_path, "wb")
+		pickle.dump(checkpoint, f, pickle.HIGHEST_PROTOCOL)
+		f.close()
+
+		os.replace(tmp_path, file_path)
+
+	## Continue a procedure from a checkpoint (see export_checkpoint()),
+	## instead of root_from_file() or root_random()
+	def root_from_checkpoint(self, file_path):
+		assert self.root_initialized == False
+
+		f = open(file_path, "rb")
+		checkpoint = pickle.load(f)
+		f.close()
+
+		num_players	= checkpoint["num_players"]
+		strategies	= checkpoint["strategies"]
+
+		## check the GAMBIT method
+		# Check whether the designated method supports num_player-player games
+		assert num_players <= gambit.method_max_players_list[self.gambit_pac.get_default_method_val()], \
+			"Error: The designated NE computation method does NOT support " + str(num_players) + "-player games!"
+
+		#####################
+		# Initialise Domain #
+		#####################
+		self.domain.initialise(num_players, strategies)
+
+		###################
+		# Restore the MGs #
+		###################
+		## NOTE: the NMEs are restored, not computed
+		mgs = dict()
+		for payload in checkpoint["mgs"]:
+			MG = MisinformationGame(self.gambit_pac, self.debugging, self.domain,
+									payload[0], num_players, strategies)
+			MG.from_payload(payload)
+			MG.clingo_compile_nme()
+
+			mgs[int(MG.get_game_id())] = MG
+			self._spill(MG)
+
+		for unique_key, mg_id in checkpoint["mg_pool"]:
+			self.mis_game_pool[unique_key] = mgs[mg_id]
+
+		self.uniq_mg_ids = itertools.count(checkpoint["next_mg_id"])
+
+		####################
+		# Restore the Tree #
+		####################
+		self.tree.restore_state(checkpoint["tree"], mgs)
+		self.root = AdaptationNode(self.tree, 0, self.tree.get_unique_key(0))
+		self.root_initialized = True
+
+		self.leaves.frombytes(checkpoint["leaves"])
+		self.terminal_set	= checkpoint["terminal_set"]
+		self.smes			= checkpoint["smes"]
+
+		## The statistics include the time before the checkpoint,
+		## as the debugging counters
+		self.debugging.add_counters(checkpoint["counters"])
+		self.debugging.add_histograms(checkpoint.get("histograms", dict()))
+		self.total_time	-= checkpoint["total_time"]
+		self.cpu_time	-= checkpoint["cpu_time"]
+
+		##############################
+		# Initialize Data Structures #
+		##############################
+		for index, unique_key in checkpoint["pending"]:
+			self._push(AdaptationNode(self.tree, index, unique_key))
+			self.tasks += 1
+
+		## The MGs in flight are computed when the procedure
+		## starts, see _resume_in_flight()
+		for unique_key, waiting_nodes in checkpoint["in_flight"]:
+			self.resumed_in_flight.append((
+				unique_key,
+				[(child_num, AdaptationNode(self.tree, index), pos_vec) for child_num, index, pos_vec in waiting_nodes]
+			))
+
+	## Computes the MGs that were in flight, when the checkpoint was
+	## saved, and inserts the nodes waiting for them. On the process
+	## pool, the MGs are submitted again to the pool.
+	def _resume_in_flight(self):
+		for unique_key, waiting_nodes in self.resumed_in_flight:
+
+			if self.is_process_pool_on():
+				for child_num, parent, pos_vec in waiting_nodes:
+					self._process_pool_substep(child_num, parent, unique_key, pos_vec)
+				continue
+
+			## The first node computes the MG, as in _process_pool_result()
+			claimed = not self.mg_already_computed(unique_key)
+			for child_num, parent, pos_vec in waiting_nodes:
+				if claimed:
+					MG, new_mg = self._new_mis_game(parent, unique_key, pos_vec), True
+					claimed = False
+				else:
+					MG, new_mg = self.get_mis_game(unique_key), False
+
+				self._insert_child(self._new_node(parent, child_num, pos_vec, unique_key, MG, True, new_mg))
+
+		self.resumed_in_flight = []
+
 	########################
 	# Adaptation Procedure #
 	########################
@@ -874,9 +1306,10 @@ class AdaptationProcedure:
                                                                 # to the NME
 				pred_pos_vec    = clingo_nme_dict[nme][pos]	    # the pos. vec. as CLINGO predicate
 				
-                ## Compute the changed_from_parent bit
-				parents_path        = request_parent.get_nme_path()
-				changed_from_parent = not tuple_pos_vec in parents_path
+                ## Compute the changed_from_parent bit, i.e.
+				## whether the pos. vec. is in the parent's key
+				pos_vec_bit         = ax.pos_vec_to_bit(tuple_pos_vec, parent.get_strategies())
+				changed_from_parent = (request_parent.get_unique_key() & pos_vec_bit) == 0
 
 
 				if tuple_pos_vec in visited_pos_vecs:		# if we considered the pos. vec. in a previous
@@ -894,63 +1327,19 @@ class AdaptationProcedure:
 		## Do the Adaptation (sub) Step
 		for result_tuple in Requests:
 
-			## ceate node id
-			new_node_id = parent.get_node_id() + str(i)
+			## the child is the i-th child of its parent,
+			## see AdaptationTree.get_node_id()
+			child_num = i
 			i += 1
 
 			## call adaptation_substep()
-			child = self._adaptation_substep(new_node_id, parent, result_tuple[2], result_tuple[4], result_tuple[3])
-
-			## Append to node list
-			self.node_list_lock.acquire()
-			self.node_list.append(child)
-			self.node_list_lock.release()
+			child = self._adaptation_substep(child_num, parent, result_tuple[2], result_tuple[4])
 
+			## The child waits a MG computed on the process pool,
+			## see _process_pool_result()
+			if child is None: continue
 
-			## If the child did not change from father
-			## then it is a leaf (and belongs to the terminal set)!
-			if not child.is_changed_from_father():
-
-				## Append to Leaves
-				self.leaves_lock.acquire()
-				self.leaves.append(child)
-				self.leaves_lock.release()
-
-				## Add to terminal Set
-				self.terminal_set_lock.acquire()
-				self.terminal_set.add(child.get_unique_key())
-				self.terminal_set_lock.release()
-
-				## Continue
-				continue
-
-
-			## If fast_mode == True, and we have encounter the child
-			## on another branch, do not add the node in the queue
-			if self.fast_mode_on and not child.is_new_mg(): continue
-
-
-			## If non of the above holds, add the new child to the queue,
-			## to explore this branch further.
-			# Acquire lock
-			self.queue_lock.acquire()
-
-			# Append to queuue
-			self.queue.append(child)  ## BFS
-			# self.queue.insert(0, child)			## uncomments this for DFS
-													## (no visible change in time consumption for DFS)
-
-			## Tasks counter
-			self.tasks_lock.acquire()
-			self.tasks += 1
-			self.tasks_lock.release()
-
-
-			# Wake the theads that wait the condition vaiable
-			self.queue_empty.notify_all()
-
-			# Rrelease the lock
-			self.queue_lock.release()
+			self._insert_child(child)
 
 
 
@@ -974,6 +1363,64 @@ class AdaptationProcedure:
 				self.smes_lock.release()
 
 
+	###############################################################
+	# insert_child()
+	# ------------------------------------------------------------
+	# Handles the child node, computed by adaptation_substep() (and
+	# already added to the tree). If the child did not change from its parent,
+	# it is a leaf, else the child is added to the scheduler, in order
+	# to explore this branch further (in fast mode, only if the
+	# child's MG is new).
+	###############################################################
+	def _insert_child(self, child):
+		## Append to node list
+		## NOTE: The child is already in the tree,
+		## see _new_node()
+
+
+		## If the child did not change from father
+		## then it is a leaf (and belongs to the terminal set)!
+		if not child.is_changed_from_father():
+
+			## Append to Leaves
+			self.leaves_lock.acquire()
+			self.leaves.append(child.get_index())
+			self.leaves_lock.release()
+
+			## Add to terminal Set
+			self.terminal_set_lock.acquire()
+			self.terminal_set.add(child.get_unique_key())
+			self.terminal_set_lock.release()
+
+			return
+
+
+		## If fast_mode == True, and we have encounter the child
+		## on another branch, do not add the node in the scheduler
+		if self.fast_mode_on and not child.is_new_mg():
+			self.debugging.skipped_computation(skipped_names.fast_mode_pruned)
+			return
+
+
+		## If non of the above holds, add the new child to the scheduler,
+		## to explore this branch further.
+
+		## Tasks counter
+		self.tasks_lock.acquire()
+		self.tasks += 1
+		self.tasks_lock.release()
+
+		# Push to the scheduler (BFS, DFS, etc.)
+		self._push(child)
+
+		# Wake a thread waiting the condition variable, if any. The
+		# queue_lock is acquired only when some thread is idle.
+		if self.idle_workers > 0:
+			self.queue_lock.acquire()
+			self.queue_empty.notify()
+			self.queue_lock.release()
+
+
 
 	###############################################################
 	# adaptation_substep()
@@ -1003,34 +1450,48 @@ class AdaptationProcedure:
 	#
 	#	4. Else, create a new MG.
 	#
+	# On the process pool (see _process_pool_traversal()), the cases
+	# 3 and 4 are handled by _process_pool_substep(), and the new MG
+	# is computed asynchronously. Then, None is returned.
 	###############################################################
-	def _adaptation_substep(self, node_id, parent, tuple_pos_vec, changed_from_parent, pred_pos_vec):
-		parents_path = parent.get_nme_path()
+	def _adaptation_substep(self, child_num, parent, tuple_pos_vec, changed_from_parent):
 		parents_unique_key = parent.get_unique_key()
-		new_path = parents_path + [tuple_pos_vec]
-		new_unique_key = ax.path_to_set(new_path)
+		new_unique_key = parents_unique_key | ax.pos_vec_to_bit(tuple_pos_vec, parent.get_strategies())
 
 		# (Old) Case 1 & 2
 		if not changed_from_parent:
+			self.debugging.skipped_computation(skipped_names.unchanged_pos_vec)
 			parents_MG = parent.get_mg_pointer()
-			return AdaptationNode(node_id, new_path, parents_unique_key, parents_MG, parent, False, False)
+			return self._new_node(parent, child_num, tuple_pos_vec, parents_unique_key, parents_MG, False, False)
+
+		# Case 3 & 4, on the process pool
+		if self.is_process_pool_on():
+			return self._process_pool_substep(child_num, parent, new_unique_key, tuple_pos_vec)
 
 		# Case 3
 		if self.mg_already_computed(new_unique_key):
-			MG = self.mis_game_pool[new_unique_key]
-			return AdaptationNode(node_id, new_path, new_unique_key, MG, parent, True, False)
+			self.debugging.skipped_computation(skipped_names.reused_MG)
+			MG = self.get_mis_game(new_unique_key)
+			return self._new_node(parent, child_num, tuple_pos_vec, new_unique_key, MG, True, False)
 
 		# Case 4
-		new_MG = self._new_mis_game(parent, new_unique_key, pred_pos_vec)
-		return AdaptationNode(node_id, new_path, new_unique_key, new_MG, parent, True, True)
+		new_MG = self._new_mis_game(parent, new_unique_key, tuple_pos_vec)
+		return self._new_node(parent, child_num, tuple_pos_vec, new_unique_key, new_MG, True, True)
+
+
+	## Adds a child node to the tree, returns its view
+	def _new_node(self, parent, child_num, pos_vec, unique_key, MG, changed_from_parent, new_mg):
+		index = self.tree.add_node(parent.get_index(), MG, pos_vec, child_num, changed_from_parent, new_mg)
+		return AdaptationNode(self.tree, index, unique_key)
 
 
 
 	#####################################################
 	# Input:
-	#	1. parent:		Adaptation Node
-	#	2. clingo_nme:	A clingo predicate describing
-	#					the nme
+	#	1. parent:			Adaptation Node
+	#	2. new_unique_key:	The key of the new MG in the pool
+	#	3. pos_vec:			The position vector of the update,
+	#						as tuple of integers
 	#
 	# Action:
 	#	* Adding a new MG to the pool
@@ -1038,11 +1499,11 @@ class AdaptationProcedure:
 	# Output:
 	#	* A pointer to the MG created
 	#####################################################
-	def _new_mis_game(self, parent, new_unique_key, pred_pos_vec):
+	def _new_mis_game(self, parent, new_unique_key, pos_vec):
+		construction_start_t = time.time()
 
 		## compute the uniq id for the MG
-		mg_uniq_id = str(self.uniq_mg_counter)
-		self.uniq_mg_counter += 1
+		mg_uniq_id = self._next_mg_id()
 
 		## get the number of players
 		mg_num_players = parent.get_num_players()
@@ -1060,43 +1521,188 @@ class AdaptationProcedure:
 			mg_strategies
 		)
 
-		## add the new MG to the pool
-		self.mis_game_pool[new_unique_key] = MG
-		## Release the lock, acquired in mg_alerady_computed()
-		## This way we achieve a) no (considerable) waiting time,
-		## b) no redundant calculations.
-		self.mis_game_pool_lock.release()
+		## The MG is in flight, i.e. its future was registered in
+		## mg_already_computed(). The MG is added to the pool only
+		## when completed, see _publish_mis_game(). This way we achieve
+		## a) no thread gets a half-built MG, b) only the threads that
+		## request this MG wait, c) no redundant calculations.
+		try:
+			## compute utilities (and knowledge) from the adaptation backend
+			parent_mg = parent.get_mg_pointer()
+			self.adaptation_backend.adaptation_step(parent_mg, MG, pos_vec)
 
-		## compute utilities from clingo
-		parent_mg = parent.get_mg_pointer()
+			## we compute everything beforehand
+			## the games that the adaptation step did not change,
+			## inherit the Nash Equilibria of the parent
+			MG.inherit_nash_equilibria(parent_mg, pos_vec)
 
-		clingo_call_start_t = time.time()
-		answer_set = clingo.addaptation_step(parent_mg.get_clingo_format(), pred_pos_vec)
-		clingo_call_end_t = time.time()
-		self.debugging.clingo_call(clingo_call_end_t - clingo_call_start_t)
+			## compute nmes
+			MG.compute_nme_dict()
+			MG.compute_pos_vecs()
 
-		MG.utilities_from_clingo(answer_set)
+			## compute clingo description etc.
+			# NOTE: the clingo format is compiled lazily,
+			# see MisinformationGame.get_clingo_format()
+			MG.clingo_compile_nme()
 
-		## we compute everything beforehand
-		## compute nmes
-		MG.compute_nme_dict()
-		MG.compute_pos_vecs()
+		except Exception as e:
+			self._abandon_mis_game(new_unique_key, e)
+			raise
 
-		## compute clingo description etc.
-		MG.clingo_compile_format()
-		MG.clingo_compile_nme()
+		self._spill(MG)
+		self._publish_mis_game(new_unique_key, MG)
 
+		self.debugging.observe(histogram_names.MG_construction, time.time() - construction_start_t)
 
 		## return the new nme path set
 		return MG
 	
+	#################
+	# Out-of-core #
+	#################
+
+	# If the out-of-core store is on, moves the completed MG to the
+	# store, before it is visible to the other threads
+	def _spill(self, MG):
+		if self.mg_store is None: return
+
+		MG.spill(self.mg_store)
+
+	################
+	# Process Pool #
+	################
+
+	#####################################################
+	# The cases 3 and 4 of adaptation_substep(), on the
+	# process pool. Only the main thread traverses the
+	# adaptation procedure, thus no locks are needed.
+	#
+	#	3.	The MG is in the pool, return the child node.
+	#
+	#	4.	Else, the child node waits the MG, computed by
+	#		a worker process. If the MG is not already
+	#		requested (by another node), submit it to the
+	#		process pool. Return None.
+	#
+	# See also: _process_pool_result()
+	#####################################################
+	def _process_pool_substep(self, child_num, parent, new_unique_key, pos_vec):
+		# Case 3
+		if new_unique_key in self.mis_game_pool:
+			self.debugging.skipped_computation(skipped_names.reused_MG)
+			MG = self.mis_game_pool[new_unique_key]
+			return self._new_node(parent, child_num, pos_vec, new_unique_key, MG, True, False)
+
+		# Case 4
+		if new_unique_key not in self.in_flight:
+			mg_uniq_id = self._next_mg_id()
+
+			parent_payload = parent.get_mg_pointer().export_payload()
+			future = self.process_pool.submit(process_traversal.new_mis_game, parent_payload, mg_uniq_id, pos_vec)
+
+			self.in_flight[new_unique_key] = []
+			self.futures[future] = new_unique_key
+			self.debugging.set_gauge(gauge_names.active_workers, min(len(self.futures), self.num_processes))
+		else:
+			self.debugging.skipped_computation(skipped_names.reused_MG)
+
+		self.in_flight[new_unique_key].append((child_num, parent, pos_vec))
+		return None
+
+	## Adds the MG computed by a worker process to the pool, and
+	## inserts the nodes waiting for it. The first node (i.e. the one
+	## that requested the MG) is the node of a new MG.
+	def _process_pool_result(self, future):
+		new_unique_key = self.futures.pop(future)
+		payload, counters, histograms = future.result()
+		self.debugging.set_gauge(gauge_names.active_workers, min(len(self.futures), self.num_processes))
+
+		self.debugging.add_counters(counters)
+		self.debugging.add_histograms(histograms)
+
+		MG = MisinformationGame(
+			self.gambit_pac,
+			self.debugging,
+			self.domain,
+			payload[0],
+			self.root.get_num_players(),
+			self.root.get_strategies()
+		)
+		MG.from_payload(payload)
+		MG.clingo_compile_nme()
+		self._spill(MG)
+
+		self.mis_game_pool[new_unique_key] = MG
+
+		new_mg = True
+		for child_num, parent, pos_vec in self.in_flight.pop(new_unique_key):
+			self._insert_child(self._new_node(parent, child_num, pos_vec, new_unique_key, MG, True, new_mg))
+			new_mg = False
+
+	## The traversal of the adaptation procedure by the main thread,
+	## while the new MGs are computed on a pool of worker processes
+	## (see process_traversal.py). The main thread does the adaptation
+	## steps of the scheduler, and then waits for (at least) one new MG.
+	def _process_pool_traversal(self):
+		config = process_traversal.worker_config(
+			self.gambit_pac,
+			self.debugging,
+			self.domain,
+			self.adaptation_backend,
+			self.root.get_num_players(),
+			self.root.get_strategies()
+		)
+
+		self.process_pool = ProcessPoolExecutor(
+			max_workers=self.num_processes,
+			mp_context=multiprocessing.get_context("fork"),
+			initializer=process_traversal.init_worker,
+			initargs=(config,)
+		)
+
+		## start the workers, before the traversal
+		list(self.process_pool.map(process_traversal.warm_up, range(self.num_processes)))
+
+		self._resume_in_flight()
+
+		while True:
+
+			## Do the Adaptation Steps of the scheduler
+			parent = self._pop()
+			while parent is not None:
+				self._adaptation_step(parent)
+
+				assert self.tasks > 0
+				self.tasks -= 1
+
+				parent = self._pop()
+
+			if self.futures == {}: break
+
+			## Wait for the new MGs, and handle them in the order of
+			## their submission
+			done, _ = wait(self.futures.keys(), return_when=FIRST_COMPLETED)
+			for future in [future for future in self.futures.keys() if future in done]:
+				self._process_pool_result(future)
+
+			if not self.quiet:
+				print("# Progress Uniq MGs: " + str(len(self.mis_game_pool)) + "/" + str(self.max_it), end="\r")
+
+			## The main thread is the only one traversing, i.e. no
+			## adaptation step is in progress
+			if self._is_checkpoint_due(): self.checkpoint()
+
+		self.process_pool.shutdown()
+		self.process_pool = None
+
 	def find_gretest_knowledge(self):
 		assert self.adaptation_procedure_completed == True
-		mg_pool_list = list(self.mis_game_pool.values())
-		mg_pool_list.sort(key=lambda MG1: MG1.get_knowledge_percentage())
+		# NOTE: the knowledge is kept in memory, even by a
+		# spilled MG (see mg_store.py)
+		max_MG = max(self.mis_game_pool.values(), key=lambda MG1: MG1.get_knowledge_percentage())
 		
-		self.max_knowledge_percentage 		= mg_pool_list[-1].get_knowledge_percentage()
-		self.max_knowledge_percentage_mg_id	= mg_pool_list[-1].get_game_id()
+		self.max_knowledge_percentage 		= max_MG.get_knowledge_percentage()
+		self.max_knowledge_percentage_mg_id	= max_MG.get_game_id()
 	
 	## Adaptation Procedure
 	def adaptation_procedure(self):
@@ -1109,5 +1715,11 @@ class AdaptationProcedure:
 		total_start_t = time.time()
 		cpu_start_t = time.process_time()
 
+		if self.is_process_pool_on():
+			self._process_pool_traversal()
+			return
+
+		self._resume_in_flight()
+
 		for i in range(self.num_mult_threads_traversal): self.workers[i].start()
 
@@ -0,0 +1,273 @@
+#####################################################################
+# adaptation_tree.py
+# ------------------------------------------------------------------
+# A compact (columnar) store of the Adaptation Tree. Outside fast
+# mode the tree grows exponentially, thus we do not keep an object
+# per node. Instead, the nodes are rows of typed arrays (see the
+# array module), indexed by the order of their insertion, i.e. the
+# root is the node 0:
+#
+#	1. parents:		The index of the parent node (-1 for the root).
+#
+#	2. mg_ids:		The (integer) id of the node's MG. The MGs are
+#					kept once, in the mgs dictionary, id --> MG.
+#
+#	3. pos_vecs:	The position vector of the update, from the parent
+#					to the node, as its flat (row-major) index, see
+#					ax.pos_vec_to_index() (-1 for the root).
+#
+#	4. child_nums:	The node is the i-th child of its parent.
+#
+#	5. flags:		Whether the node changed from its parent, and
+#					whether its MG is new (see flags below).
+#
+# Everything else is reconstructed on demand, walking from the node
+# to the root, i.e. the node id, the path of the NMEs and the unique
+# key, see get_node_id(), get_nme_path() and get_unique_key().
+#
+# The AdaptationNode class (see adaptation_procedure.py) is a light
+# view of a row of the tree. The views also provide the name and the
+# children of the nodes, thus RenderTree (anytree) prints the tree,
+# see AdaptationProcedure.iter_tree(). The children index is built
+# on demand, once the tree is complete, in two more typed arrays (a
+# compressed sparse row index, see get_children()).
+#####################################################################
+
+
+#############
+# Libraries #
+#############
+
+## Custom Libraries
+import auxiliary_functions as ax
+
+## Python Libraries
+from array import array
+from threading import Lock
+
+
+#############
+# Constants #
+#############
+
+## The bits of the flags column
+class flags:
+	changed_from_parent	= 1
+	new_mg				= 2
+
+## The index of the root, and the parent of the root
+root_index	= 0
+no_parent	= -1
+
+
+###########
+# Classes #
+###########
+
+class AdaptationTree:
+
+	def __init__(self, lock = None):
+		## Columns
+		self.parents	= array("q")
+		self.mg_ids		= array("q")
+		self.pos_vecs	= array("q")
+		self.child_nums	= array("q")
+		self.flags		= array("B")
+
+		## MGs, id --> MG
+		self.mgs = dict()
+
+		## The root
+		self.strategies			= None
+		self.root_nme_path		= None
+		self.root_unique_key	= None
+
+		## The children of each node, built on demand,
+		## see get_children()
+		self.child_offsets	= None
+		self.child_indices	= None
+
+		## Lock for the columns, e.g. a profiled lock
+		## (see Debugging.new_lock())
+		if lock is None: lock = Lock()
+		self.lock = lock
+
+	#################
+	# Insert a Node #
+	#################
+
+	def add_root(self, MG, nme_path, unique_key):
+		assert len(self.parents) == 0
+
+		self.strategies			= MG.get_strategies()
+		self.root_nme_path		= list(nme_path)
+		self.root_unique_key	= unique_key
+
+		return self._append(no_parent, MG, -1, 0, flags.changed_from_parent | flags.new_mg)
+
+	## Returns the index of the new node
+	def add_node(self, parent, MG, pos_vec, child_num, changed_from_parent, new_mg):
+		assert 0 <= parent and parent < len(self.parents)
+
+		node_flags = 0
+		if changed_from_parent:	node_flags |= flags.changed_from_parent
+		if new_mg:				node_flags |= flags.new_mg
+
+		pos_vec_index = ax.pos_vec_to_index(pos_vec, self.strategies)
+
+		return self._append(parent, MG, pos_vec_index, child_num, node_flags)
+
+	def _append(self, parent, MG, pos_vec_index, child_num, node_flags):
+		mg_id = int(MG.get_game_id())
+
+		self.lock.acquire()
+
+		self.mgs.setdefault(mg_id, MG)
+
+		index = len(self.parents)
+		self.parents.append(parent)
+		self.mg_ids.append(mg_id)
+		self.pos_vecs.append(pos_vec_index)
+		self.child_nums.append(child_num)
+		self.flags.append(node_flags)
+
+		self.child_offsets	= None
+		self.child_indices	= None
+
+		self.lock.release()
+
+		return index
+
+	##############
+	# Checkpoint #
+	##############
+
+	## The columns and the root of the tree, as a picklable tuple.
+	## The MGs are exported separately, see
+	## AdaptationProcedure.export_checkpoint().
+	def export_state(self):
+		self.lock.acquire()
+		state = (
+			self.parents.tobytes(),
+			self.mg_ids.tobytes(),
+			self.pos_vecs.tobytes(),
+			self.child_nums.tobytes(),
+			self.flags.tobytes(),
+			self.strategies,
+			self.root_nme_path,
+			self.root_unique_key
+		)
+		self.lock.release()
+
+		return state
+
+	## The inverse of export_state(), given the MGs, id --> MG
+	def restore_state(self, state, mgs):
+		assert len(self.parents) == 0
+
+		parents, mg_ids, pos_vecs, child_nums, node_flags, \
+			self.strategies, self.root_nme_path, self.root_unique_key = state
+
+		self.parents.frombytes(parents)
+		self.mg_ids.frombytes(mg_ids)
+		self.pos_vecs.frombytes(pos_vecs)
+		self.child_nums.frombytes(child_nums)
+		self.flags.frombytes(node_flags)
+
+		for mg_id in set(self.mg_ids):
+			self.mgs[mg_id] = mgs[mg_id]
+
+	#############
+	# Accessors #
+	#############
+
+	def get_mgs(self):
+		return self.mgs
+
+	def __len__(self):
+		return len(self.parents)
+
+	def get_parent(self, index):
+		return self.parents[index]
+
+	def get_mg(self, index):
+		return self.mgs[self.mg_ids[index]]
+
+	## The position vector of the update, as a tuple
+	## (None for the root)
+	def get_pos_vec(self, index):
+		if self.pos_vecs[index] < 0: return None
+
+		return ax.index_to_pos_vec(self.pos_vecs[index], self.strategies)
+
+	def is_changed_from_parent(self, index):
+		return self.flags[index] & flags.changed_from_parent != 0
+
+	def is_new_mg(self, index):
+		return self.flags[index] & flags.new_mg != 0
+
+	## The indices of the nodes from the root to the node
+	def get_lineage(self, index):
+		lineage = []
+		while index != no_parent:
+			lineage.append(index)
+			index = self.parents[index]
+
+		lineage.reverse()
+		return lineage
+
+	## The id of the root is "0", the id of the i-th child
+	## is the id of its parent, followed by i
+	def get_node_id(self, index):
+		lineage = self.get_lineage(index)
+		return "0" + "".join(str(self.child_nums[i]) for i in lineage[1:])
+
+	def get_nme_path(self, index):
+		lineage = self.get_lineage(index)
+		return self.root_nme_path + [self.get_pos_vec(i) for i in lineage[1:]]
+
+	## The unique key of the root, together with the position
+	## vectors of the nodes that changed from their parents
+	def get_unique_key(self, index):
+		unique_key = self.root_unique_key
+		for i in self.get_lineage(index)[1:]:
+			if self.is_changed_from_parent(i):
+				unique_key |= 1 << self.pos_vecs[i]
+
+		return unique_key
+
+	def get_name(self, index):
+		MG = self.get_mg(index)
+		return "N_" + self.get_node_id(index) + ", MG_" + MG.get_game_id() + \
+			", (" + str(MG.get_knowledge_percentage()) + "%)"
+
+	## The indices of the children of the node. The children of the
+	## node i are child_indices[child_offsets[i] : child_offsets[i + 1]],
+	## in the order of their insertion.
+	def get_children(self, index):
+		self.lock.acquire()
+		if self.child_offsets is None: self._index_children()
+		children = self.child_indices[self.child_offsets[index] : self.child_offsets[index + 1]]
+		self.lock.release()
+
+		return children
+
+	## A counting sort of the nodes by their parent
+	def _index_children(self):
+		num_nodes = len(self.parents)
+
+		offsets = array("q", bytes(8 * (num_nodes + 1)))
+		for child in range(root_index + 1, num_nodes):
+			offsets[self.parents[child] + 1] += 1
+		for i in range(num_nodes):
+			offsets[i + 1] += offsets[i]
+
+		indices	= array("q", bytes(8 * max(num_nodes - 1, 0)))
+		fill	= array("q", offsets)
+		for child in range(root_index + 1, num_nodes):
+			parent = self.parents[child]
+			indices[fill[parent]] = child
+			fill[parent] += 1
+
+		self.child_offsets	= offsets
+		self.child_indices	= indices
@@ -62,10 +62,15 @@
 ## Python Libraries
 from os import path
 import random
+import json
 
 ## Custom Libraries
 import adaptation_procedure as ap
+import adaptation_backend as ab
+import scheduler as sch
+import mg_store
 import gambit
+import nash_equilibria_cache
 import debugging
 import domain
 #import multithread_nash_equilibria
@@ -89,6 +94,7 @@ class args:
 	tree			= "-t"		# print the tree
 	root			= "-ro"		# print the root
 	save_tree		= "-st"		# save tree to file
+	save_tree_nd	= "-stn"	# save tree to file, one node per line (NDJSON)
 	leaves			= "-l"		# print the leaves
 	nodes			= "-n"		# print all the nodes
 	uniq_mgs		= "-m"		# print the uniqe MGs
@@ -108,20 +114,52 @@ class args:
 								# -nem gnm, for computing NE using the General Newton
 								# 	Method (gambit-gnm) Note: Works for general
 								#	n-player games.
+								# -nem nxpe, for computing NE using extreme point
+								#	enumeration in-process (numpy), without GAMBIT.
+								#	Note: Works only for 2-player games.
+								# -nem nenp, for computing the pure NE in-process
+								#	(numpy), without GAMBIT. Note: Works for general
+								#	n-player games.
 	debug			= "-dbg"	# Additional statistics for debugging and a deeper monitoring
 								# of the process. The user can provide additional arguments,
 								# -dbg p or -dbg d, for printing the warnings, or kill (die)
-								# the application after a warning.
+								# the application after a warning, and -dbg l, for profiling
+								# the locks and the traversal threads.
 	domain			= "-dmn"	# Specifies the domain of the strategy profiles
 								# e.g. -dmn v, for voronoi, -dmn r, for "real", leaving the
 								# input unchanged. If this argument is not given, the default
 								# behaviour is -dmn r
 	mul_thred_NE	= "-mtn"	# Enforces multithreading for computing in parallel the
-								#	nash equilibria for the n + 1 NFGs of a MG.
+								#	nash equilibria for the n + 1 NFGs of a MG, e.g.
+								#	-mtn <number of threads>. The threads are shared by
+								#	all the traversal threads (see -mtt).
 	mul_thred_cl	= "-mtc"	# Enforces multithreading for computing in parallel the
 								# the clingo calls, e.g. -mtc <number of threads>
 	mul_thred_tr	= "-mtt"	# Multithreading Traversal. Exploring the Adaptation Graph,
 								# in parallel.
+	mul_proc_tr		= "-mtp"	# Multiprocessing Traversal. Computing the new MGs of the
+								# Adaptation Graph on a pool of processes, e.g.
+								# -mtp <number of processes>. Cannot be combined with -mtt.
+	adapt_backend	= "-ab"		# Specifies the backend computing the adaptation steps
+								# e.g. -ab c, for clingo, -ab np, for numpy (in-process),
+								# -ab chk, for numpy cross-checked with clingo. If this
+								# argument is not given, the default behaviour is -ab c
+	NE_cache		= "-nec"	# Nash Equilibria Cache, e.g. -nec <size>, caches the Nash
+								# Equilibria of (at most) <size> NFGs with distinct utilities
+	scheduler		= "-sch"	# Specifies the order of the expansion of the nodes, e.g.
+								# -sch bfs, -sch dfs, -sch bf, for best-first by knowledge,
+								# -sch ws, for work stealing. By default, -sch dfs
+	checkpoint		= "-cp"		# Saves the state of the procedure periodically, e.g.
+								# -cp <path> <seconds>
+	resume			= "-rs"		# Continues a procedure from a checkpoint (see -cp),
+								# instead of -f or -r, e.g. -rs <path>
+	out_of_core		= "-ooc"	# Out-of-core store, the completed MGs are spilled to
+								# (temporary) files under a directory, e.g. -ooc <dir_path>
+	delta			= "-dlt"	# Delta mode of the clingo backends, the answer set of an
+								# adaptation step has only the overwritten utilities
+	metrics			= "-mtr"	# Saves the metrics of the debugging instance (latency
+								# histograms, counters, gauges) to a file, e.g. -mtr <path>,
+								# as JSON, if <path> ends with .json, else as Prometheus text
 
 	## Methods
 	# Predicates
@@ -142,6 +180,9 @@ class args:
 	
 	def is_save_tree(self, argv):
 		return self.save_tree in argv
+
+	def is_save_tree_nd(self, argv):
+		return self.save_tree_nd in argv
 	
 	def is_print_leaves(self, argv):
 		return self.leaves in argv
@@ -191,6 +232,33 @@ class args:
 	def is_mul_thred_tr(self, argv):
 		return self.mul_thred_tr in argv
 
+	def is_mul_proc_tr(self, argv):
+		return self.mul_proc_tr in argv
+
+	def is_adapt_backend(self, argv):
+		return self.adapt_backend in argv
+
+	def is_NE_cache(self, argv):
+		return self.NE_cache in argv
+
+	def is_scheduler(self, argv):
+		return self.scheduler in argv
+
+	def is_checkpoint(self, argv):
+		return self.checkpoint in argv
+
+	def is_resume(self, argv):
+		return self.resume in argv
+
+	def is_out_of_core(self, argv):
+		return self.out_of_core in argv
+
+	def is_delta(self, argv):
+		return self.delta in argv
+
+	def is_metrics(self, argv):
+		return self.metrics in argv
+
 	# Acquire Data
 	# In order to correctly call the following methods
 	# the errors.check_all(argv) should be called first
@@ -246,6 +314,12 @@ class args:
 		ind = argv.index(self.save_tree)
 		return argv[ind + 1]
 	
+	def get_save_tree_nd_path(self, argv):
+		assert self.is_save_tree_nd(argv)
+		
+		ind = argv.index(self.save_tree_nd)
+		return argv[ind + 1]
+	
 	def get_save_root_path(self, argv):
 		assert self.is_save_root(argv)
 		
@@ -264,12 +338,11 @@ class args:
 		ind = argv.index(self.debug)
 		params = []
 
-		# check for the optional parameters
-		if (ind + 1 <= len(argv) - 1) and (argv[ind + 1][0] != "-"):
-			params.append(argv[ind + 1])
-
-		if (ind + 2 <= len(argv) - 1) and (argv[ind + 1][0] != "-") and (argv[ind + 2][0] != "-"):
-			params.append(argv[ind + 2])
+		# check for the optional parameters, e.g. -dbg p d l
+		ind += 1
+		while (ind <= len(argv) - 1) and (argv[ind][0] != "-"):
+			params.append(argv[ind])
+			ind += 1
 
 
 		return params
@@ -294,12 +367,72 @@ class args:
 		return argv[ind + 1]
 
 
+	def get_mul_thred_NE_num_threads(self, argv):
+		assert self.is_mul_thred_NE(argv)
+
+		ind = argv.index(self.mul_thred_NE)
+		return argv[ind + 1]
+
 	def get_num_trversal_threads(self, argv):
 		assert self.is_mul_thred_tr(argv)
 
 		ind = argv.index(self.mul_thred_tr)
 		return argv[ind + 1]
 
+	def get_num_traversal_processes(self, argv):
+		assert self.is_mul_proc_tr(argv)
+
+		ind = argv.index(self.mul_proc_tr)
+		return argv[ind + 1]
+
+	def get_adapt_backend(self, argv):
+		assert self.is_adapt_backend(argv)
+
+		ind = argv.index(self.adapt_backend)
+		return argv[ind + 1]
+
+	def get_NE_cache_size(self, argv):
+		assert self.is_NE_cache(argv)
+
+		ind = argv.index(self.NE_cache)
+		return argv[ind + 1]
+
+	def get_scheduler(self, argv):
+		assert self.is_scheduler(argv)
+
+		ind = argv.index(self.scheduler)
+		return argv[ind + 1]
+
+	def get_checkpoint_path(self, argv):
+		assert self.is_checkpoint(argv)
+
+		ind = argv.index(self.checkpoint)
+		return argv[ind + 1]
+
+	def get_checkpoint_interval(self, argv):
+		assert self.is_checkpoint(argv)
+
+		ind = argv.index(self.checkpoint)
+		return argv[ind + 2]
+
+	def get_resume_path(self, argv):
+		assert self.is_resume(argv)
+
+		ind = argv.index(self.resume)
+		return argv[ind + 1]
+
+	def get_out_of_core_dir(self, argv):
+		assert self.is_out_of_core(argv)
+
+		ind = argv.index(self.out_of_core)
+		return argv[ind + 1]
+
+	def get_metrics_path(self, argv):
+		assert self.is_metrics(argv)
+
+		ind = argv.index(self.metrics)
+		return argv[ind + 1]
+
 
 args = args()
 
@@ -310,6 +443,7 @@ arg_list = [
 		args.tree,
 		args.root,
 		args.save_tree,
+		args.save_tree_nd,
 		args.leaves,
 		args.nodes,
 		args.uniq_mgs,
@@ -323,8 +457,17 @@ arg_list = [
 		args.NE_method,
 		args.debug,
 		args.domain,
-		args.mul_thred_tr
-		#args.mul_thred_NE,
+		args.mul_thred_tr,
+		args.adapt_backend,
+		args.NE_cache,
+		args.mul_thred_NE,
+		args.mul_proc_tr,
+		args.scheduler,
+		args.checkpoint,
+		args.resume,
+		args.out_of_core,
+		args.delta,
+		args.metrics
 		#args.mul_thred_cl
 	]
 
@@ -332,10 +475,12 @@ arg_list = [
 class debug_params:
 	print_warnings		= "p"
 	die_after_warning	= "d"
+	profiling			= "l"	# profiling of the locks and the traversal threads
 
 debug_params_list = [
 	debug_params.print_warnings,
-	debug_params.die_after_warning
+	debug_params.die_after_warning,
+	debug_params.profiling
 ]
 
 
@@ -346,12 +491,44 @@ class NE_methods:
 	gnm			= "gnm"	# Generalized Newton Method
 	enp			= "enp" # Enumerate Pure Equilibria
 	pol			= "pol"	# Compute NE by Support Enumeration
+	native_xpe	= "nxpe"	# Native (numpy) Extreme Point Enumeration
+	native_enp	= "nenp"	# Native (numpy) Enumerate Pure Equilibria
 
 NE_methods_list = [
 	NE_methods.enummixed,
 	NE_methods.gnm,
 	NE_methods.enp,
-	NE_methods.pol
+	NE_methods.pol,
+	NE_methods.native_xpe,
+	NE_methods.native_enp
+]
+
+## Available backends for the adaptation step
+class adapt_backends:
+	clingo	= "c"	# clingo subprocess (reference)
+	session	= "cs"	# clingo python API, in-process multi-shot session
+	numpy	= "np"	# numpy, in-process
+	check	= "chk"	# numpy, cross-checked with clingo
+
+adapt_backends_list = [
+	adapt_backends.clingo,
+	adapt_backends.session,
+	adapt_backends.numpy,
+	adapt_backends.check
+]
+
+## Available schedulers of the adaptation procedure
+class schedulers:
+	dfs				= "dfs"		# depth first (LIFO)
+	bfs				= "bfs"		# breadth first (FIFO)
+	best_first		= "bf"		# best first, by knowledge percentage
+	work_stealing	= "ws"		# a deque per traversal thread, with work stealing
+
+schedulers_list = [
+	schedulers.dfs,
+	schedulers.bfs,
+	schedulers.best_first,
+	schedulers.work_stealing
 ]
 
 class domain_methods:
@@ -365,6 +542,21 @@ domain_method_list = [
 	domain_methods.decimal
 ]
 
+## Available formats of the statistics, see Application.export_stats()
+class stats_formats:
+	text		= "text"		# the human readable table
+	json		= "json"		# the statistics and the metrics of the debugging instance
+	prometheus	= "prometheus"	# the metrics of the debugging instance, in the Prometheus text format
+
+stats_formats_list = [
+	stats_formats.text,
+	stats_formats.json,
+	stats_formats.prometheus
+]
+
+## The extension of a -mtr <path> of the JSON format
+metrics_json_extension = ".json"
+
 class help:
 	file		= "Initialize root from file, e.g.: -f <mg file path>."
 	random		= "Generate a random root, \n\
@@ -375,6 +567,8 @@ class help:
 	tree		= "Print the Adaptation Tree (text-based figure)."
 	root		= "Print the root of the Adaptation Procedure."
 	save_tree	= "Save the Adaptation Tree (text-based figure) to file, e.g. -st <path>."
+	save_tree_nd= "Save the Adaptation Tree to file, one node per line, as JSON\n\
+	objects (NDJSON), e.g. -stn <path>."
 	leaves		= "Print the list of Adaptation Tree leaf nodes."
 	nodes		= "Print all the Adaptation Tree nodes."
 	uniq_mgs	= "Print the set of the unique Misinformation Games."
@@ -390,21 +584,60 @@ class help:
 	adaptation tree. Considers all the unique MGs."
 	NE_method	= "Specifies the method for computing Nash Equilibria.\n\
 	e.g. -nem xpe, for computing NE using extreme point\n\
-	enumeration (gambit-enummixed). Other methods supported are gnm, enp, pol"
+	enumeration (gambit-enummixed). Other methods supported are gnm, enp, pol,\n\
+	nxpe, for extreme point enumeration in-process (without GAMBIT), and\n\
+	nenp, for the pure NE in-process (without GAMBIT)"
 	debug		= "Additional statistics for debugging and a deeper monitoring\n\
 	of the process. The user can provide additional arguments,\n\
 	-dbg " + debug_params.print_warnings + " or -dbg " + debug_params.die_after_warning + ", for printing the warnings, or kill (die)\n\
-	the application after a warning."
+	the application after a warning, and -dbg " + debug_params.profiling + ", for profiling the waiting and\n\
+	holding time of the locks, and the busy and idle time of the traversal threads."
 	domain		= "Specifies the domain of the strategy profiles\n\
 	e.g. -dmn v, for voronoi, -dmn r, for \"real\", leaving the\n\
 	input unchanged. If this argument is not given, the default\n\
 	behaviour is -dmn r"
-	#mul_thred_NE = "Enforces multithreading for computing in parallel the\n\   DEPRICATED COMMANDS (DO NOT USE)
-	#nash equilibria for the n + 1 NFGs of a MG."
+	mul_thred_NE = "Enforces multithreading for computing in parallel the\n\
+	nash equilibria for the n + 1 NFGs of a MG, e.g. -mtn <number of threads>.\n\
+	The threads are shared by all the traversal threads (see -mtt), thus at\n\
+	most <number of threads> GAMBIT processes run at any time."
 	#mul_thred_cl = "Enforces multithreading for computing in parallel the\n\   DEPRICATED COMMANDS (DO NOT USE)
 	#the clingo calls, e.g. -mtc <number of threads>"
 	mul_thred_tr = "Multithreading Traversal. Exploring the Adaptation Graph,\n\
 	in parallel. (Only Available in Fast Mode!)"
+	mul_proc_tr = "Multiprocessing Traversal. Computing the new MGs of the\n\
+	Adaptation Graph on a pool of processes, e.g. -mtp <number of processes>.\n\
+	Cannot be combined with -mtt. (Only Available on POSIX systems!)"
+	adapt_backend = "Specifies the backend computing the adaptation steps\n\
+	e.g. -ab np, for numpy (in-process), -ab c, for clingo, -ab cs, for a\n\
+	clingo session (in-process, requires the clingo python package),\n\
+	-ab chk, for numpy cross-checked with clingo. If this argument is not\n\
+	given, the default behaviour is -ab c"
+	scheduler = "Specifies the order of the expansion of the nodes of the\n\
+	Adaptation Graph, e.g. -sch dfs, depth first, -sch bfs, breadth first,\n\
+	-sch bf, best first, i.e. the nodes with the greatest knowledge first,\n\
+	-sch ws, a work stealing deque per traversal thread (see -mtt). If this\n\
+	argument is not given, the default behaviour is -sch dfs"
+	NE_cache = "Nash Equilibria Cache, e.g. -nec <size>. Caches the Nash\n\
+	Equilibria of (at most) <size> NFGs, so that NFGs with the same\n\
+	utilities are solved only once."
+	checkpoint = "Saves the state of the Adaptation Procedure to a file, every\n\
+	<seconds> seconds, e.g. -cp <path> <seconds>. See also -rs."
+	resume = "Continues the Adaptation Procedure from a checkpoint (see -cp),\n\
+	instead of -f or -r, e.g. -rs <path>. The MGs already computed are not\n\
+	computed again."
+	out_of_core = "Out-of-core store. The utilities and the Nash Equilibria of the\n\
+	completed MGs are moved to (temporary) files under a directory, e.g.\n\
+	-ooc <dir_path>. Only the NMEs and the knowledge of the MGs are kept in\n\
+	memory, the rest is read from the files on demand."
+	delta = "Delta mode of the clingo backends (-ab c, -ab cs, -ab chk). The\n\
+	answer set of an adaptation step has only the utilities that the step\n\
+	overwrites (see adaptation_delta.lp), and the new MG is a copy of its\n\
+	parent, where these utilities are replaced."
+	metrics = "Saves the metrics of the Adaptation Procedure to a file, e.g.\n\
+	-mtr <path>, i.e. the latency histograms (solver calls, answer set and\n\
+	NE parsing, domain mapping, MG construction, queue wait), the counters\n\
+	(cache hits, skipped computations) and the gauges (queue depth, active\n\
+	workers). As JSON, if <path> ends with .json, else as Prometheus text."
 
 
 	## Print Help
@@ -415,6 +648,7 @@ class help:
 		print(args.tree + "\t" + self.tree)
 		print(args.root + "\t" + self.root)
 		print(args.save_tree + "\t" + self.save_tree)
+		print(args.save_tree_nd + "\t" + self.save_tree_nd)
 		print(args.leaves + "\t" + self.leaves)
 		print(args.nodes + "\t" + self.nodes)
 		print(args.uniq_mgs + "\t" + self.uniq_mgs)
@@ -428,9 +662,18 @@ class help:
 		print(args.NE_method + "\t" + self.NE_method)
 		print(args.debug + "\t" + self.debug)
 		print(args.domain + "\t" + self.domain)
-		#print(args.mul_thred_NE + "\t" + self.mul_thred_NE)    DEPRICATED COMMANDS (DO NOT USE)
 		#print(args.mul_thred_cl + "\t" + self.mul_thred_cl)    DEPRICATED COMMANDS (DO NOT USE)
 		print(args.mul_thred_tr + "\t" + self.mul_thred_tr)
+		print(args.mul_proc_tr + "\t" + self.mul_proc_tr)
+		print(args.scheduler + "\t" + self.scheduler)
+		print(args.adapt_backend + "\t" + self.adapt_backend)
+		print(args.NE_cache + "\t" + self.NE_cache)
+		print(args.mul_thred_NE + "\t" + self.mul_thred_NE)
+		print(args.checkpoint + "\t" + self.checkpoint)
+		print(args.resume + "\t" + self.resume)
+		print(args.out_of_core + "\t" + self.out_of_core)
+		print(args.delta + "\t" + self.delta)
+		print(args.metrics + "\t" + self.metrics)
 
 help = help()
 
@@ -445,13 +688,13 @@ class error_messages:
 	suggestion				= "Use the argument -h for help."
 	
 	## Error Messages
-	no_init_params			= "Neither \"-f\" nor \"-r\" parametes provided"
+	no_init_params			= "Neither \"-f\", \"-r\" nor \"-rs\" parametes provided"
 	in_file_not_found		= "In -f <path> the file in <path> not found"
 	file_no_path			= "In -f no path provided"
 	random_error			= "The -r command doesn't follow the correct syntax"
 	sav_root_no_path		= "In -sr <path> no path provided"
 	sav_tree_no_path		= "In -st <path> no path provided"
-	too_many_init_params	= "Both -f and -r provided"
+	too_many_init_params	= "More than one of -f, -r and -rs provided"
 	unknown_param			= "An parameter passed that is not a member of arg_list"
 	seed_error				= "The -se command provided with no value"
 	no_mg_dir				= "In -sm <dir_path> either no path provided, or the path is not a directory"
@@ -465,6 +708,21 @@ class error_messages:
 	mtc_no_threads_num		= "In -mtc <threads number>, no threads number provided"
 	mtt_no_threads_num		= "In -mtt <threads number>, no threads number provided"
 	mtt_in_slow_mode		= "Multithreading is available ONLY in fast mode"
+	ab_no_backend			= "In -ab <backend>, no backend provided"
+	ab_unknown_backend		= "In -ab <backend>, unknown backend provided"
+	ab_no_clingo_api		= "In -ab cs, the clingo python package is not installed (pip install clingo)"
+	nec_no_size				= "In -nec <size>, no (positive) cache size provided"
+	mtn_no_threads_num		= "In -mtn <threads number>, no (positive) threads number provided"
+	mtp_no_processes_num	= "In -mtp <processes number>, no (positive) processes number provided"
+	mtp_with_mtt			= "The arguments -mtp and -mtt cannot be combined"
+	sch_no_scheduler		= "In -sch <scheduler>, no scheduler provided"
+	sch_unknown_scheduler	= "In -sch <scheduler>, unknown scheduler provided"
+	sav_tree_nd_no_path		= "In -stn <path> no path provided"
+	cp_error				= "The -cp command doesn't follow the correct syntax, -cp <path> <seconds>"
+	rs_not_found			= "In -rs <path> the checkpoint in <path> not found"
+	no_ooc_dir				= "In -ooc <dir_path> either no path provided, or the path is not a directory"
+	dlt_numpy_backend		= "The argument -dlt is available ONLY for the clingo backends (-ab c, -ab cs, -ab chk)"
+	mtr_no_path				= "In -mtr <path> no path provided"
 	
 class errors:
 	no_init_params			= 1		# no -r or -f parameters provided
@@ -473,7 +731,7 @@ class errors:
 	random_error			= 4		# the -r command doesn't follow the correct syntax
 	sav_root_no_path		= 5		# in -sr no path provided
 	sav_tree_no_path		= 6		# in -st no path provided
-	too_many_init_params	= 7		# both -f and -r provided or too many -f or -r
+	too_many_init_params	= 7		# more than one of -f, -r and -rs provided
 	unknown_param			= 8		# a parameter passed that is not a member of arg_list
 	seed_error				= 9		# The -se command provided with no value
 	no_mg_dir				= 10	# In -sm <dir_path> either no path provided, or the path is not a directory
@@ -487,6 +745,21 @@ class errors:
 	mtc_no_threads_num		= 18	# In -mtc <threads number>, no threads number provided
 	mtt_no_threads_num		= 19	# In -mtt <threads number>, no threads number provided
 	mtt_in_slow_mode		= 20	# Multithreading is available ONLY in fast mode
+	ab_no_backend			= 21	# In -ab <backend>, no backend provided
+	ab_unknown_backend		= 22	# In -ab <backend>, unknown backend provided
+	ab_no_clingo_api		= 23	# In -ab cs, the clingo python package is not installed
+	nec_no_size				= 24	# In -nec <size>, no (positive) cache size provided
+	mtn_no_threads_num		= 25	# In -mtn <threads number>, no (positive) threads number provided
+	mtp_no_processes_num	= 26	# In -mtp <processes number>, no (positive) processes number provided
+	mtp_with_mtt			= 27	# The arguments -mtp and -mtt cannot be combined
+	sch_no_scheduler		= 28	# In -sch <scheduler>, no scheduler provided
+	sch_unknown_scheduler	= 29	# In -sch <scheduler>, unknown scheduler provided
+	sav_tree_nd_no_path		= 30	# in -stn no path provided
+	cp_error				= 31	# the -cp command doesn't follow the correct syntax
+	rs_not_found			= 32	# in -rs <path> the checkpoint in <path> not found
+	no_ooc_dir				= 33	# In -ooc <dir_path> either no path provided, or the path is not a directory
+	dlt_numpy_backend		= 34	# The argument -dlt is available ONLY for the clingo backends
+	mtr_no_path				= 35	# in -mtr no path provided
 	
 	## One check to rule them all
 	def check_all(self, argv):
@@ -520,6 +793,11 @@ class errors:
 			print(error_messages.prefix + error_messages.sav_tree_no_path + error_messages.suffix)
 			print(error_messages.suggestion)
 			exit(self.sav_tree_no_path)
+
+		if not self.check_sav_tree_nd_no_path(argv):
+			print(error_messages.prefix + error_messages.sav_tree_nd_no_path + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.sav_tree_nd_no_path)
 		
 		if not self.check_too_many_init_params(argv):
 			print(error_messages.prefix + error_messages.too_many_init_params + error_messages.suffix)
@@ -590,10 +868,80 @@ class errors:
 			print(error_messages.prefix + error_messages.mtt_in_slow_mode + error_messages.suffix)
 			print(error_messages.suggestion)
 			exit(self.mtt_in_slow_mode)
+
+		if not self.check_ab_no_backend(argv):
+			print(error_messages.prefix + error_messages.ab_no_backend + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.ab_no_backend)
+
+		if not self.check_ab_unknown_backend(argv):
+			print(error_messages.prefix + error_messages.ab_unknown_backend + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.ab_unknown_backend)
+
+		if not self.check_ab_no_clingo_api(argv):
+			print(error_messages.prefix + error_messages.ab_no_clingo_api + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.ab_no_clingo_api)
+
+		if not self.check_nec_no_size(argv):
+			print(error_messages.prefix + error_messages.nec_no_size + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.nec_no_size)
+
+		if not self.check_mtn_no_threads_num(argv):
+			print(error_messages.prefix + error_messages.mtn_no_threads_num + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.mtn_no_threads_num)
+
+		if not self.check_mtp_no_processes_num(argv):
+			print(error_messages.prefix + error_messages.mtp_no_processes_num + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.mtp_no_processes_num)
+
+		if not self.check_mtp_with_mtt(argv):
+			print(error_messages.prefix + error_messages.mtp_with_mtt + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.mtp_with_mtt)
+
+		if not self.check_sch_no_scheduler(argv):
+			print(error_messages.prefix + error_messages.sch_no_scheduler + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.sch_no_scheduler)
+
+		if not self.check_sch_unknown_scheduler(argv):
+			print(error_messages.prefix + error_messages.sch_unknown_scheduler + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.sch_unknown_scheduler)
+
+		if not self.check_cp_error(argv):
+			print(error_messages.prefix + error_messages.cp_error + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.cp_error)
+
+		if not self.check_rs_not_found(argv):
+			print(error_messages.prefix + error_messages.rs_not_found + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.rs_not_found)
+
+		if not self.check_no_ooc_dir(argv):
+			print(error_messages.prefix + error_messages.no_ooc_dir + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.no_ooc_dir)
+
+		if not self.check_dlt_numpy_backend(argv):
+			print(error_messages.prefix + error_messages.dlt_numpy_backend + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.dlt_numpy_backend)
+
+		if not self.check_mtr_no_path(argv):
+			print(error_messages.prefix + error_messages.mtr_no_path + error_messages.suffix)
+			print(error_messages.suggestion)
+			exit(self.mtr_no_path)
 	
 	## Check for Errors
 	def check_no_init_params(self, argv):
-		return (args.file in argv) or (args.random in argv)
+		return (args.file in argv) or (args.random in argv) or (args.resume in argv)
 	
 	
 	def check_in_file_not_foud(self, argv):
@@ -673,9 +1021,22 @@ class errors:
 		return file_path[0] != "-"				# return if path exists
 	
 	
+	def check_sav_tree_nd_no_path(self, argv):
+		
+		if args.save_tree_nd not in argv: return True
+		
+		ind = argv.index(args.save_tree_nd)
+		
+		if ind + 1 > len(argv) - 1: return False
+		
+		file_path = argv[ind + 1]					# get the file path
+		return file_path[0] != "-"				# return if path exists
+	
+	
 	def check_too_many_init_params(self, argv):
 		
-		return not ( (args.random in argv) and (args.file in argv) )
+		init_params = [args.random in argv, args.file in argv, args.resume in argv]
+		return init_params.count(True) <= 1
 	
 	
 	def check_unkown_param(self, argv):
@@ -731,15 +1092,11 @@ class errors:
 	def check_debug_unknown_params(self, argv):
 		if not args.is_debug(argv): return True
 
-		ind = argv.index(args.debug)
 		condition = True
 
 		# check for the optional parameters
-		if (ind + 1 <= len(argv) - 1) and (argv[ind + 1][0] != "-"):
-			condition = condition and ( argv[ind + 1] in debug_params_list )
-
-		if (ind + 2 <= len(argv) - 1) and (argv[ind + 1][0] != "-") and (argv[ind + 2][0] != "-"):
-			condition = condition and ( argv[ind + 2] in debug_params_list )
+		for param in args.get_debug_params(argv):
+			condition = condition and ( param in debug_params_list )
 
 		return condition
 
@@ -794,6 +1151,117 @@ class errors:
 	def check_mtt_in_slow_mode(self, argv):
 		return args.is_fast_mode(argv) or not args.is_mul_thred_tr(argv)
 
+	def check_ab_no_backend(self, argv):
+		if not args.is_adapt_backend(argv): return True
+
+		ind = argv.index(args.adapt_backend)
+		if ind + 1 > len(argv) - 1: return False
+
+		return argv[ind + 1][0] != "-"
+
+	def check_ab_unknown_backend(self, argv):
+		if not args.is_adapt_backend(argv): return True
+
+		ind = argv.index(args.adapt_backend)
+		if ind + 1 > len(argv) - 1: return False
+
+		return argv[ind + 1] in adapt_backends_list
+
+	def check_ab_no_clingo_api(self, argv):
+		if not args.is_adapt_backend(argv): return True
+
+		ind = argv.index(args.adapt_backend)
+		if argv[ind + 1] != adapt_backends.session: return True
+
+		return ab.clingo_api_available
+
+	def check_nec_no_size(self, argv):
+		if not args.is_NE_cache(argv): return True
+
+		ind = argv.index(args.NE_cache)
+		if ind + 1 > len(argv) - 1: return False
+
+		size = argv[ind + 1]
+		return size.isdecimal() and int(size) > 0
+
+	def check_mtn_no_threads_num(self, argv):
+		if not args.is_mul_thred_NE(argv): return True
+
+		ind = argv.index(args.mul_thred_NE)
+		if ind + 1 > len(argv) - 1: return False
+
+		num_threads = argv[ind + 1]
+		return num_threads.isdecimal() and int(num_threads) > 0
+
+	def check_mtp_no_processes_num(self, argv):
+		if not args.is_mul_proc_tr(argv): return True
+
+		ind = argv.index(args.mul_proc_tr)
+		if ind + 1 > len(argv) - 1: return False
+
+		num_processes = argv[ind + 1]
+		return num_processes.isdecimal() and int(num_processes) > 0
+
+	def check_mtp_with_mtt(self, argv):
+		return not (args.is_mul_proc_tr(argv) and args.is_mul_thred_tr(argv))
+
+	def check_sch_no_scheduler(self, argv):
+		if not args.is_scheduler(argv): return True
+
+		ind = argv.index(args.scheduler)
+		if ind + 1 > len(argv) - 1: return False
+
+		return argv[ind + 1][0] != "-"
+
+	def check_sch_unknown_scheduler(self, argv):
+		if not args.is_scheduler(argv): return True
+
+		ind = argv.index(args.scheduler)
+		if ind + 1 > len(argv) - 1: return False
+
+		return argv[ind + 1] in schedulers_list
+
+	def check_cp_error(self, argv):
+		if not args.is_checkpoint(argv): return True
+
+		ind = argv.index(args.checkpoint)
+		if ind + 2 > len(argv) - 1: return False
+		if argv[ind + 1][0] == "-": return False
+
+		interval = argv[ind + 2]
+		return interval.isdecimal() and int(interval) > 0
+
+	def check_rs_not_found(self, argv):
+		if not args.is_resume(argv): return True
+
+		ind = argv.index(args.resume)
+		if ind + 1 > len(argv) - 1: return False
+
+		return path.isfile(argv[ind + 1])
+
+	def check_no_ooc_dir(self, argv):
+		if not args.is_out_of_core(argv): return True
+
+		ind = argv.index(args.out_of_core)
+		if ind + 1 > len(argv) - 1: return False
+
+		return path.isdir(argv[ind + 1])
+
+	def check_dlt_numpy_backend(self, argv):
+		if not args.is_delta(argv): return True
+		if not args.is_adapt_backend(argv): return True		# the default backend is clingo
+
+		ind = argv.index(args.adapt_backend)
+		return argv[ind + 1] != adapt_backends.numpy
+
+	def check_mtr_no_path(self, argv):
+		if not args.is_metrics(argv): return True
+
+		ind = argv.index(args.metrics)
+		if ind + 1 > len(argv) - 1: return False
+
+		return argv[ind + 1][0] != "-"
+
 err = errors()
 	
 
@@ -825,6 +1293,7 @@ class Application:
 	tree			= False
 	root			= False
 	save_tree		= False
+	save_tree_nd	= False
 	leaves			= False
 	nodes			= False
 	uniq_mgs		= False
@@ -841,6 +1310,15 @@ class Application:
 	mul_thred_NE	= False
 	mul_thread_cl	= False
 	mul_thread_tr	= False
+	mul_proc_tr		= False
+	sched			= False
+	adapt_backend	= False
+	NE_cache		= False
+	checkpoint		= False
+	resume			= False
+	out_of_core		= False
+	delta			= False
+	metrics			= False
 	
 	## Data
 	in_file_path 	= None
@@ -849,6 +1327,7 @@ class Application:
 	strategies		= None
 	max_util		= None
 	sav_tree_path	= None
+	sav_tree_nd_path= None
 	sav_root_path	= None
 	uniq_mgs_dir	= None
 	st_set_dir		= None
@@ -856,8 +1335,18 @@ class Application:
 	params			= None
 	dmn_method		= None
 	dmn_decimal		= None
+	mtn_num_threads	= None
 	mtc_num_threads	= None
 	mtt_num_threads	= None
+	mtp_num_procs	= None
+	backend			= None
+	scheduler_name	= None
+	NE_cache_size	= None
+	cp_path			= None
+	cp_interval		= None
+	rs_path			= None
+	ooc_dir			= None
+	mtr_path		= None
 	
 	
 	## Adaptation Procedure
@@ -872,6 +1361,15 @@ class Application:
 	## Domain class
 	strat_prof_domain = None
 
+	## Adaptation backend
+	adaptation_backend = None
+
+	## Scheduler of the adaptation procedure
+	scheduler = None
+
+	## Out-of-core store of the MGs
+	mg_store = None
+
 	## Multithreading Nash Equilibria
 	multithread_NE = None
 
@@ -908,6 +1406,7 @@ class Application:
 		self.tree			= args.is_print_tree(argv)
 		self.root			= args.is_root(argv)
 		self.save_tree		= args.is_save_tree(argv)
+		self.save_tree_nd	= args.is_save_tree_nd(argv)
 		self.leaves			= args.is_print_leaves(argv)
 		self.nodes			= args.is_print_nodes(argv)
 		self.uniq_mgs		= args.is_uniq_mgs(argv)
@@ -921,9 +1420,18 @@ class Application:
 		self.NE_method		= args.is_NE_method(argv)
 		self.debug			= args.is_debug(argv)
 		self.domain			= args.is_domain(argv)
-		#self.mul_thred_NE	= args.is_mul_thred_NE(argv)
+		self.mul_thred_NE	= args.is_mul_thred_NE(argv)
 		#self.mul_thread_cl	= args.is_mul_thred_cl(argv)
 		self.mul_thread_tr	= args.is_mul_thred_tr(argv)
+		self.mul_proc_tr	= args.is_mul_proc_tr(argv)
+		self.sched			= args.is_scheduler(argv)
+		self.adapt_backend	= args.is_adapt_backend(argv)
+		self.NE_cache		= args.is_NE_cache(argv)
+		self.checkpoint		= args.is_checkpoint(argv)
+		self.resume			= args.is_resume(argv)
+		self.out_of_core	= args.is_out_of_core(argv)
+		self.delta			= args.is_delta(argv)
+		self.metrics		= args.is_metrics(argv)
 		
 		
 		
@@ -947,6 +1455,7 @@ class Application:
 		
 		# if applicable, get save tree path
 		if self.save_tree: self.sav_tree_path = args.get_save_tree_path(argv)
+		if self.save_tree_nd: self.sav_tree_nd_path = args.get_save_tree_nd_path(argv)
 		
 		# if applicable, get the save root path
 		if self.save_root: self.sav_root_path = args.get_save_root_path(argv)
@@ -956,6 +1465,17 @@ class Application:
 		
 		if self.sav_stable_set: self.st_set_dir = args.get_stable_set_dir(argv)
 		
+		# if applicable, get the checkpoint and the resume paths
+		if self.checkpoint:
+			self.cp_path		= args.get_checkpoint_path(argv)
+			self.cp_interval	= int(args.get_checkpoint_interval(argv))
+		
+		if self.resume: self.rs_path = args.get_resume_path(argv)
+		
+		if self.out_of_core: self.ooc_dir = args.get_out_of_core_dir(argv)
+		
+		if self.metrics: self.mtr_path = args.get_metrics_path(argv)
+		
 		## Choose GAMBIT method for computing Nash Equilibria for Normal Form Games
 		if self.NE_method:
 			self.method = args.get_NE_method(argv)
@@ -1008,6 +1528,23 @@ class Application:
 		if self.method == NE_methods.pol:
 			self.gambit_pac = gambit.Gambit(gambit_decimals, gambit.method_vals.pol_val)
 
+		if self.method == NE_methods.native_xpe:
+			self.gambit_pac = gambit.Gambit(gambit_decimals, gambit.method_vals.nxpe_val)
+
+		if self.method == NE_methods.native_enp:
+			self.gambit_pac = gambit.Gambit(gambit_decimals, gambit.method_vals.nenp_val)
+
+		## Nash Equilibria Cache
+		if self.NE_cache:
+			self.NE_cache_size = int(args.get_NE_cache_size(argv))
+			self.gambit_pac.set_nash_equilibria_cache(nash_equilibria_cache.NashEquilibriaCache(self.NE_cache_size))
+
+		## Multithreading Nash Equilibria
+		self.mtn_num_threads = 1
+		if self.mul_thred_NE:
+			self.mtn_num_threads = int(args.get_mul_thred_NE_num_threads(argv))
+		self.gambit_pac.set_num_workers(self.mtn_num_threads)
+
 
 		#############
 		# Debugging #
@@ -1019,12 +1556,14 @@ class Application:
 
 		dbg_print_warnings		= False
 		dbg_die_after_warning	= False
+		dbg_profiling			= False
 
 		if self.debug:
 			dbg_print_warnings		= debug_params.print_warnings in self.params
 			dbg_die_after_warning	= debug_params.die_after_warning in self.params
+			dbg_profiling			= debug_params.profiling in self.params
 
-		self.debugging = debugging.Debugging(dbg_print_warnings, dbg_die_after_warning)
+		self.debugging = debugging.Debugging(dbg_print_warnings, dbg_die_after_warning, dbg_profiling)
 
 		##########
 		# Domain #
@@ -1041,11 +1580,25 @@ class Application:
 
 		self.strat_prof_domain = domain.SPDomain(dmn_method)
 
-		##################################
-		# Multithreading Nash Equilibria #
-		##################################
+		######################
+		# Adaptation Backend #
+		######################
+		if self.adapt_backend:
+			self.backend = args.get_adapt_backend(argv)
+		else:
+			self.backend = adapt_backends.clingo		# The Default backend is clingo
+
+		backend_val = ab.backend_vals.clingo
+		if self.backend == adapt_backends.session:
+			backend_val = ab.backend_vals.session
 
-		#self.multithread_NE = multithread_nash_equilibria.MultithreadNashEquilibria(self.mul_thred_NE)
+		if self.backend == adapt_backends.numpy:
+			backend_val = ab.backend_vals.numpy
+
+		if self.backend == adapt_backends.check:
+			backend_val = ab.backend_vals.check
+
+		self.adaptation_backend = ab.create_backend(backend_val, self.debugging, self.delta)
 
 		###############################
 		# Multithreading CLINGO calls #
@@ -1065,7 +1618,36 @@ class Application:
 		self.mtt_num_threads = 1
 		if self.mul_thread_tr:
 			self.mtt_num_threads = int(args.get_num_trversal_threads(argv))
-		self.debugging.check_num_threads(self.mtt_num_threads)
+		self.mtp_num_procs = 1
+		if self.mul_proc_tr:
+			self.mtp_num_procs = int(args.get_num_traversal_processes(argv))
+		self.debugging.check_num_threads(max(self.mtt_num_threads, self.mtp_num_procs))
+
+		#############
+		# Scheduler #
+		#############
+		if self.sched:
+			self.scheduler_name = args.get_scheduler(argv)
+		else:
+			self.scheduler_name = schedulers.dfs		# The Default scheduler is DFS
+
+		scheduler_val = sch.scheduler_vals.dfs
+		if self.scheduler_name == schedulers.bfs:
+			scheduler_val = sch.scheduler_vals.bfs
+
+		if self.scheduler_name == schedulers.best_first:
+			scheduler_val = sch.scheduler_vals.best_first
+
+		if self.scheduler_name == schedulers.work_stealing:
+			scheduler_val = sch.scheduler_vals.work_stealing
+
+		self.scheduler = sch.create_scheduler(scheduler_val, self.mtt_num_threads)
+
+		#####################
+		# Out-of-core Store #
+		#####################
+		if self.out_of_core:
+			self.mg_store = mg_store.MGStore(self.ooc_dir)
 
 		self.adapt_proc = ap.AdaptationProcedure(
 			self.gambit_pac,
@@ -1073,11 +1655,23 @@ class Application:
 			self.strat_prof_domain,
 			self.mtt_num_threads,
 			self.quiet,
-			self.fast_mode
+			self.fast_mode,
+			self.adaptation_backend,
+			self.mtp_num_procs,
+			self.scheduler,
+			self.mg_store
 		)
 		
+		## Checkpoints
+		if self.checkpoint:
+			self.adapt_proc.set_checkpoint(self.cp_path, self.cp_interval)
+		
+		## Resume from a checkpoint
+		if self.resume:
+			self.adapt_proc.root_from_checkpoint(self.rs_path)
+		
 		## Initialize from file
-		if args.is_init_from_file(argv):
+		elif args.is_init_from_file(argv):
 			f = open(self.in_file_path, "r")
 			file_fmt = f.read()
 			f.close()
@@ -1141,6 +1735,7 @@ class Application:
 		print("tree = " + str(self.tree))
 		print("root = " + str(self.root))
 		print("save_tree = " + str(self.save_tree))
+		print("save_tree_nd = " + str(self.save_tree_nd))
 		print("leaves = " + str(self.tree))
 		print("nodes = " + str(self.nodes))
 		print("uniq_mgs = " + str(self.uniq_mgs))
@@ -1154,6 +1749,16 @@ class Application:
 		print("NE_method = " + str(self.NE_method))
 		print("debugging = " + str(self.debug))
 		print("domain = " + str(self.domain))
+		print("adapt_backend = " + str(self.adapt_backend))
+		print("NE_cache = " + str(self.NE_cache))
+		print("mul_thred_NE = " + str(self.mul_thred_NE))
+		print("mul_proc_tr = " + str(self.mul_proc_tr))
+		print("scheduler = " + str(self.sched))
+		print("checkpoint = " + str(self.checkpoint))
+		print("resume = " + str(self.resume))
+		print("out_of_core = " + str(self.out_of_core))
+		print("delta = " + str(self.delta))
+		print("metrics = " + str(self.metrics))
 	
 		## Data
 		print("in_file_path = " + str(self.in_file_path))
@@ -1161,11 +1766,21 @@ class Application:
 		print("strategies = " + str(self.strategies))
 		print("max_util = " + str(self.max_util))
 		print("sav_tree_path = " + str(self.sav_tree_path))
+		print("sav_tree_nd_path = " + str(self.sav_tree_nd_path))
 		print("sav_root_path = " + str(self.sav_root_path))
 		print("uniq_mgs_dir = " + str(self.uniq_mgs_dir))
 		print("st_set_dir = " + str(self.st_set_dir))
 		print("method = " + str(self.method))
 		print("dmn_method = " + str(self.dmn_method))
+		print("backend = " + str(self.backend))
+		print("NE_cache_size = " + str(self.NE_cache_size))
+		print("mtn_num_threads = " + str(self.mtn_num_threads))
+		print("mtp_num_procs = " + str(self.mtp_num_procs))
+		print("cp_path = " + str(self.cp_path))
+		print("cp_interval = " + str(self.cp_interval))
+		print("rs_path = " + str(self.rs_path))
+		print("ooc_dir = " + str(self.ooc_dir))
+		print("mtr_path = " + str(self.mtr_path))
 
 
 	##############
@@ -1220,8 +1835,61 @@ class Application:
 	#		print("| Too many threads: " + str(debug_stats[9]))
 	#		print("+" + 39 * "-")
 	
-	def export_stats(self):
+	## The statistics, as a dictionary, see export_stats()
+	def get_stats_dict(self):
+		assert self.adaptation_procedure_done == True
+
+		adapt_proc_stats = self.adapt_proc.get_stats()
+		max_know, max_know_id = self.adapt_proc.get_max_knowledge()
+
+		return {
+			"num_players"			: adapt_proc_stats[0],
+			"strategies"			: adapt_proc_stats[1],
+			"NE_method"				: adapt_proc_stats[2],
+			"num_threads"			: self.mtt_num_threads,
+			"num_NE_threads"		: self.mtn_num_threads,
+			"num_processes"			: self.mtp_num_procs,
+			"adaptation_backend"	: self.adaptation_backend.get_name(),
+			"scheduler"				: self.scheduler.get_name(),
+			"seed"					: self.seed_val,
+			"total_time"			: adapt_proc_stats[3],
+			"cpu_time"				: adapt_proc_stats[4],
+			"nodes"					: adapt_proc_stats[5],
+			"unique_mgs"			: adapt_proc_stats[6],
+			"leaves"				: adapt_proc_stats[7],
+			"terminal_games"		: adapt_proc_stats[8],
+			"smes"					: adapt_proc_stats[9],
+			"checkpoints"			: self.adapt_proc.get_num_checkpoints(),
+			"max_knowledge"			: max_know,
+			"max_knowledge_mg_id"	: max_know_id
+		}
+
+	## The statistics, in one of the stats_formats, i.e. the human
+	## readable table (see print_stats()), or the statistics and the
+	## metrics of the debugging instance (see Debugging.get_metrics()),
+	## as JSON, or the metrics as Prometheus text. The numerical
+	## statistics are exported as Prometheus gauges.
+	def export_stats(self, stats_format = stats_formats.text):
 		assert self.adaptation_procedure_done == True
+		assert stats_format in stats_formats_list
+
+		if stats_format == stats_formats.json:
+			return json.dumps({
+				"stats"		: self.get_stats_dict(),
+				"metrics"	: self.debugging.get_metrics()
+			}, indent=1)
+
+		if stats_format == stats_formats.prometheus:
+			output = ""
+			for name, value in self.get_stats_dict().items():
+				if not isinstance(value, (int, float)): continue
+
+				metric = debugging.prometheus_prefix + name
+				if name.endswith("_time"): metric += "_seconds"
+				output += "# TYPE " + metric + " gauge\n"
+				output += metric + " " + repr(value) + "\n"
+
+			return output + self.debugging.export_prometheus()
 
 		adapt_proc_stats = self.adapt_proc.get_stats()
 		
@@ -1231,9 +1899,14 @@ class Application:
 		output += "| Strategies Vector: " + str(adapt_proc_stats[1])	+ "\n"
 		output += "| NE Method: " + adapt_proc_stats[2]					+ "\n"
 		output += "| Number of Threads: " + str(self.mtt_num_threads)	+ "\n"
+		output += "| Number of NE Threads: " + str(self.mtn_num_threads)	+ "\n"
+		output += "| Number of Processes: " + str(self.mtp_num_procs)	+ "\n"
+		output += "| Adaptation Backend: " + self.adaptation_backend.get_name()	+ "\n"
+		output += "| Scheduler: " + self.scheduler.get_name()					+ "\n"
 
 		init_method = "| Initialization Method: "
 		if self.random: init_method += "Random"
+		elif self.resume: init_method += "Checkpoint: " + self.rs_path
 		else: init_method += "File: " + self.in_file_path
 		output += init_method + "\n"
 
@@ -1247,6 +1920,11 @@ class Application:
 		output += "| Number of leaves: " + str(adapt_proc_stats[7])					+ "\n"
 		output += "| Number of Unique Terminal Games: " + str(adapt_proc_stats[8])	+ "\n"
 		output += "| Number of SMEs: " + str(adapt_proc_stats[9])					+ "\n"
+		if self.checkpoint:
+			output += "| Number of checkpoints: " + str(self.adapt_proc.get_num_checkpoints())	+ "\n"
+		if self.out_of_core:
+			output += "| Out-of-core store: " + self.ooc_dir + ", " + \
+				str(round(self.mg_store.get_disk_size() / 2**20, 2)) + "(MB)"				+ "\n"
 		
 		## Knowledge percentage
 		max_know, max_know_id = self.adapt_proc.get_max_knowledge()
@@ -1271,11 +1949,60 @@ class Application:
 			output += "| # Mixed Strategies \w sum <= 1: " + str(debug_stats[7])											+ "\n"
 			output += "| # No NE after GAMBIT call: " + str(debug_stats[8])													+ "\n"
 			output += "| Too many threads: " + str(debug_stats[9])															+ "\n"
+			output += "| # NFGs with NE inherited from parent: " + str(debug_stats[12])										+ "\n"
+			output += "+" + 60 * "-"																						+ "\n"
+			output += "| Latency, p50 / p90 / p99 (ms):"																	+ "\n"
+			for name in debugging.histogram_names_list:
+				histogram = self.debugging.get_histogram(name)
+				if histogram.get_count() == 0: continue
+
+				percentiles = [str(round(histogram.get_percentile(q) * 1000, 3)) for q in debugging.histogram_percentiles]
+				output += "|   " + name + ": " + " / ".join(percentiles) + " (" + str(histogram.get_count()) + " obs.)"	+ "\n"
+			output += "| Skipped computations:"																			+ "\n"
+			for name in debugging.skipped_names_list:
+				output += "|   " + name + ": " + str(self.debugging.get_skipped(name))								+ "\n"
+			output += "| Max queue depth: " + str(self.debugging.get_gauge_max(debugging.gauge_names.queue_depth))			+ "\n"
+			output += "| Max active workers: " + str(self.debugging.get_gauge_max(debugging.gauge_names.active_workers))	+ "\n"
 			output += "+" + 60 * "-"																						+ "\n"
+			if self.debugging.is_profiling():
+				output += self.str_profiling(adapt_proc_stats[3])
+			if self.NE_cache:
+				output += "| NE Cache size: " + str(self.NE_cache_size)														+ "\n"
+				output += "| NE Cache hits: " + str(debug_stats[10])														+ "\n"
+				output += "| NE Cache misses: " + str(debug_stats[11])														+ "\n"
+				output += "+" + 60 * "-"																					+ "\n"
 		
 		
 		return output
 		
+	## The utilisation summary of -dbg l, i.e. the locks, by their
+	## waiting time, and the busy and idle time of the traversal
+	## threads, as a percentage of the total time
+	def str_profiling(self, total_time):
+		output = ""
+		output += "| Locks, wait / hold (ms), acquisitions (contended):"									+ "\n"
+		for lock in self.debugging.get_profiled_locks():
+			if lock.get_acquisitions() == 0: continue
+
+			output += "|   " + lock.get_name() + ": " + str(round(lock.get_wait_time() * 1000, 3)) + " / " + \
+				str(round(lock.get_hold_time() * 1000, 3)) + ", " + str(lock.get_acquisitions()) + \
+				" (" + str(lock.get_contentions()) + ")"													+ "\n"
+
+		worker_times = self.debugging.get_worker_times()
+		if worker_times != dict() and total_time > 0:
+			output += "| Workers, busy / idle (s), adaptation steps, utilisation:"								+ "\n"
+			total_busy = 0
+			for worker_id, (busy, idle, steps) in worker_times.items():
+				total_busy += busy
+				output += "|   worker " + str(worker_id) + ": " + str(round(busy, 3)) + " / " + \
+					str(round(idle, 3)) + ", " + str(steps) + ", " + \
+					str(round(busy / total_time * 100, 2)) + "%"												+ "\n"
+			output += "| Mean worker utilisation: " + \
+				str(round(total_busy / (total_time * len(worker_times)) * 100, 2)) + "%"						+ "\n"
+		output += "+" + 60 * "-"																				+ "\n"
+
+		return output
+
 	########
 	# Exec #
 	########
@@ -1306,6 +2033,7 @@ class Application:
 		self.adapt_proc.adaptation_procedure()
 		self.adapt_proc.wait_for_results()
 		self.adapt_proc.turn_off()
+		self.gambit_pac.shutdown()
 		self.adaptation_procedure_done = True
 		
 		## Print stable set
@@ -1326,17 +2054,27 @@ class Application:
 			else: print("\n# Statistics",)
 			self.print_stats()
 		
+		## Save the metrics
+		if self.metrics:
+			stats_format = stats_formats.prometheus
+			if self.mtr_path.endswith(metrics_json_extension): stats_format = stats_formats.json
+
+			f = open(self.mtr_path, "w")
+			f.write(self.export_stats(stats_format))
+			f.close()
+		
 		## Print Tree
 		if self.tree and not self.no_out:
 			if not self.quiet: print(colored("\n\t## Adaptation Tree ##", "blue"))
 			else: print("\n# Tree",)
 			self.adapt_proc.print_tree()
 		
-		## Save Tree
+		## Save Tree (streamed, line by line)
 		if self.save_tree:
-			f = open(self.sav_tree_path, "w")
-			f.write(self.adapt_proc.str_tree())
-			f.close()
+			self.adapt_proc.export_tree(self.sav_tree_path)
+		
+		if self.save_tree_nd:
+			self.adapt_proc.export_tree_ndjson(self.sav_tree_nd_path)
 		
 		## Print leaves
 		if self.leaves and not self.no_out:
@@ -1385,6 +2123,16 @@ class Application:
 		assert self.adaptation_procedure_done == True
 		return self.adapt_proc.str_tree()
 	
+	## The node list and the tree, one line (node) at a time,
+	## see application_process.put_chunks()
+	def get_nodes_lines(self):
+		assert self.adaptation_procedure_done == True
+		return self.adapt_proc.iter_nodes()
+	
+	def get_tree_lines(self):
+		assert self.adaptation_procedure_done == True
+		return self.adapt_proc.iter_tree()
+	
 	def get_mg_pool(self):
 		assert self.adaptation_procedure_done == True
 		return self.adapt_proc.str_mg_pool()
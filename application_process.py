@@ -26,8 +26,13 @@ class ComProtocol:
 	mis_games_list  	= "# Misinformation Games"
 	num_unique_mgs  	= "# Number of Unique MGs"
 	uniq_mg_files		= "# Unique MG Files"
+	end_of_chunks		= "# End of Chunks"
 	eof             	= "# EOF"
 
+## The (approximate) size, in characters, of the chunks of the
+## node list and the tree, see put_chunks()
+chunk_size = 1 << 16
+
 #com_protocol = ComProtocol()
 
 
@@ -36,6 +41,40 @@ class ComProtocol:
 # Functions #
 #############
 
+## Puts the lines to the queue in chunks of (about) chunk_size
+## characters, followed by ComProtocol.end_of_chunks. Thus, the
+## node list and the tree are never a single (giant) string, and
+## the GUI receives them incrementally, see get_chunks().
+def put_chunks(queue, lines):
+	chunk		= []
+	chunk_len	= 0
+
+	for line in lines:
+		chunk.append(line)
+		chunk_len += len(line)
+
+		if chunk_len >= chunk_size:
+			queue.put("".join(chunk))
+			chunk		= []
+			chunk_len	= 0
+
+	if chunk != []: queue.put("".join(chunk))
+	queue.put(ComProtocol.end_of_chunks)
+
+
+## Gets the chunks put by put_chunks(), as a single string. The
+## progress messages (integers, see messages_thread()) may be
+## interleaved with the chunks, thus they are skipped.
+def get_chunks(queue):
+	chunks = []
+
+	chunk = queue.get()
+	while chunk != ComProtocol.end_of_chunks:
+		if isinstance(chunk, str): chunks.append(chunk)
+		chunk = queue.get()
+
+	return "".join(chunks)
+
 
 def processing_thread(app, queue):
 	## Exacute the Adaptation Procedure
@@ -63,11 +102,11 @@ def processing_thread(app, queue):
 	
 	# Put node list
 	queue.put(ComProtocol.nodes_list)
-	queue.put(app.get_nodes())
+	put_chunks(queue, app.get_nodes_lines())
 	
 	# Put Tree
 	queue.put(ComProtocol.tree)
-	queue.put(app.get_tree())
+	put_chunks(queue, app.get_tree_lines())
 	
 	# Put MG list
 	queue.put(ComProtocol.mis_games_list)
@@ -33,6 +33,26 @@
 #		Example:
 #			path_to_set([3, 2, 2, 1, 3]) --> (1, 2, 3) 
 #
+#	6) pos_vec_to_bit: (int), [int] --> int
+#		Given a position vector (starting from 1) and the strategies
+#		vector, returns the bit of the position vector, in the flat
+#		(row-major) index of the strategy profiles.
+#
+#		Example:
+#			pos_vec_to_bit((2, 1), [2, 3]) --> 1 << 3 = 8
+#
+#	7) path_to_mask: [(int)], [int] --> int
+#		As path_to_set(), for a path of position vectors, but
+#		the set is encoded as an integer bitmask, i.e. the OR of
+#		the bits of the position vectors.
+#
+#	8) mask_to_set: int, [int] --> ((int))
+#		The inverse of path_to_mask(), decodes the bitmask to the
+#		(human-readable) form of path_to_set().
+#
+#		Example:
+#			mask_to_set(path_to_mask(path, strategies), strategies) == path_to_set(path)
+#
 # author: Merkouris Papamichail
 # email: mercoyris@ics.forth.gr
 # institute: ICS, FORTH
@@ -192,6 +212,53 @@ def path_to_set(path):
 	return  tuple(set(tmp))
 
 
+###################################################################################################
+# The unique keys of the misinformation games (see adaptation_procedure.py) are sets of position
+# vectors, i.e. subsets of the strategy profiles. We encode such a set as an integer bitmask, where
+# the bit i is set, iff the i-th strategy profile, in the flat (row-major) index of the strategy
+# profiles, is in the set. Hence, the union of two sets is a single OR and the membership test a
+# single AND.
+###################################################################################################
+def pos_vec_to_index(pos_vec, strategies):
+	assert len(pos_vec) == len(strategies)
+
+	index = 0
+	for strategy, num_strategies in zip(pos_vec, strategies):
+		assert 1 <= strategy and strategy <= num_strategies
+		index = index * num_strategies + (strategy - 1)
+
+	return index
+
+def index_to_pos_vec(index, strategies):
+	pos_vec = []
+	for num_strategies in reversed(strategies):
+		index, strategy = divmod(index, num_strategies)
+		pos_vec.append(strategy + 1)
+
+	return tuple(reversed(pos_vec))
+
+def pos_vec_to_bit(pos_vec, strategies):
+	return 1 << pos_vec_to_index(pos_vec, strategies)
+
+def path_to_mask(path, strategies):
+	mask = 0
+	for pos_vec in path:
+		mask |= pos_vec_to_bit(pos_vec, strategies)
+
+	return mask
+
+def mask_to_set(mask, strategies):
+	path = []
+	while mask != 0:
+		bit = mask & -mask		# the lowest set bit
+		index = bit.bit_length() - 1
+		mask ^= bit
+
+		path.append(index_to_pos_vec(index, strategies))
+
+	return path_to_set(path)
+
+
 ##############
 # Predicates #
 ##############
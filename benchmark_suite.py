@@ -0,0 +1,453 @@
+###########################################################
+# benchmark_suite.py
+# --------------------------------------------------------
+# An end-to-end benchmark suite of the Adaptation
+# Procedure. For every experiment of do_experiment.py
+# (see experiments), every configuration (see
+# configurations, i.e. fast vs full mode, the number of
+# traversal threads and the NE method) and every seed, the
+# Application class of application.py is run num_repeats
+# times, each in a fresh process, and the following are
+# measured:
+#
+#	1. wall_t:		The wall time (s) of the run, i.e. the
+#					initialisation and the procedure.
+#	2. cpu_t:		The CPU time (s) of the process and of
+#					its children (the solvers).
+#	3. phases:		The time (s) of the initialisation (the
+#					root MG, see Application.__init__()), of
+#					the procedure (Application.exec()), and
+#					the total time in the GAMBIT and the
+#					CLINGO calls (see debugging.py).
+#	4. peak_rss:	The peak resident memory (MB) of the
+#					process, and of the largest child.
+#	5. counts:		The number of nodes, unique MGs, leaves,
+#					unique terminal games and SMEs. They do
+#					not depend on the machine, thus they
+#					must agree with the baseline.
+#
+# By default, the solvers (clingo, gambit-*) are replaced by
+# the deterministic stand-ins of solver_stand_ins/, thus the
+# suite runs on a plain Linux box, without CLINGO and
+# GAMBIT.
+#
+# Of the repeats of a seed, only the fastest run is kept,
+# i.e. the minimum wall time, and the minimum peak memory,
+# which are the least noisy estimates. The runs, and their
+# averages per experiment and configuration (over the
+# fastest runs of the seeds), are written to a JSON file,
+# and the averages also to a CSV file (same name, .csv).
+# Given a baseline, i.e. the JSON file of a previous run of
+# the suite, the averages are compared against it. A
+# regression is different counts, or a wall time (peak
+# memory) greater than the baseline by more than
+# regression_tolerance and by more than
+# min_regression_delta_t (min_regression_delta_rss). The
+# wall times of runs shorter than min_regression_wall_t
+# are not compared. The exit code is 1 if there is a
+# regression.
+#
+# Input: 	1. The number of the first experiment to be run.
+#				A number in range {0, ..., 7}.
+#
+#			2. The number of the last experiment to be run.
+#				A number in range {0, ..., 7}.
+#
+#			3. The JSON file to write the results.
+#
+#			4. (Optionally) A baseline JSON file.
+#
+#			5. (Optionally) -real, to use the real solvers,
+#				i.e. the ones on the PATH.
+#
+#			6. (Optionally) -rep <repeats>, the number of
+#				runs of every seed, by default num_repeats.
+#
+# Example call:
+#	python benchmark_suite.py 0 1 results.json baseline.json -rep 5
+#
+#	Output to example:
+#
+#		| Exp	Strategies	Configuration	Wall(s)	CPU(s)	RSS(MB)	Nodes	Baseline
+#		| 0		[2, 2]		full-enp		1.527	1.481	37.7	2		ok (1.09)
+#		| 0		[2, 2]		fast-xpe		2.218	2.173	37.8	21		ok (0.95)
+#		| ...
+#
+# NOTE: The thread counts (-mtt) are only run in fast mode.
+# The full mode is only run on the experiments with at
+# most max_full_mode_SPs strategy profiles.
+###########################################################
+
+
+#############
+# Libraries #
+#############
+
+## Python
+import os
+import sys
+import csv
+import json
+import math
+import time
+import platform
+import resource
+import subprocess
+
+## Custom
+from do_experiment import experiments
+import gambit
+
+## 3rd Party
+import numpy as np
+
+
+#############
+# Constants #
+#############
+
+rand_seed = [2, 3, 5]
+max_util = 10
+
+## (name, arguments, NE method), the configurations of every experiment
+configurations = [
+	("full-enp",		[],						"enp"),
+	("fast-enp",		["-fm"],				"enp"),
+	("fast-xpe",		["-fm"],				"xpe"),
+	("fast-nenp",		["-fm"],				"nenp"),
+	("fast-enp-mtt2",	["-fm", "-mtt", "2"],	"enp"),
+	("fast-enp-mtt4",	["-fm", "-mtt", "4"],	"enp")
+]
+
+## NE method --> maximum number of players, see gambit.method_max_players
+NE_method_max_players = {
+	"enp":	gambit.method_max_players.enp,
+	"xpe":	gambit.method_max_players.xpe,
+	"nenp":	gambit.method_max_players.nenp
+}
+
+max_full_mode_SPs = 9
+
+## The timeout (s) of a single run
+run_timeout = 600
+
+## The runs of every seed (see -rep), the fastest one is kept
+num_repeats = 3
+
+## A regression is greater than the baseline by more than the
+## tolerance *and* the absolute floor, see compare()
+regression_tolerance		= 0.25
+min_regression_delta_t		= 0.5	# seconds
+min_regression_wall_t		= 1.0	# seconds, shorter runs are not compared
+min_regression_delta_rss	= 16	# MB
+
+suite_dir		= os.path.dirname(os.path.abspath(__file__))
+stand_ins_dir	= os.path.join(suite_dir, "solver_stand_ins")
+
+worker_arg	= "-worker"
+real_arg	= "-real"
+repeats_arg	= "-rep"
+
+count_names = ["nodes", "unique_mgs", "leaves", "terminal_games", "smes"]
+phase_names = ["init_t", "procedure_t", "gambit_t", "clingo_t"]
+
+
+#############
+# Functions #
+#############
+
+## The argument vector of the Application
+def app_argv(strategies, arguments, NE_method, seed):
+	return arguments + \
+		["-nem", NE_method, "-q", "-no", "-se", str(seed), "-r", str(len(strategies))] + \
+		[str(s) for s in strategies] + \
+		[str(max_util)]
+
+
+## The configurations of an experiment
+def experiment_configurations(strategies):
+	for name, arguments, NE_method in configurations:
+		if len(strategies) > NE_method_max_players[NE_method]: continue
+		if "-fm" not in arguments and math.prod(strategies) > max_full_mode_SPs: continue
+
+		yield name, arguments, NE_method
+
+
+## A single run, in the worker process. Returns the measurements
+## as a dictionary (see the header).
+def run_application(argv):
+	import application
+
+	start_t		= time.time()
+	start_cpu_t	= time.process_time()
+	start_times	= os.times()
+
+	app = application.Application(argv)
+	init_t = time.time() - start_t
+	app.exec()
+
+	wall_t		= time.time() - start_t
+	end_times	= os.times()
+	children_cpu_t = \
+		(end_times.children_user - start_times.children_user) + \
+		(end_times.children_system - start_times.children_system)
+
+	stats = app.adapt_proc.get_stats()
+
+	return {
+		"wall_t":			wall_t,
+		"cpu_t":			time.process_time() - start_cpu_t + children_cpu_t,
+		"init_t":			init_t,
+		"procedure_t":		wall_t - init_t,
+		"gambit_t":			app.debugging.get_total_gambit_time(),
+		"gambit_calls":		app.debugging.get_gambit_calls(),
+		"clingo_t":			app.debugging.get_total_clingo_time(),
+		"clingo_calls":		app.debugging.get_clingo_calls(),
+		# ru_maxrss is in KB, on Linux
+		"peak_rss":			resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10,
+		"peak_rss_solvers":	resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 2**10,
+		"nodes":			stats[5],
+		"unique_mgs":		stats[6],
+		"leaves":			stats[7],
+		"terminal_games":	stats[8],
+		"smes":				stats[9]
+	}
+
+
+## A single run, in a fresh process. Returns the measurements, or
+## None if the run failed (or timed out).
+def run(argv, use_stand_ins):
+	env = dict(os.environ)
+	if use_stand_ins: env["PATH"] = stand_ins_dir + os.pathsep + env.get("PATH", "")
+
+	try:
+		worker = subprocess.run(
+			[sys.executable, os.path.abspath(__file__), worker_arg] + argv,
+			stdout=subprocess.PIPE,
+			stderr=subprocess.DEVNULL,
+			text=True,
+			cwd=suite_dir,
+			env=env,
+			timeout=run_timeout
+		)
+	except subprocess.TimeoutExpired:
+		return None
+
+	if worker.returncode != 0: return None
+
+	# the measurements are the last line of the output
+	lines = [line for line in worker.stdout.split("\n") if line != ""]
+	return json.loads(lines[-1])
+
+
+## The fastest of the repeats of a seed, i.e. the minimum wall time,
+## with the minimum peak memory of the repeats. None if any repeat
+## failed.
+def fastest_run(repeats):
+	if any(run is None for run in repeats): return None
+
+	fastest = dict(min(repeats, key=lambda run: run["wall_t"]))
+	fastest["peak_rss"]			= min(run["peak_rss"] for run in repeats)
+	fastest["peak_rss_solvers"]	= min(run["peak_rss_solvers"] for run in repeats)
+
+	return fastest
+
+
+## The averages of the runs of an experiment and a configuration,
+## i.e. of the fastest runs of the seeds (see fastest_run()).
+## The peak memory is the maximum, and the counts are kept for
+## every seed.
+def summarise(experiment, strategies, name, runs):
+	summary = {
+		"experiment":		experiment,
+		"strategies":		strategies,
+		"configuration":	name,
+		"num_runs":			len(runs),
+		"failed":			any(run is None for run in runs)
+	}
+	runs = [run for run in runs if run is not None]
+	if runs == []: return summary
+
+	for key in ["wall_t", "cpu_t"] + phase_names + ["gambit_calls", "clingo_calls"]:
+		summary[key] = float(np.mean([run[key] for run in runs]))
+
+	summary["peak_rss"]			= max(run["peak_rss"] for run in runs)
+	summary["peak_rss_solvers"]	= max(run["peak_rss_solvers"] for run in runs)
+	summary["counts"]			= [[run[key] for key in count_names] for run in runs]
+
+	return summary
+
+
+## The key of a summary, for comparing against the baseline
+def summary_key(summary):
+	return (summary["experiment"], summary["configuration"])
+
+
+## Compares a summary against its baseline summary. Returns the verdict,
+## i.e. a string, and whether it is a regression.
+def compare(summary, baseline):
+	if baseline is None: return "new", False
+	if summary["failed"]: return "FAILED", True
+	if baseline["failed"]: return "ok (baseline failed)", False
+
+	if summary["counts"] != baseline["counts"]: return "MISMATCH (counts)", True
+
+	wall_ratio	= summary["wall_t"] / max(baseline["wall_t"], 1e-9)
+	rss_ratio	= summary["peak_rss"] / max(baseline["peak_rss"], 1e-9)
+
+	## the ratios of short runs, or of small differences, are noise
+	wall_delta	= summary["wall_t"] - baseline["wall_t"]
+	rss_delta	= summary["peak_rss"] - baseline["peak_rss"]
+
+	if wall_ratio > 1 + regression_tolerance and wall_delta > min_regression_delta_t and \
+		summary["wall_t"] >= min_regression_wall_t:
+		return "REGRESSION (time x" + str(round(wall_ratio, 2)) + ")", True
+	if rss_ratio > 1 + regression_tolerance and rss_delta > min_regression_delta_rss:
+		return "REGRESSION (memory x" + str(round(rss_ratio, 2)) + ")", True
+
+	return "ok (" + str(round(wall_ratio, 2)) + ")", False
+
+
+def environment(use_stand_ins):
+	return {
+		"python":		platform.python_version(),
+		"numpy":		np.__version__,
+		"platform":		platform.platform(),
+		"cpu_count":	os.cpu_count(),
+		"stand_ins":	use_stand_ins,
+		"date":			time.strftime("%Y-%m-%d %H:%M:%S")
+	}
+
+
+def write_csv(path, summaries):
+	columns = ["experiment", "strategies", "configuration", "num_runs", "failed", "wall_t", "cpu_t"] + \
+		phase_names + ["gambit_calls", "clingo_calls", "peak_rss", "peak_rss_solvers"]
+
+	f = open(path, "w", newline="")
+	writer = csv.writer(f)
+	writer.writerow(columns + count_names)
+	for summary in summaries:
+		counts = summary.get("counts", [[None] * len(count_names)])[0]
+		writer.writerow([summary.get(column) for column in columns] + counts)
+	f.close()
+
+
+##################
+# The Experiment #
+##################
+
+if __name__ == "__main__":
+
+	## Worker process, see run()
+	if len(sys.argv) > 1 and sys.argv[1] == worker_arg:
+		measurements = run_application(sys.argv[2:])
+		print("\n" + json.dumps(measurements))
+		sys.exit(0)
+
+	#############
+	# Arguments #
+	#############
+
+	argv = sys.argv[1:]
+
+	use_stand_ins = real_arg not in argv
+	if not use_stand_ins: argv.remove(real_arg)
+
+	repeats = num_repeats
+	if repeats_arg in argv:
+		ind = argv.index(repeats_arg)
+		repeats = int(argv[ind + 1])
+		del argv[ind:ind + 2]
+	assert repeats >= 1
+
+	assert len(argv) == 3 or len(argv) == 4
+
+	min_exp = int(argv[0])
+	assert 0 <= min_exp and min_exp <= len(experiments) - 1
+	max_exp = int(argv[1])
+	assert 0 <= max_exp and max_exp <= len(experiments) - 1
+	assert min_exp <= max_exp
+
+	results_path = argv[2]
+
+	baselines = dict()
+	if len(argv) == 4:
+		f = open(argv[3], "r")
+		baselines = {summary_key(summary): summary for summary in json.load(f)["summaries"]}
+		f.close()
+
+	########
+	# Runs #
+	########
+
+	start_t = time.time()
+
+	all_runs	= []
+	summaries	= []
+	regressions	= 0
+
+	print("Exp\tStrategies\tConfiguration\tWall(s)\tCPU(s)\tRSS(MB)\tNodes\tBaseline")
+
+	for experiment in range(min_exp, max_exp + 1):
+		strategies = experiments[experiment]
+
+		for name, arguments, NE_method in experiment_configurations(strategies):
+			runs = []
+			for seed in rand_seed:
+				run_argv = app_argv(strategies, arguments, NE_method, seed)
+
+				seed_runs = []
+				for repeat in range(repeats):
+					measurements = run(run_argv, use_stand_ins)
+					seed_runs.append(measurements)
+					all_runs.append({
+						"experiment":		experiment,
+						"configuration":	name,
+						"seed":				seed,
+						"repeat":			repeat,
+						"argv":				run_argv,
+						"measurements":		measurements
+					})
+
+				runs.append(fastest_run(seed_runs))
+
+			summary = summarise(experiment, strategies, name, runs)
+			summaries.append(summary)
+
+			verdict, is_regression = compare(summary, baselines.get(summary_key(summary)))
+			if is_regression: regressions += 1
+
+			if summary["failed"] and "wall_t" not in summary:
+				print(str(experiment) + "\t" + str(strategies) + "\t\t" + name + "\t-\t-\t-\t-\t" + verdict)
+				continue
+
+			print(
+				str(experiment) + "\t" +
+				str(strategies) + "\t\t" +
+				name + "\t" +
+				str(round(summary["wall_t"], 3)) + "\t" +
+				str(round(summary["cpu_t"], 3)) + "\t" +
+				str(round(summary["peak_rss"], 1)) + "\t" +
+				str(summary["counts"][0][0]) + "\t" +
+				verdict
+			)
+
+	###########
+	# Results #
+	###########
+
+	f = open(results_path, "w")
+	json.dump({
+		"environment":	environment(use_stand_ins),
+		"runs":			all_runs,
+		"summaries":	summaries
+	}, f, indent=1)
+	f.close()
+
+	write_csv(os.path.splitext(results_path)[0] + ".csv", summaries)
+
+	print("\nElapsed Time: " + str(round(time.time() - start_t, 2)) + "(s)")
+	if baselines:
+		print("Regressions: " + str(regressions))
+
+	sys.exit(1 if regressions > 0 else 0)
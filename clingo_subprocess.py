@@ -0,0 +1,128 @@
+###########################################################
+# clingo_subprocess.py
+# --------------------------------------------------------
+# A system call to clingo shell command.
+#
+# Input:
+#	1. Bytes clingo_mg_file, the description of a MG in
+#		clingo predicates, encoded (see
+#		MisinformationGame.get_clingo_format_bytes()).
+#		A string is also accepted.
+#
+#	2. String clingo_nme, a string containing *a single*
+#		predicate describing a nme.
+#
+#	3. File clingo_axioms, a file containing the axioms
+#		(clingo rules) to compute an addaptation step,
+#		given a MG and a nme.
+#
+#		By Default: clingo_axioms = "./addaptation.pl"
+#
+# Output:
+#	* String answer_set, a string conatining the predicates
+#		computed by clingo.
+#	
+#	NOTE:	1) The answer set, for technical reasons, is
+#			containing the predicate answer_set/0.
+#
+#			2) Also, if the NFG has changed through the
+#			addaptation step, the predicate changed/0.
+#			will be in the answer set. If not, the the
+#			predicate unchanged/0. will hold.
+#
+# The program is assembled as bytes, i.e. the axioms, read
+# (once) from the file, the MG and the nme, and it is written
+# to the stdin of clingo with a single write.
+#
+# See also: addaptation.pl for further documentation.
+#
+# author: Merkouris Papamichail
+# email: mercoyris@ics.forth.gr
+# institute: ICS, FORTH
+# last update: 13/4/2022
+###########################################################
+
+#############
+# Libraries #
+#############
+
+import subprocess
+from threading import Lock
+
+
+#############
+# Constants #
+#############
+
+## The axioms files, read once, path --> bytes
+_axioms			= dict()
+_axioms_lock	= Lock()
+
+
+#############
+# Functions #
+#############
+
+## The (cached) contents of an axioms file
+def get_axioms(clingo_axioms):
+	_axioms_lock.acquire()
+	if clingo_axioms not in _axioms:
+		f = open(clingo_axioms, "rb")
+		_axioms[clingo_axioms] = f.read()
+		f.close()
+	axioms = _axioms[clingo_axioms]
+	_axioms_lock.release()
+	
+	return axioms
+
+
+## The stdin of clingo, i.e. the axioms, the MG and the nme
+def clingo_program(clingo_mg_file, clingo_nme, clingo_axioms):
+	if isinstance(clingo_mg_file, str): clingo_mg_file = clingo_mg_file.encode()
+	
+	return b"".join([
+		get_axioms(clingo_axioms),
+		clingo_mg_file,		b"\n",
+		clingo_nme.encode(),	b"\n"
+	])
+
+
+def addaptation_step(clingo_mg_file, clingo_nme, clingo_axioms="./adaptation.lp"):
+	input = clingo_program(clingo_mg_file, clingo_nme, clingo_axioms)
+	
+	# subprocess.run(input=...) writes the stdin in small chunks,
+	# while polling the stdout. Before reading the program, clingo
+	# only prints its version and "Reading from stdin", which fit in
+	# the pipe buffer, and the rest of its output comes after the
+	# whole program is read, thus a single write does not deadlock.
+	clingo_call = subprocess.Popen(
+		[
+			"clingo",
+			"-t",
+			"4"
+		],
+		stdin=subprocess.PIPE,
+		stdout=subprocess.PIPE,
+		stderr=subprocess.DEVNULL
+	)
+	# If clingo exits early, e.g. on a syntax error, the write (or
+	# the close) fails, and the missing answer set is reported below
+	try:
+		clingo_call.stdin.write(input)
+	except BrokenPipeError:
+		pass
+	try:
+		clingo_call.stdin.close()
+	except BrokenPipeError:
+		pass
+	output = clingo_call.stdout.read()
+	clingo_call.stdout.close()
+	clingo_call.wait()
+	
+	answer_set = None
+	for line in output.split(b"\n"):
+		if b"answer_set" in line:
+			answer_set = line
+	
+	assert answer_set is not None, "Error: No answer set in the output of clingo!"
+	return answer_set.decode()
@@ -4,29 +4,354 @@
 
 import auxiliary_functions as ax
 import os
+import bisect
+import json
+import time
+from threading import Lock, get_ident
+
+
+###########
+# Metrics #
+###########
+
+## The latency histograms (in seconds), see Debugging.observe()
+class histogram_names:
+	gambit_call			= "gambit_call"			# a GAMBIT call (or a native NE method)
+	clingo_call			= "clingo_call"			# an adaptation step of a backend
+	answer_set_parsing	= "answer_set_parsing"	# see MisinformationGame.utilities_from_clingo()
+	NE_parsing			= "NE_parsing"			# see parsers.parse_gambit_out_file()
+	domain_mapping		= "domain_mapping"		# see SPDomain.default_mapping_list()
+	MG_construction		= "MG_construction"		# a new MG, from the adaptation step to its NMEs
+	queue_wait			= "queue_wait"			# a traversal thread waiting for a node
+
+histogram_names_list = [
+	histogram_names.gambit_call,
+	histogram_names.clingo_call,
+	histogram_names.answer_set_parsing,
+	histogram_names.NE_parsing,
+	histogram_names.domain_mapping,
+	histogram_names.MG_construction,
+	histogram_names.queue_wait
+]
+
+## The computations skipped, see Debugging.skipped_computation()
+class skipped_names:
+	unchanged_pos_vec	= "skipped_unchanged_pos_vec"	# the pos. vec. is in the parent's key, no adaptation step
+	reused_MG			= "skipped_reused_MG"			# the MG of the key is already in the pool
+	fast_mode_pruned	= "skipped_fast_mode_pruned"	# the child's MG is not new, its subtree is not explored
+
+skipped_names_list = [
+	skipped_names.unchanged_pos_vec,
+	skipped_names.reused_MG,
+	skipped_names.fast_mode_pruned
+]
+
+## The gauges, see Debugging.add_gauge()
+class gauge_names:
+	queue_depth		= "queue_depth"		# the nodes in the scheduler
+	active_workers	= "active_workers"	# the workers doing an adaptation step (or computing a MG)
+
+gauge_names_list = [
+	gauge_names.queue_depth,
+	gauge_names.active_workers
+]
+
+## The upper bounds (in seconds) of the buckets of the histograms,
+## i.e. 1, 2.5, 5 per decade, from 1us to 100s. The last bucket is
+## +Inf.
+histogram_bounds = [float(m + "e" + str(e)) for e in range(-6, 2) for m in ["1", "2.5", "5"]] + [100.0]
+
+histogram_percentiles = [0.5, 0.9, 0.99]
+
+## The prefix of the Prometheus metrics
+prometheus_prefix = "adaptation_"
+
+
+##################################################################
+# Histogram
+# ---------------------------------------------------------------
+# A thread-safe latency histogram, of fixed buckets (see
+# histogram_bounds). The percentiles are estimated by a linear
+# interpolation inside the bucket of the percentile, clamped to the
+# minimum and the maximum observed values.
+##################################################################
+class Histogram:
+
+	def __init__(self):
+		self.bucket_counts	= [0] * (len(histogram_bounds) + 1)
+		self.count			= 0
+		self.sum			= 0.0
+		self.min			= None
+		self.max			= None
+
+		self.lock = Lock()
+
+	def observe(self, value):
+		bucket = bisect.bisect_left(histogram_bounds, value)
+
+		with self.lock:
+			self.bucket_counts[bucket] += 1
+			self.count	+= 1
+			self.sum	+= value
+			if self.min is None or value < self.min: self.min = value
+			if self.max is None or value > self.max: self.max = value
+
+	#############
+	# Accessors #
+	#############
+
+	def get_count(self):
+		return self.count
+
+	def get_sum(self):
+		return self.sum
+
+	def get_mean(self):
+		if self.count == 0: return 0
+
+		return self.sum / self.count
+
+	def get_percentile(self, q):
+		assert 0 <= q and q <= 1
+
+		with self.lock:
+			if self.count == 0: return 0
+
+			rank = q * self.count
+			cumulative = 0
+			for bucket, bucket_count in enumerate(self.bucket_counts):
+				if bucket_count > 0 and cumulative + bucket_count >= rank: break
+				cumulative += bucket_count
+
+			lower = histogram_bounds[bucket - 1] if bucket > 0 else 0.0
+			upper = histogram_bounds[bucket] if bucket < len(histogram_bounds) else self.max
+			lower = max(lower, self.min)
+			upper = min(upper, self.max)
+
+			return lower + (upper - lower) * (rank - cumulative) / bucket_count
+
+	## The state of the histogram, in order to send it from a worker
+	## process to the main one, or to save it to a checkpoint
+	def get_state(self):
+		with self.lock:
+			return (list(self.bucket_counts), self.count, self.sum, self.min, self.max)
+
+	## Adds the state (see get_state()) of another histogram
+	def add_state(self, state):
+		bucket_counts, count, total, minimum, maximum = state
+		if count == 0: return
+
+		with self.lock:
+			for bucket, bucket_count in enumerate(bucket_counts):
+				self.bucket_counts[bucket] += bucket_count
+			self.count	+= count
+			self.sum	+= total
+			if self.min is None or minimum < self.min: self.min = minimum
+			if self.max is None or maximum > self.max: self.max = maximum
+
+	## Returns the state, and empties the histogram
+	def take_state(self):
+		with self.lock:
+			state = (self.bucket_counts, self.count, self.sum, self.min, self.max)
+
+			self.bucket_counts	= [0] * (len(histogram_bounds) + 1)
+			self.count			= 0
+			self.sum			= 0.0
+			self.min			= None
+			self.max			= None
+
+		return state
+
+	def export(self):
+		bucket_counts, count, total, minimum, maximum = self.get_state()
+
+		output = {
+			"count"	: count,
+			"sum"	: total,
+			"mean"	: total / count if count > 0 else 0,
+			"min"	: minimum,
+			"max"	: maximum
+		}
+		for q in histogram_percentiles:
+			output["p" + str(int(q * 100))] = self.get_percentile(q)
+
+		## the cumulative counts, as in Prometheus, i.e.
+		## upper bound --> number of values <= upper bound
+		buckets = dict()
+		cumulative = 0
+		for bound, bucket_count in zip(histogram_bounds + ["+Inf"], bucket_counts):
+			cumulative += bucket_count
+			buckets[str(bound)] = cumulative
+		output["buckets"] = buckets
+
+		return output
+
+
+##################################################################
+# ProfiledLock
+# ---------------------------------------------------------------
+# A drop-in replacement of threading.Lock (see Debugging.new_lock()),
+# recording the time waiting for the lock and the time holding it.
+# It can be the lock of a threading.Condition, i.e. the time of a
+# Condition.wait() is not counted as holding time, and the time
+# re-acquiring the lock after a notify() is counted as waiting
+# time. The statistics are updated while holding the lock, thus
+# no additional lock is needed.
+##################################################################
+class ProfiledLock:
+
+	def __init__(self, name):
+		self.name	= name
+		self.lock	= Lock()
+
+		## The holder of the lock, see _is_owned()
+		self.owner		= None
+		self.acquired_t	= None
+
+		## Statistics
+		self.acquisitions	= 0
+		self.contentions	= 0		# the acquisitions that found the lock held
+		self.wait_time		= 0.0
+		self.hold_time		= 0.0
+		self.max_wait_time	= 0.0
+		self.max_hold_time	= 0.0
+
+	def acquire(self, blocking = True, timeout = -1):
+		start_t = time.perf_counter()
+
+		acquired	= self.lock.acquire(False)
+		contended	= not acquired
+		if contended and blocking:
+			acquired = self.lock.acquire(True, timeout)
+
+		if not acquired: return False
+
+		self.acquired_t	= time.perf_counter()
+		self.owner		= get_ident()
+
+		wait_time = self.acquired_t - start_t
+		self.acquisitions	+= 1
+		self.contentions	+= contended
+		self.wait_time		+= wait_time
+		if wait_time > self.max_wait_time: self.max_wait_time = wait_time
+
+		return True
+
+	def release(self):
+		hold_time = time.perf_counter() - self.acquired_t
+		self.hold_time += hold_time
+		if hold_time > self.max_hold_time: self.max_hold_time = hold_time
+
+		self.owner = None
+		self.lock.release()
+
+	def locked(self):
+		return self.lock.locked()
+
+	## Used by threading.Condition, instead of probing the lock
+	def _is_owned(self):
+		return self.owner == get_ident()
+
+	def __enter__(self):
+		return self.acquire()
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.release()
+
+	#############
+	# Accessors #
+	#############
+
+	def get_name(self):
+		return self.name
+
+	def get_acquisitions(self):
+		return self.acquisitions
+
+	def get_contentions(self):
+		return self.contentions
+
+	def get_wait_time(self):
+		return self.wait_time
+
+	def get_hold_time(self):
+		return self.hold_time
+
+	def export(self):
+		return {
+			"acquisitions"	: self.acquisitions,
+			"contentions"	: self.contentions,
+			"wait_time"		: self.wait_time,
+			"hold_time"		: self.hold_time,
+			"max_wait_time"	: self.max_wait_time,
+			"max_hold_time"	: self.max_hold_time
+		}
+
 
 class Debugging:
 
-	def __init__(self, print_warnings = False, die_after_warning = False):
+	def __init__(self, print_warnings = False, die_after_warning = False, profiling = False):
 
 		## Counters
 		self.gambit_calls 		= 0
 		self.clingo_calls 		= 0
 		#self.num_voronoi_cells	= 0
 
+		## Nash Equilibria Cache (see nash_equilibria_cache.py)
+		self.nash_equilibria_cache_hits		= 0
+		self.nash_equilibria_cache_misses	= 0
+		self.nash_equilibria_cache_lock		= Lock()
+
+		## NFGs that inherited the Nash Equilibria of the parent MG
+		## (see MisinformationGame.inherit_nash_equilibria())
+		self.inherited_NE		= 0
+		self.inherited_NE_lock	= Lock()
+
 		## Timers
 		self.total_gambit_time = 0
 		self.total_clingo_time = 0
 
+		## The NFGs of a MG may be solved concurrently
+		## (see Gambit.set_num_workers()), as the adaptation
+		## steps (see -mtt)
+		self.gambit_lock = Lock()
+		self.clingo_lock = Lock()
+
 		## Warning Counters
 		self.zeros_mixed_strategy 	= 0		# GAMBIT returned a strategy of the form (0, 0, .., 0)
 		self.mixed_strat_lt_one		= 0		# the probabilities of a mixed strategy don't add to 1
 		self.no_nash				= 0		# a GAMBIT call returned no nash equilibria
+		self.warnings_lock			= Lock()
+
+		## Latency Histograms (see histogram_names)
+		self.histograms = dict()
+		for name in histogram_names_list:
+			self.histograms[name] = Histogram()
+
+		## Skipped Computations (see skipped_names)
+		self.skipped = dict()
+		for name in skipped_names_list:
+			self.skipped[name] = 0
+		self.skipped_lock = Lock()
+
+		## Gauges (see gauge_names), name --> [value, max value]
+		self.gauges = dict()
+		for name in gauge_names_list:
+			self.gauges[name] = [0, 0]
+		self.gauges_lock = Lock()
 
 		## Multithreading
 		self.hardware_threads = os.cpu_count()
 		self.too_many_threads = False
 
+		## (Optional) Profiling of the locks (see new_lock()) and of
+		## the traversal threads, worker id --> [busy time, idle
+		## time, adaptation steps]
+		self.profiling		= profiling
+		self.locks			= dict()	# name --> ProfiledLock
+		self.worker_times	= dict()
+		self.workers_lock	= Lock()
+
 		## States
 		self.print_warnings 	= print_warnings
 		self.die_after_warning	= die_after_warning
@@ -44,6 +369,8 @@ class Debugging:
 		return self.gambit_calls
 
 	def get_average_gambit_time(self):
+		if self.gambit_calls == 0: return 0
+
 		return self.total_gambit_time / self.gambit_calls
 
 
@@ -55,9 +382,22 @@ class Debugging:
 		return self.clingo_calls
 
 	def get_average_clingo_time(self):
+		if self.clingo_calls == 0: return 0
+
 		return self.total_clingo_time / self.clingo_calls
 
 
+	## Nash Equilibria Cache
+	def get_nash_equilibria_cache_hits(self):
+		return self.nash_equilibria_cache_hits
+
+	def get_nash_equilibria_cache_misses(self):
+		return self.nash_equilibria_cache_misses
+
+	def get_inherited_nash_equilibria(self):
+		return self.inherited_NE
+
+
 	## Warnings
 	def get_zeros_mixed_strategy(self):
 		return self.zeros_mixed_strategy
@@ -71,6 +411,38 @@ class Debugging:
 	def get_too_many_threads(self):
 		return self.too_many_threads
 
+
+	## Metrics
+	def get_histogram(self, name):
+		assert name in histogram_names_list
+		return self.histograms[name]
+
+	def get_skipped(self, name):
+		assert name in skipped_names_list
+		return self.skipped[name]
+
+	def get_gauge(self, name):
+		assert name in gauge_names_list
+		return self.gauges[name][0]
+
+	def get_gauge_max(self, name):
+		assert name in gauge_names_list
+		return self.gauges[name][1]
+
+
+	## Profiling
+	def is_profiling(self):
+		return self.profiling
+
+	## The profiled locks, sorted by the waiting time (descending)
+	def get_profiled_locks(self):
+		return sorted(self.locks.values(), key=lambda lock: lock.get_wait_time(), reverse=True)
+
+	## worker id --> (busy time, idle time, adaptation steps)
+	def get_worker_times(self):
+		with self.workers_lock:
+			return {worker_id: tuple(times) for worker_id, times in sorted(self.worker_times.items())}
+
 	## One get to rule them all
 	def get_stats(self):
 
@@ -83,7 +455,50 @@ class Debugging:
 				self.get_zeros_mixed_strategy(),
 				self.get_mixed_strat_lt_one(),
 				self.get_no_nash(),
-				self.get_too_many_threads()]
+				self.get_too_many_threads(),
+				self.get_nash_equilibria_cache_hits(),
+				self.get_nash_equilibria_cache_misses(),
+				self.get_inherited_nash_equilibria()]
+
+	## The counters and the timers, e.g. in order to send them from a
+	## worker process to the main one (see process_traversal.py)
+	def get_counters(self):
+		return {
+			"gambit_calls"					: self.gambit_calls,
+			"total_gambit_time"				: self.total_gambit_time,
+			"clingo_calls"					: self.clingo_calls,
+			"total_clingo_time"				: self.total_clingo_time,
+			"nash_equilibria_cache_hits"	: self.nash_equilibria_cache_hits,
+			"nash_equilibria_cache_misses"	: self.nash_equilibria_cache_misses,
+			"inherited_NE"					: self.inherited_NE,
+			"zeros_mixed_strategy"			: self.zeros_mixed_strategy,
+			"mixed_strat_lt_one"			: self.mixed_strat_lt_one,
+			"no_nash"						: self.no_nash,
+			**self.skipped
+		}
+
+	## Adds the counters (see get_counters()) of another Debugging instance
+	def add_counters(self, counters):
+		with self.gambit_lock, self.clingo_lock, self.nash_equilibria_cache_lock, \
+			self.inherited_NE_lock, self.warnings_lock, self.skipped_lock:
+			for name, value in counters.items():
+				if name in self.skipped:	self.skipped[name] += value
+				else:						setattr(self, name, getattr(self, name) + value)
+
+	## The states of the histograms, see Histogram.get_state()
+	def get_histograms(self):
+		return {name: histogram.get_state() for name, histogram in self.histograms.items()}
+
+	## The states of the histograms, and empties them, e.g. in a
+	## worker process, after every new MG (see process_traversal.py)
+	def take_histograms(self):
+		return {name: histogram.take_state() for name, histogram in self.histograms.items()}
+
+	## Adds the histograms (see get_histograms()) of another Debugging
+	## instance
+	def add_histograms(self, histograms):
+		for name, state in histograms.items():
+			self.histograms[name].add_state(state)
 
 	###################
 	# Subsystem Calls #
@@ -93,15 +508,189 @@ class Debugging:
 	def gambit_call(self, time):
 		assert time >= 0
 
-		self.gambit_calls += 1
-		self.total_gambit_time += time
+		with self.gambit_lock:
+			self.gambit_calls += 1
+			self.total_gambit_time += time
+
+		self.histograms[histogram_names.gambit_call].observe(time)
 
 	## CLINGO
 	def clingo_call(self, time):
 		assert time >= 0
 
-		self.clingo_calls += 1
-		self.total_clingo_time += time
+		with self.clingo_lock:
+			self.clingo_calls += 1
+			self.total_clingo_time += time
+
+		self.histograms[histogram_names.clingo_call].observe(time)
+
+	## Nash Equilibria Cache
+	def nash_equilibria_cache_hit(self):
+		with self.nash_equilibria_cache_lock:
+			self.nash_equilibria_cache_hits += 1
+
+	def nash_equilibria_cache_miss(self):
+		with self.nash_equilibria_cache_lock:
+			self.nash_equilibria_cache_misses += 1
+
+	## Inherited Nash Equilibria
+	def inherited_nash_equilibria(self):
+		with self.inherited_NE_lock:
+			self.inherited_NE += 1
+
+
+	###########
+	# Metrics #
+	###########
+
+	## The latency (in seconds) of a phase, see histogram_names
+	def observe(self, name, time):
+		assert name in histogram_names_list
+		assert time >= 0
+
+		self.histograms[name].observe(time)
+
+	def skipped_computation(self, name):
+		assert name in skipped_names_list
+
+		with self.skipped_lock:
+			self.skipped[name] += 1
+
+	def add_gauge(self, name, delta):
+		assert name in gauge_names_list
+
+		with self.gauges_lock:
+			gauge = self.gauges[name]
+			gauge[0] += delta
+			if gauge[0] > gauge[1]: gauge[1] = gauge[0]
+
+	def set_gauge(self, name, value):
+		assert name in gauge_names_list
+
+		with self.gauges_lock:
+			gauge = self.gauges[name]
+			gauge[0] = value
+			if gauge[0] > gauge[1]: gauge[1] = gauge[0]
+
+
+	#############
+	# Profiling #
+	#############
+
+	## A new lock, i.e. a ProfiledLock, if profiling is on, otherwise,
+	## a plain threading.Lock. The names should be unique.
+	def new_lock(self, name):
+		if not self.profiling: return Lock()
+
+		assert name not in self.locks
+
+		lock = ProfiledLock(name)
+		self.locks[name] = lock
+		return lock
+
+	## The time (in seconds) of a traversal thread doing an adaptation
+	## step
+	def worker_busy(self, worker_id, time):
+		if not self.profiling: return
+		assert time >= 0
+
+		with self.workers_lock:
+			times = self.worker_times.setdefault(worker_id, [0.0, 0.0, 0])
+			times[0] += time
+			times[2] += 1
+
+	## The time (in seconds) of a traversal thread waiting for a node
+	def worker_idle(self, worker_id, time):
+		if not self.profiling: return
+		assert time >= 0
+
+		with self.workers_lock:
+			times = self.worker_times.setdefault(worker_id, [0.0, 0.0, 0])
+			times[1] += time
+
+	## All the metrics, as a dictionary, i.e. the histograms (see
+	## Histogram.export()), the counters (see get_counters()) and the
+	## gauges
+	def get_metrics(self):
+		with self.gauges_lock:
+			gauges = {name: {"value": gauge[0], "max": gauge[1]} for name, gauge in self.gauges.items()}
+
+		metrics = {
+			"histograms"	: {name: histogram.export() for name, histogram in self.histograms.items()},
+			"counters"		: self.get_counters(),
+			"gauges"		: gauges
+		}
+
+		if self.profiling:
+			metrics["locks"]	= {lock.get_name(): lock.export() for lock in self.get_profiled_locks()}
+			metrics["workers"]	= {
+				str(worker_id): {"busy_time": busy, "idle_time": idle, "steps": steps}
+				for worker_id, (busy, idle, steps) in self.get_worker_times().items()
+			}
+
+		return metrics
+
+	def export_json(self):
+		return json.dumps(self.get_metrics(), indent=1)
+
+	## The metrics in the Prometheus text format, i.e. the histograms
+	## as <prefix><name>_seconds, the counters as <prefix><name>_total,
+	## and the gauges as <prefix><name> (and <prefix><name>_max), where
+	## <prefix> is prometheus_prefix. If profiling is on, the times of
+	## the locks and of the workers are labelled counters, e.g.
+	## <prefix>lock_wait_seconds_total{lock="queue_lock"}
+	def export_prometheus(self):
+		output = []
+
+		for name, histogram in self.histograms.items():
+			metric = prometheus_prefix + name + "_seconds"
+			output.append("# TYPE " + metric + " histogram\n")
+
+			bucket_counts, count, total, minimum, maximum = histogram.get_state()
+			cumulative = 0
+			for bound, bucket_count in zip(histogram_bounds + ["+Inf"], bucket_counts):
+				cumulative += bucket_count
+				output.append(metric + "_bucket{le=\"" + str(bound) + "\"} " + str(cumulative) + "\n")
+
+			output.append(metric + "_sum " + repr(total) + "\n")
+			output.append(metric + "_count " + str(count) + "\n")
+
+		for name, value in self.get_counters().items():
+			## e.g. total_gambit_time --> gambit_time_seconds_total
+			if name.startswith("total_"):	metric = prometheus_prefix + name[len("total_"):] + "_seconds_total"
+			else:							metric = prometheus_prefix + name + "_total"
+			output.append("# TYPE " + metric + " counter\n")
+			output.append(metric + " " + repr(value) + "\n")
+
+		with self.gauges_lock:
+			for name, gauge in self.gauges.items():
+				metric = prometheus_prefix + name
+				output.append("# TYPE " + metric + " gauge\n")
+				output.append(metric + " " + str(gauge[0]) + "\n")
+				output.append("# TYPE " + metric + "_max gauge\n")
+				output.append(metric + "_max " + str(gauge[1]) + "\n")
+
+		if self.profiling:
+			locks = self.get_profiled_locks()
+			for name, value in [
+				("lock_acquisitions_total",		lambda lock: lock.get_acquisitions()),
+				("lock_contentions_total",		lambda lock: lock.get_contentions()),
+				("lock_wait_seconds_total",		lambda lock: lock.get_wait_time()),
+				("lock_hold_seconds_total",		lambda lock: lock.get_hold_time())
+			]:
+				metric = prometheus_prefix + name
+				output.append("# TYPE " + metric + " counter\n")
+				for lock in locks:
+					output.append(metric + "{lock=\"" + lock.get_name() + "\"} " + repr(value(lock)) + "\n")
+
+			worker_times = self.get_worker_times()
+			for name, column in [("worker_busy_seconds_total", 0), ("worker_idle_seconds_total", 1), ("worker_steps_total", 2)]:
+				metric = prometheus_prefix + name
+				output.append("# TYPE " + metric + " counter\n")
+				for worker_id, times in worker_times.items():
+					output.append(metric + "{worker=\"" + str(worker_id) + "\"} " + repr(times[column]) + "\n")
+
+		return "".join(output)
 
 
 	######################
@@ -112,7 +701,8 @@ class Debugging:
 
 		for strategy_profile in strategy_profile_list:
 			if ax.sp_is_zeros(strategy_profile):
-				self.zeros_mixed_strategy += 1		# increase the warning counter
+				with self.warnings_lock:
+					self.zeros_mixed_strategy += 1		# increase the warning counter
 
 				if self.print_warnings:
 					print("Debugging Warning: strategy profile " + str(strategy_profile) + " has a zeros mixed strategy!")
@@ -125,7 +715,8 @@ class Debugging:
 
 		for strategy_profile in strategy_profile_list:
 			if ax.sp_lt_one(strategy_profile):
-				self.mixed_strat_lt_one += 1
+				with self.warnings_lock:
+					self.mixed_strat_lt_one += 1
 
 				if self.print_warnings:
 					print("Debugging Warning: strategy profile " + str(strategy_profile) + " has a mixed strategy of sum less than one!")
@@ -137,7 +728,8 @@ class Debugging:
 	def check_no_nash(self, nash_equilibria_list):
 
 		if nash_equilibria_list == []:
-			self.no_nash += 1
+			with self.warnings_lock:
+				self.no_nash += 1
 
 			if self.print_warnings:
 				print("Debugging Warning: No Nash Equilibria found!")
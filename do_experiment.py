@@ -52,6 +52,9 @@
 # email: mercoyris@ics.forth.gr
 # institute: ICS, FORTH
 # last update: 13/4/2022
+#
+# NOTE: The experiments list is also used by
+# benchmark_suite.py.
 ###########################################################
 
 
@@ -87,72 +90,74 @@ experiments =[[2, 2],			# 0. 2^4	= 16	SPs
 			  [2, 2, 2, 2]]		# 7. 2^16	= 65536 SPs
 
 
-#############
-# Arguments #
-#############
+if __name__ == "__main__":
+
+	#############
+	# Arguments #
+	#############
 
-min_exp = int(sys.argv[1])
-assert 0 <= min_exp and min_exp <= len(experiments) - 1
-max_exp = int(sys.argv[2])
-assert 0 <= max_exp and max_exp <= len(experiments) - 1
-assert min_exp <= max_exp
+	min_exp = int(sys.argv[1])
+	assert 0 <= min_exp and min_exp <= len(experiments) - 1
+	max_exp = int(sys.argv[2])
+	assert 0 <= max_exp and max_exp <= len(experiments) - 1
+	assert min_exp <= max_exp
 
-out_to_file = True
-if len(sys.argv) == 4:
-	output	= sys.argv[3]
-else:
-	out_to_file = False
+	out_to_file = True
+	if len(sys.argv) == 4:
+		output	= sys.argv[3]
+	else:
+		out_to_file = False
 
-##################
-# The Experiment #
-##################
+	##################
+	# The Experiment #
+	##################
 
 
-## starting experiment
-start_t = time.time()
+	## starting experiment
+	start_t = time.time()
 
-for i in range(min_exp, max_exp + 1):
+	for i in range(min_exp, max_exp + 1):
 	
-	print("Doing experiment with strategy vectors: " + str(experiments[i]) + "\n")
+		print("Doing experiment with strategy vectors: " + str(experiments[i]) + "\n")
 	
-	S = np.zeros(8)
+		S = np.zeros(8)
 
-	for j in range(1, 6):
+		for j in range(1, 6):
 
-		## construct the argument vector
-		ad_argv = ["-fm", "-mtt", "4", "-no", "-se", str(rand_seed[j-1]), "-r", str(len(experiments[i]))]
-		for s in experiments[i]:
-			ad_argv += str(s)
-		ad_argv += [str(max_util)]
+			## construct the argument vector
+			ad_argv = ["-fm", "-mtt", "4", "-no", "-se", str(rand_seed[j-1]), "-r", str(len(experiments[i]))]
+			for s in experiments[i]:
+				ad_argv += [str(s)]
+			ad_argv += [str(max_util)]
 		
-		## run the experiment 
-		app = application.Application(ad_argv)
-		app.exec()
+			## run the experiment 
+			app = application.Application(ad_argv)
+			app.exec()
 	
-		# data
-		data_vec = np.array(app.get_numerical_stats())
+			# data
+			data_vec = np.array(app.get_numerical_stats())
 		
-		print("  Exp " + str(j) + ": " + str(app.get_numerical_stats()))
+			print("  Exp " + str(j) + ": " + str(app.get_numerical_stats()))
 		
-		if j != 1 and j != 5:
-			S += data_vec
+			if j != 1 and j != 5:
+				S += data_vec
 	
-	# calculate the average
-	S = S / 3
-	print("\nAverage: " + str(S))
-	if out_to_file:
-		f_out = open(output, "a")
-		np.savetxt(f_out, S, fmt='%1.3f', newline=" ")
-		f_out.write("\n")
-		f_out.close()
+		# calculate the average
+		S = S / 3
+		print("\nAverage: " + str(S))
+		if out_to_file:
+			f_out = open(output, "a")
+			np.savetxt(f_out, S, fmt='%1.3f', newline=" ")
+			f_out.write("\n")
+			f_out.close()
 
-## end experiment
-end_t = time.time()
-total_t = end_t - start_t
+	## end experiment
+	end_t = time.time()
+	total_t = end_t - start_t
 
 
-####################
-# Print Some Stats #
-####################
+	####################
+	# Print Some Stats #
+	####################
 
-print("\n\nElapsed Time: " + str(total_t) + "(s)")
+	print("\n\nElapsed Time: " + str(total_t) + "(s)")
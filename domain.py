@@ -44,6 +44,9 @@ class SPDomain:
 		## States
 		self.initialised = False
 
+	def get_default_method_val(self):
+		return self.default_method_val
+
 	def initialise(self, num_players, strategies):
 		assert self.initialised == False
 		assert num_players >= 0
@@ -9,8 +9,23 @@
 #   2. Extreme Point Enumeration (gambit-enummixed)
 #       for 2-player games
 #
+# Also, provides the in-process (native) methods of
+# native_solvers.py, which do not call GAMBIT, e.g.
+#
+#   3. Native Extreme Point Enumeration (NumPy)
+#       for 2-player games
+#
+#   4. Native Enumerate Pure Equilibria (NumPy)
+#       for n-player games
+#
 # The default method
 #
+# The NFGs of a MG may be solved concurrently, on a bounded
+# pool of worker threads (see set_num_workers()). The pool is
+# shared by all the NFGs, and all the traversal threads, thus
+# the number of live GAMBIT processes never exceeds the number
+# of workers.
+#
 
 #############
 # Constants #
@@ -25,6 +40,9 @@ max_players = 2**32
 #############
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+import native_solvers
 
 ###########
 # Classes #
@@ -35,6 +53,8 @@ class method_vals:
     xpe_val = 1
     enp_val = 2     # enumerate pure
     pol_val = 3
+    nxpe_val = 4    # native (in-process) extreme point enumeration
+    nenp_val = 5    # native (in-process) enumerate pure
 
 
 method_vals = method_vals()
@@ -44,7 +64,22 @@ method_vals_list = [
     method_vals.gnm_val,
     method_vals.xpe_val,
     method_vals.enp_val,
-    method_vals.pol_val
+    method_vals.pol_val,
+    method_vals.nxpe_val,
+    method_vals.nenp_val
+]
+
+# the methods that are computed in-process,
+# see native_solvers.py
+native_method_vals_list = [
+    method_vals.nxpe_val,
+    method_vals.nenp_val
+]
+
+# the native methods that can compute the NE of
+# all the n+1 games of an MG in a single call
+stacked_method_vals_list = [
+    method_vals.nenp_val
 ]
 
 
@@ -53,6 +88,8 @@ class method_names:
     xpe = "Extreme Point Enumeration"
     enp = "Enumerate Pure Nash Equilibria"
     pol = "Support Enumeration"
+    nxpe = "Native Extreme Point Enumeration (NumPy)"
+    nenp = "Native Enumerate Pure Nash Equilibria (NumPy)"
 
 method_names = method_names()
 
@@ -60,7 +97,9 @@ method_names_list = [
     method_names.gnm,
     method_names.xpe,
     method_names.enp,
-    method_names.pol
+    method_names.pol,
+    method_names.nxpe,
+    method_names.nenp
 ]
 
 # the maximum number of players
@@ -71,6 +110,8 @@ class method_max_players:
     xpe = 2
     enp = max_players
     pol = max_players
+    nxpe = 2
+    nenp = max_players
 
 method_max_players = method_max_players()
 
@@ -78,7 +119,9 @@ method_max_players_list = [
     method_max_players.gnm,
     method_max_players.xpe,
     method_max_players.enp,
-    method_max_players.pol
+    method_max_players.pol,
+    method_max_players.nxpe,
+    method_max_players.nenp
 ]
 
 class Gambit:
@@ -97,6 +140,15 @@ class Gambit:
         # compute_nash_equilibria()
         self.default_method_val = method_val
 
+        # An (optional) cache of Nash Equilibria, shared by all the NFGs,
+        # see nash_equilibria_cache.py
+        self.nash_equilibria_cache = None
+
+        # An (optional) pool of worker threads, solving the NFGs
+        # concurrently, see set_num_workers()
+        self.num_workers = 1
+        self.executor = None
+
     #############
     # Accessors #
     #############
@@ -107,10 +159,64 @@ class Gambit:
     def get_default_method_name(self):
         return method_names_list[self.default_method_val]
 
+    def get_decimal(self):
+        return self.decimal
+
+    def get_timeout(self):
+        return self.timeout
+
+    def has_nash_equilibria_cache(self):
+        return self.nash_equilibria_cache != None
+
+    def get_nash_equilibria_cache(self):
+        assert self.has_nash_equilibria_cache()
+
+        return self.nash_equilibria_cache
+
+    def has_executor(self):
+        return self.executor != None
+
+    def get_num_workers(self):
+        return self.num_workers
+
+    def is_native_method(self):
+        return self.default_method_val in native_method_vals_list
+
+    def is_stacked_method(self):
+        return self.default_method_val in stacked_method_vals_list
+
+    #############
+    # Modifiers #
+    #############
+
+    def set_nash_equilibria_cache(self, nash_equilibria_cache):
+        self.nash_equilibria_cache = nash_equilibria_cache
+
+    # Solve (at most) num_workers NFGs concurrently, see submit()
+    def set_num_workers(self, num_workers):
+        assert num_workers > 0
+        assert not self.has_executor()
+
+        self.num_workers = num_workers
+        if num_workers > 1:
+            self.executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="gambit")
+
     ###########
     # Methods #
     ###########
 
+    # Schedules fn(*args) on the pool of worker threads and
+    # returns its future, e.g. submit(NFG.compute_nash_equilibria)
+    def submit(self, fn, *args):
+        assert self.has_executor()
+
+        return self.executor.submit(fn, *args)
+
+    def shutdown(self):
+        if self.has_executor():
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
     def generalized_newton_method(self, nfg_file, n_perturb=100):
         try:
             gambit_call = subprocess.run(
@@ -254,4 +360,25 @@ class Gambit:
             return self.enumerate_pure_equlibria(nfg_file)
 
         if self.default_method_val == method_vals.pol_val:
-            return self.support_enumeration(nfg_file)
\ No newline at end of file
+            return self.support_enumeration(nfg_file)
+
+    # The native methods take the utilities array of the NFG,
+    # instead of the .nfg file, and return the Nash Equilibria
+    # already parsed, see native_solvers.py
+    def compute_native_nash_equilibria(self, utilities_array):
+        assert self.is_native_method()
+
+        if self.default_method_val == method_vals.nxpe_val:
+            return native_solvers.extreme_point_enumeration(utilities_array, self.decimal)
+
+        if self.default_method_val == method_vals.nenp_val:
+            return native_solvers.pure_nash_equilibria(utilities_array)
+
+    # The stacked methods take the utilities tensor of shape
+    # (G, S_1, ..., S_n, n), i.e. G NFGs of the same shape, and
+    # return a list with the Nash Equilibria of every NFG
+    def compute_stacked_nash_equilibria(self, utilities_tensor):
+        assert self.is_stacked_method()
+
+        if self.default_method_val == method_vals.nenp_val:
+            return native_solvers.stacked_pure_nash_equilibria(utilities_tensor)
\ No newline at end of file
@@ -19,8 +19,15 @@
 #	| max_utilities = 10
 #	| NFG.generate_random_utilities(max_utilities)
 #
-# Instance of: Dictionary: StrategyProfiles --> UtilityVector, aka
+# Instance of: Array: StrategyProfiles --> UtilityVector, aka
 #							(Strategy) -->[Utility]
+#				i.e. an integer array of shape (S_1, ..., S_n, n),
+#				where the entry [s_1, ..., s_n] is the utility
+#				vector of the strategy profile (s_1, ..., s_n).
+#				The strategy profiles are enumerated in the
+#				order of the gambit (.nfg) file format, i.e. the
+#				strategy of the first player changes the fastest
+#				(see strategy_profiles()).
 #
 # Data Members:
 #	String	game_id
@@ -57,7 +64,7 @@ import gambit 	# gambit.support()
 
 import parsers # GambitOutputInterpreter
 
-import auxiliary_functions as ax
+from debugging import histogram_names	# the latency histograms of the Debugging class
 
 ####################
 # Python Libraries #
@@ -67,16 +74,57 @@ import pprint	# pretty print
 import random	# generate random utilities
 import math		# prod
 import time
+import itertools
 
 
 ## 3rd party libraries
 from termcolor import colored, cprint
+import numpy as np
 
 
 #############
 # Constants #
 #############
 
+## Strategy profiles, shared by all the NFGs with the
+## same strategies vector (see strategy_profiles())
+_strategy_profiles			= dict()	# (Int) --> ((Int))
+_clingo_strategy_profiles	= dict()	# (Int) --> (String)
+
+
+#############
+# Functions #
+#############
+
+## The strategy profiles of a strategies vector (starting from 0),
+## in the order of the gambit (.nfg) file format, i.e. the strategy
+## of the first player changes the fastest. E.g. for [2, 2],
+## ((0, 0), (1, 0), (0, 1), (1, 1)).
+def strategy_profiles(strategies):
+	key = tuple(strategies)
+
+	if key not in _strategy_profiles:
+		_strategy_profiles[key] = tuple(
+			tuple(reversed(strategy_profile))
+			for strategy_profile in itertools.product(*[range(s) for s in reversed(key)])
+		)
+
+	return _strategy_profiles[key]
+
+
+## The strategy profiles in clingo format, in the same order,
+## e.g. (0, 1) --> "sp(1, sp(2, nul))"
+def clingo_strategy_profiles(strategies):
+	key = tuple(strategies)
+
+	if key not in _clingo_strategy_profiles:
+		_clingo_strategy_profiles[key] = tuple(
+			"".join("sp(" + str(s + 1) + ", " for s in strategy_profile) + "nul" + ")" * len(key)
+			for strategy_profile in strategy_profiles(key)
+		)
+
+	return _clingo_strategy_profiles[key]
+
 
 #########
 # Class #
@@ -84,29 +132,6 @@ from termcolor import colored, cprint
 
 class NormalFormGame:
 	
-	## Initialize Data Members
-	game_id		= ""
-	num_players	= 0
-	strategies	= []
-	
-	## Utilities
-	utilities = dict()
-	
-	## Nash Equilibria
-	nash_equilibria = []
-	
-	## Support
-	support = dict()
-	
-	## states
-	game_id_set						= False
-	num_players_set					= False
-	strategies_set					= False
-	strategy_profiles_generated		= False
-	utilities_filled				= False
-	nash_equilibria_computed		= False
-	support_computed				= False
-	
 	###############
 	# Constructor #
 	###############
@@ -117,6 +142,30 @@ class NormalFormGame:
 		self.debugging	= debugging
 		self.domain		= domain
 
+		## Initialize Data Members
+		self.game_id		= ""
+		self.num_players	= 0
+		self.strategies		= []
+
+		## Utilities, an integer array of shape (S_1, ..., S_n, n)
+		self.utilities = None
+
+		## Nash Equilibria
+		self.nash_equilibria = []
+
+		## Support
+		self.support = dict()
+
+		## states
+		self.game_id_set					= False
+		self.num_players_set				= False
+		self.strategies_set					= False
+		self.strategy_profiles_generated	= False
+		self.utilities_filled				= False
+		self.nash_equilibria_computed		= False
+		self.nash_equilibria_timed_out		= False
+		self.support_computed				= False
+
 		## Handle Arguments
 		self.set_game_id(game_id)
 		self.set_num_players(num_players)
@@ -140,8 +189,8 @@ class NormalFormGame:
 		# write the nash equilibria
 		output += "# Nash Equilibria: " + str(self.nash_equilibria) + "\n"
 		
-		for sp in self.utilities.keys():
-			for util in self.utilities[sp]:
+		for utilities in self._gambit_order_utilities():
+			for util in utilities:
 				output += str(util) + " "
 			output += "\n"
 		
@@ -176,7 +225,7 @@ class NormalFormGame:
 	
 	def __str__(self):
 		# Utilities Generated
-		str_utilities = pprint.pformat(self.utilities)# if self.utilities_generated else "Class Game: Utilities not generated!"
+		str_utilities = pprint.pformat(self.get_utilities_dict())# if self.utilities_generated else "Class Game: Utilities not generated!"
 				
 		## Aesthetics
 		vline = self.str_vline("#")
@@ -253,12 +302,8 @@ class NormalFormGame:
 	# Strategy Profiles #
 	#####################
 	#
-	# The way this while-loop is constructed is a bit clunky,
-	# but I could find a more clean solution.
-	# The bound of the while-loop is the last_strategy_profile
-	# which is strategy_profile - 1 aka base - 1. This is because
-	# of the way the function succ is written. That's way we should
-	# do one last iteration.
+	# The strategy profiles are the indices of the utilities
+	# array, see strategy_profiles() for their (gambit) order.
 	#
 	def generate_strategy_profiles(self):
 		## check prerequirements states
@@ -266,19 +311,20 @@ class NormalFormGame:
 		assert self.strategy_profiles_generated == False, "NormalFormGames: strategy_profiles already generated!"
 
 
-		first_sp 	= [0] * self.num_players
-		last_sp		= ax.subtract(self.strategies, [1] * self.num_players)
-		base		= self.strategies
-		strategy_profiles = ax.enumerate_vecs(first_sp, last_sp, base, tuple)
-
-
-		dummy_utilities = [0] * self.num_players
-		self.utilities = {sp : dummy_utilities.copy() for sp in strategy_profiles}
+		self.utilities = np.zeros(tuple(self.strategies) + (self.num_players,), dtype=np.int64)
 
 		
 		## Update State
 		self.strategy_profiles_generated = True
 	
+	def get_strategy_profiles(self):
+		return strategy_profiles(self.strategies)
+	
+	# The utilities as a (num_SPs, n) array, where the
+	# strategy profiles are in the gambit order
+	def _gambit_order_utilities(self):
+		return self.utilities.reshape(-1, self.num_players, order="F")
+	
 	
 	######################
 	# Generate Utilities #
@@ -289,8 +335,8 @@ class NormalFormGame:
 		assert self.strategy_profiles_generated == True, "NormalFormGame: strategy profiles should be generated before filing utilities!"
 		assert self.utilities_filled == False, "NormalFormGame: utilities already filled!"
 		
-		## fill existing strategy profiles
-		for strategy_profile, utilities in self.utilities.items():
+		## fill existing strategy profiles, in the gambit order
+		for strategy_profile in self.get_strategy_profiles():
 			
 			## compute a random utilities vector
 			new_utilities = [0 for i in range(self.num_players)]
@@ -298,7 +344,7 @@ class NormalFormGame:
 				new_utilities[player] = random.randint(0, max_utility)
 			
 			## update utilities
-			self.utilities.update({strategy_profile : new_utilities})
+			self.utilities[strategy_profile] = new_utilities
 		
 		## update state
 		self.utilities_filled = True
@@ -322,7 +368,7 @@ class NormalFormGame:
 
 		
 		for util_info in util_info_list:
-			(self.utilities[util_info[1]])[util_info[0]-1] = util_info[2]
+			self.utilities[util_info[1] + (util_info[0]-1,)] = util_info[2]
 
 
 		## update state
@@ -341,14 +387,30 @@ class NormalFormGame:
 		assert len(lines) == num_SPs
 		
 		
-		for strategy_profiles in self.utilities.keys():
-			line = ax.head(lines)
+		# the lines are in the gambit order
+		for strategy_profile, line in zip(self.get_strategy_profiles(), lines):
 			line = line.split(" ")
 			line = list(filter(lambda token: token != "", line))	# Discard empty tokens.
 			int_line = list(map(int, line))
 			
-			self.utilities[strategy_profiles] = int_line
+			self.utilities[strategy_profile] = int_line
+		
+		
+		## update state
+		self.utilities_filled = True
+	
+	
+	# Input: an integer array of shape (S_1, ..., S_n, n), where the entry
+	# [s_1, ..., s_n] is the utility vector of the strategy profile
+	# (s_1, ..., s_n). See also get_utilities_array().
+	def utilities_from_array(self, utilities_array):
+		assert self.strategy_profiles_generated == True, "NormalFormGame: strategy profiles should be generated before filing utilities!"
+		assert self.utilities_filled == False, "NormalFormGame: utilities already filled!"
+		assert utilities_array.shape == tuple(self.strategies) + (self.num_players,)
 		
+		# NOTE: no copy, e.g. the games of an MG may share the
+		# memory of the MG's utilities tensor.
+		self.utilities = utilities_array
 		
 		## update state
 		self.utilities_filled = True
@@ -374,37 +436,118 @@ class NormalFormGame:
 	
 	# In order to compute the support, we utilize
 	# the gambit shell command gambit-pol to get
-	# the NE.
-	def compute_nash_equilibria(self):
+	# the NE. If not cache, the Nash Equilibria cache
+	# is neither looked up nor updated, see
+	# cache_nash_equilibria().
+	def compute_nash_equilibria(self, cache = True):
         ## Preconditions
 		assert self.utilities_filled == True
 		assert self.nash_equilibria_computed == False
 		
+		# the same NFG may have been already solved
+		if cache and self.load_cached_nash_equilibria(): return
 		
-		# GAMBIT call
+		# GAMBIT call (or native, in-process, method)
 		gambit_start_t = time.time()
-		gambit_out = self.gambit_pac.compute_nash_equilibria(self.gambit_str_file())
+		if self.gambit_pac.is_native_method():
+			nash_equilibria = self.gambit_pac.compute_native_nash_equilibria(self.get_utilities_array())
+		else:
+			gambit_out = self.gambit_pac.compute_nash_equilibria(self.gambit_str_file())
 		gambit_end_t = time.time()
 
 		# Update the time consumed in GAMBIT
 		self.debugging.gambit_call(gambit_end_t - gambit_start_t)
 
 		# Parse GAMBIT's output
+		if self.gambit_pac.is_native_method():
+			self.set_nash_equilibria(nash_equilibria, cache)
+		else:
+			if gambit_out != None:
+				parsing_start_t = time.time()
+				nash_equilibria = parsers.parse_gambit_out_file(self.num_players, self.strategies, gambit_out)
+				self.debugging.observe(histogram_names.NE_parsing, time.time() - parsing_start_t)
+
+				self.set_nash_equilibria(nash_equilibria, cache)
+			else:
+				# GAMBIT timed out, do not cache
+				self.set_nash_equilibria([], False)
+				self.nash_equilibria_timed_out = True
+
+
+	# The key of the NFG in the Nash Equilibria cache,
+	# see nash_equilibria_cache.py
+	def get_nash_equilibria_cache_key(self):
+		return self.gambit_pac.get_nash_equilibria_cache().key(
+			self.strategies,
+			self.get_utilities_array(),
+			self.gambit_pac.get_default_method_val(),
+			self.gambit_pac.get_decimal(),
+			self.domain.get_default_method_val()
+		)
+	
+	# Looks up the Nash Equilibria cache, if any. On a hit, sets the
+	# Nash Equilibria and returns True.
+	def load_cached_nash_equilibria(self):
+		## Preconditions
+		assert self.utilities_filled == True
+		assert self.nash_equilibria_computed == False
+		
+		if not self.gambit_pac.has_nash_equilibria_cache(): return False
+		
+		nash_equilibria = self.gambit_pac.get_nash_equilibria_cache().get(self.get_nash_equilibria_cache_key())
+		if nash_equilibria == None:
+			self.debugging.nash_equilibria_cache_miss()
+			return False
+		
+		self.debugging.nash_equilibria_cache_hit()
+		self.nash_equilibria = nash_equilibria
+		
+		# Debugging module: the same checks as set_nash_equilibria(),
+		# thus the warning counters do not depend on the cache (-nec)
+		self.debugging.check_no_nash(self.nash_equilibria)
+		self.debugging.check_zeros_mixed_strategy(self.nash_equilibria)
+		self.debugging.check_mixed_strat_lt_one(self.nash_equilibria)
+		
+		## Postcondition: update state
+		self.nash_equilibria_computed = True
+		
+		return True
+	
+	# Sets the (already computed) Nash Equilibria, e.g. from
+	# MisinformationGame.compute_nme_dict(), which computes the
+	# Nash Equilibria of all the games in a single call. If cache,
+	# the Nash Equilibria are inserted to the cache, if any.
+	def set_nash_equilibria(self, nash_equilibria, cache = True):
+		## Preconditions
+		assert self.nash_equilibria_computed == False
+
 		# Use the SPDomain instance in order to rectify GAMBIT's output (if needed)
 		# in order to avoid rounding errors.
-		if gambit_out != None:
-			self.nash_equilibria = parsers.parse_gambit_out_file(self.num_players, self.strategies, gambit_out)
-			self.nash_equilibria = self.domain.default_mapping_list(self.nash_equilibria)
+		mapping_start_t = time.time()
+		self.nash_equilibria = self.domain.default_mapping_list(nash_equilibria)
+		self.debugging.observe(histogram_names.domain_mapping, time.time() - mapping_start_t)
 
 		# Debugging module: Check if GAMBIT's output has errors.
 		self.debugging.check_no_nash(self.nash_equilibria)
 		self.debugging.check_zeros_mixed_strategy(self.nash_equilibria)
 		self.debugging.check_mixed_strat_lt_one(self.nash_equilibria)
-        
-        
+		
+		if cache: self.cache_nash_equilibria()
+
+
 		## Postcondition: update state
 		self.nash_equilibria_computed = True
 
+	# Inserts the Nash Equilibria to the Nash Equilibria cache, if any,
+	# e.g. after compute_nash_equilibria(False) on a worker thread, see
+	# MisinformationGame._compute_parallel_nash_equilibria(). The Nash
+	# Equilibria of a timed out GAMBIT call are not cached.
+	def cache_nash_equilibria(self):
+		if self.nash_equilibria_timed_out: return
+		if not self.gambit_pac.has_nash_equilibria_cache(): return
+
+		self.gambit_pac.get_nash_equilibria_cache().put(self.get_nash_equilibria_cache_key(), self.nash_equilibria)
+
 
 	def compute_support(self):
         ## Preconditions
@@ -415,9 +558,9 @@ class NormalFormGame:
 		for nash_equilibrium in self.nash_equilibria:
 
 			for player in range(1, self.num_players + 1):
-				for strategy in range(self.strategies[player]):
+				for strategy in range(self.strategies[player - 1]):
 
-					if nash_equilibrium[player][strategy] > 0:
+					if nash_equilibrium[player - 1][strategy] > 0:
 						self.support[player].add(strategy + 1)
         
         ## Postcondition
@@ -429,11 +572,62 @@ class NormalFormGame:
 		
 		return self.support
 	
+	def is_nash_equilibria_computed(self):
+		return self.nash_equilibria_computed
+	
+	# Inherits the Nash Equilibria (and the support, if computed)
+	# of an NFG with the same utilities, e.g. the same player's
+	# game of the parent MG, when the adaptation step did not
+	# change it. See MisinformationGame.inherit_nash_equilibria().
+	def inherit_nash_equilibria(self, parent_NFG):
+		## Preconditions
+		assert self.nash_equilibria_computed == False
+		assert parent_NFG.is_nash_equilibria_computed() == True
+		
+		self.nash_equilibria = list(parent_NFG.get_nash_equilibria())
+		self.nash_equilibria_computed = True
+		
+		if parent_NFG.support_computed:
+			self.support = dict()
+			for player, support in parent_NFG.get_support().items():
+				self.support[player] = set(support)
+			self.support_computed = True
+	
+	# Restores the Nash Equilibria of the NFG, as returned by
+	# get_nash_equilibria(), i.e. already mapped to the domain and
+	# checked, e.g. from the payload of a MG computed in another
+	# process. See MisinformationGame.from_payload().
+	def restore_nash_equilibria(self, nash_equilibria):
+		## Preconditions
+		assert self.nash_equilibria_computed == False
+		
+		self.nash_equilibria = list(nash_equilibria)
+		
+		## Postcondition: update state
+		self.nash_equilibria_computed = True
+	
 	def get_nash_equilibria(self):
 		assert self.nash_equilibria_computed == True
 		
 		return self.nash_equilibria
 	
+	# Returns the utilities as an integer array of shape (S_1, ..., S_n, n),
+	# the entry [s_1, ..., s_n] is the utility vector of the strategy
+	# profile (s_1, ..., s_n).
+	# NOTE: not a copy, the array should not be modified.
+	def get_utilities_array(self):
+		assert self.utilities_filled == True
+		
+		return self.utilities
+	
+	# Returns the utilities as a dictionary (Strategy) --> [Utility],
+	# in the gambit order
+	def get_utilities_dict(self):
+		return {
+			strategy_profile : self.utilities[strategy_profile].tolist()
+			for strategy_profile in self.get_strategy_profiles()
+		}
+	
 	####################
 	# CLINGO Formating #
 	####################
@@ -449,65 +643,41 @@ class NormalFormGame:
 		return output
 	
 	def clingo_str_strategies(self):
-		output = ""
-		for player in range(1, self.num_players+1):
-			output += self.__clingo_str_pl_strategies(player)
-		
-		return output
-	
-	def __clingo_str_strategy_profile(self, strategy_profile):
-		assert(self.is_strategy_profile(strategy_profile))
-		
-		output = ""
-		for s in strategy_profile:
-			output += "sp(" + str(s + 1) + ", "
-		
-		output += "nul"
-		output += ")" * self.num_players
-		
-		return output
-	
-	def __clingo_str_sp_pl_utility(self, strategy_profile, player):
-		assert self.is_strategy_profile(strategy_profile) and self.is_player(player)
-		
-		output = "u(" + self.game_id + ", " + str(player + 1) + ", "
-		output += self.__clingo_str_strategy_profile(strategy_profile)
-		output += ", "
-		
-		u = self.utilities[strategy_profile][player]
-		
-		output += str(u) + ")."
-		
-		return output
+		return "".join(
+			self.__clingo_str_pl_strategies(player)
+			for player in range(1, self.num_players+1)
+		)
 	
+	# The utilities of a player, e.g. u(<game>, <player>, sp(1, sp(2, nul)), <utility>).
+	# one predicate per line, for all the strategy profiles in the gambit order
 	def __clingo_str_pl_utility(self, player):
 		assert self.is_player(player)
 		
-		output = ""
-		for strategy_profile in self.utilities.keys():
-			output += self.__clingo_str_sp_pl_utility(strategy_profile, player)
-			output += "\n"
+		prefix = "u(" + self.game_id + ", " + str(player + 1) + ", "
 		
-		return output
+		utilities = self._gambit_order_utilities()[:, player].tolist()
+		clingo_SPs = clingo_strategy_profiles(self.strategies)
+		
+		return "".join(
+			prefix + clingo_SP + ", " + str(u) + ").\n"
+			for clingo_SP, u in zip(clingo_SPs, utilities)
+		)
 	
 	def clingo_str_utility(self):
-		output = ""
-		
-		for player in range(self.num_players):
-			output += "\n" * 2
-			output += self.__clingo_str_pl_utility(player)
-		
-		return output
+		return "".join(
+			"\n" * 2 + self.__clingo_str_pl_utility(player)
+			for player in range(self.num_players)
+		)
 
 	
 	def clingo_str_file(self):
 		
-		str_file =  self.str_vline("%")
-		str_file += self.str_header("%", "\n")
-		str_file += self.str_vline("%")				+ "\n"
-		str_file += self.clingo_str_utility()		+ "\n"
-		
-		return str_file
+		return "".join([
+			self.str_vline("%"),
+			self.str_header("%", "\n"),
+			self.str_vline("%"),		"\n",
+			self.clingo_str_utility(),	"\n"
+		])
 	
 	
 	####################
@@ -536,11 +706,8 @@ class NormalFormGame:
 	
 	def __gambit_str_body(self):
 		
-		output = ""
-		for strategy_profile in self.utilities.keys():
-			utilities = self.utilities[strategy_profile]
-			for u in utilities:
-				output += str(u) + " "
+		# the utilities, in the gambit order, separated by " "
+		output = "".join(str(u) + " " for u in self._gambit_order_utilities().ravel().tolist())
 		
 		return output
 	
@@ -898,7 +898,7 @@ class MainWindow(Gtk.Window):
 
 			
 			if token == application_process.ComProtocol.nodes_list:
-				self.data_vec.set_node_list(self.adapt_proc_queue.get())
+				self.data_vec.set_node_list(application_process.get_chunks(self.adapt_proc_queue))
 				#print(self.data_vec.get_node_list())
 				self.left_column_tabs[LeftColumnTabConst.node_list].update_displayed_text(
 					self.data_vec.get_node_list()
@@ -906,7 +906,7 @@ class MainWindow(Gtk.Window):
 			
 			
 			if token == application_process.ComProtocol.tree:
-				self.data_vec.set_tree(self.adapt_proc_queue.get())
+				self.data_vec.set_tree(application_process.get_chunks(self.adapt_proc_queue))
 				self.right_column_tabs[RightColumnTabConst.tree].update_displayed_text(
 					self.data_vec.get_tree()
 				)
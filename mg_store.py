@@ -0,0 +1,207 @@
+#####################################################################
+# mg_store.py
+# ------------------------------------------------------------------
+# An out-of-core store of the misinformation games (MGs) of an
+# adaptation procedure. The number of unique MGs grows exponentially
+# with the number of strategy profiles, thus, with the store, the
+# ceiling on the unique MGs is set by the disk, not by the RAM.
+#
+# A completed MG is *spilled* to the store (see
+# MisinformationGame.spill()), i.e.
+#
+#	1. its utilities tensor (see MisinformationGame.get_utilities_tensor())
+#		is written to a slot of a memory-mapped file (numpy.memmap),
+#		of shape (slots, n+1, S_1, ..., S_n, n), and
+#
+#	2. the Nash Equilibria of its n+1 NFGs are pickled and appended
+#		to a second file. A small index (two typed arrays) keeps the
+#		offset and the length of every slot's record.
+#
+# The MG only keeps its id, its NMEs and its knowledge in memory. The
+# NFGs, the utilities tensor and the clingo format are read lazily
+# from the store, when needed, and they are not cached, see
+# MisinformationGame.get_games(). The only exception is the clingo
+# format of the most recently read slots, i.e. of the parents being
+# expanded, which is kept in a small LRU cache, thus the clingo
+# format of a parent is not rendered again for each of its
+# children, see MisinformationGame.get_clingo_format_bytes().
+#
+# The files are temporary files under the given directory, i.e. they
+# are deleted when the store is garbage collected (or the process
+# ends).
+#
+# The slots are appended, thus the store is thread safe with a single
+# lock. The readers of the utilities do not lock: a slot is never
+# written again, and a grown memmap does not invalidate the older one.
+#####################################################################
+
+
+#############
+# Libraries #
+#############
+
+## Python Libraries
+import os			# isdir
+import pickle
+import tempfile
+from array import array
+from collections import OrderedDict
+from threading import Lock
+
+## 3rd party libraries
+import numpy as np
+
+
+#############
+# Constants #
+#############
+
+## The initial number of slots of the utilities file,
+## doubled when the file is full
+initial_slots = 1024
+
+## The number of slots whose clingo format is cached,
+## see get_clingo_format()
+clingo_cache_size = 64
+
+
+###########
+# Classes #
+###########
+
+class MGStore:
+
+	def __init__(self, dir_path):
+		assert os.path.isdir(dir_path)
+
+		self.dir_path = dir_path
+
+		## The utilities file, the shape of a slot is known
+		## when the first MG is spilled, see _initialise()
+		self.utilities_file	= tempfile.TemporaryFile(dir=dir_path, prefix="mg_utilities_")
+		self.utilities		= None
+		self.slot_shape		= None
+		self.num_slots		= 0
+
+		## The Nash Equilibria file, and its index
+		self.nash_equilibria_file	= tempfile.TemporaryFile(dir=dir_path, prefix="mg_nash_equilibria_")
+		self.nash_equilibria_size	= 0
+		self.offsets				= array("q")
+		self.lengths				= array("q")
+
+		## Lock for the writers, and the readers of the Nash Equilibria
+		self.lock = Lock()
+
+		## The clingo formats of the most recently read slots,
+		## slot --> bytes, in LRU order
+		self.clingo_cache		= OrderedDict()
+		self.clingo_cache_lock	= Lock()
+
+	#############
+	# Accessors #
+	#############
+
+	def get_dir_path(self):
+		return self.dir_path
+
+	def __len__(self):
+		return len(self.offsets)
+
+	## The size of the files, in bytes
+	def get_disk_size(self):
+		slot_size = 0
+		if self.slot_shape is not None:
+			slot_size = int(np.prod(self.slot_shape)) * np.dtype(np.int64).itemsize
+
+		return self.num_slots * slot_size + self.nash_equilibria_size
+
+	###########
+	# Methods #
+	###########
+
+	## Writes the utilities tensor and the Nash Equilibria (a list, one
+	## per NFG) of a MG, returns the slot of the MG
+	def put(self, utilities_tensor, nash_equilibria):
+		record = pickle.dumps(nash_equilibria, pickle.HIGHEST_PROTOCOL)
+
+		self.lock.acquire()
+
+		if self.utilities is None: self._initialise(utilities_tensor.shape)
+		assert utilities_tensor.shape == self.slot_shape
+
+		slot = len(self.offsets)
+		if slot == self.num_slots: self._grow()
+
+		self.utilities[slot] = utilities_tensor
+
+		self.nash_equilibria_file.seek(self.nash_equilibria_size)
+		self.nash_equilibria_file.write(record)
+		self.nash_equilibria_file.flush()
+
+		self.offsets.append(self.nash_equilibria_size)
+		self.lengths.append(len(record))
+		self.nash_equilibria_size += len(record)
+
+		self.lock.release()
+
+		return slot
+
+	## A read-only view of the utilities tensor of the slot
+	def get_utilities(self, slot):
+		assert 0 <= slot and slot < len(self.offsets)
+
+		utilities_tensor = self.utilities[slot]
+		utilities_tensor.flags.writeable = False
+
+		return utilities_tensor
+
+	def get_nash_equilibria(self, slot):
+		assert 0 <= slot and slot < len(self.offsets)
+
+		self.lock.acquire()
+		self.nash_equilibria_file.seek(self.offsets[slot])
+		record = self.nash_equilibria_file.read(self.lengths[slot])
+		self.lock.release()
+
+		return pickle.loads(record)
+
+	## The cached clingo format of the slot, or None, see
+	## cache_clingo_format()
+	def get_clingo_format(self, slot):
+		with self.clingo_cache_lock:
+			clingo_format = self.clingo_cache.get(slot)
+			if clingo_format is not None: self.clingo_cache.move_to_end(slot)
+
+		return clingo_format
+
+	## Caches the (rendered) clingo format of the slot, evicting the
+	## least recently used one, if the cache is full
+	def cache_clingo_format(self, slot, clingo_format):
+		assert 0 <= slot and slot < len(self.offsets)
+
+		with self.clingo_cache_lock:
+			self.clingo_cache[slot] = clingo_format
+			self.clingo_cache.move_to_end(slot)
+			if len(self.clingo_cache) > clingo_cache_size: self.clingo_cache.popitem(last=False)
+
+	def _initialise(self, slot_shape):
+		self.slot_shape = tuple(slot_shape)
+		self._resize(initial_slots)
+
+	## Doubles the slots of the utilities file. The older memmap stays
+	## valid, for the readers that still hold it.
+	def _grow(self):
+		self.utilities.flush()
+		self._resize(2 * self.num_slots)
+
+	def _resize(self, num_slots):
+		slot_size = int(np.prod(self.slot_shape)) * np.dtype(np.int64).itemsize
+		self.utilities_file.truncate(num_slots * slot_size)
+
+		self.utilities = np.memmap(
+			self.utilities_file,
+			dtype=np.int64,
+			mode="r+",
+			shape=(num_slots,) + self.slot_shape
+		)
+		self.num_slots = num_slots
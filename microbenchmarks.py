@@ -0,0 +1,486 @@
+###########################################################
+# microbenchmarks.py
+# --------------------------------------------------------
+# Micro-benchmarks of the functions that run once per MG,
+# or once per node, of the Adaptation Procedure (see
+# benchmarks). For every experiment of do_experiment.py
+# (see experiments), the inputs are fixed, i.e. generated
+# from a random MG of the shape of the experiment, with a
+# fixed seed (see Inputs).
+#
+# Every benchmark is a single call on all the inputs of
+# its shape, e.g. pos_vec2clingo() on every strategy
+# profile. It is called number times, where number is
+# calibrated to about target_repeat_t seconds, and this is
+# repeated num_repeats times. The minimum and the median,
+# over the repeats, of the average time of a call (in
+# micro seconds) are reported. Only the calls are timed,
+# i.e. not the preparation of a fresh MG, if any.
+#
+# The results are written to a JSON file. Given a baseline,
+# i.e. the JSON file of a previous run, the minimum times
+# are compared against it. A regression is a time greater
+# than the baseline by more than regression_tolerance, or
+# a different number of inputs. The exit code is 1 if
+# there is a regression.
+#
+# Input: 	1. The number of the first experiment to be run.
+#				A number in range {0, ..., 7}.
+#
+#			2. The number of the last experiment to be run.
+#				A number in range {0, ..., 7}.
+#
+#			3. The JSON file to write the results.
+#
+#			4. (Optionally) A baseline JSON file.
+#
+# Example call:
+#	python microbenchmarks.py 0 7 micro.json micro_baseline.json
+#
+#	Output to example:
+#
+#		| Exp	Strategies	Benchmark				Inputs	Min(us)	Median(us)	Baseline
+#		| 0		[2, 2]		enumerate_vecs			4		5.0		5.1			ok (0.98)
+#		| 0		[2, 2]		path_to_set				100		88.3	90.1		ok (1.02)
+#		| ...
+#
+# NOTE: The answer sets are synthesized by the CLINGO
+# stand-in (see solver_stand_ins/), and the Nash
+# Equilibria are computed by the native solvers, thus,
+# neither CLINGO nor GAMBIT is needed.
+###########################################################
+
+
+#############
+# Libraries #
+#############
+
+## Python
+import os
+import sys
+import json
+import time
+import random
+import platform
+
+## 3rd Party
+import numpy as np
+
+## Custom
+from do_experiment import experiments
+import auxiliary_functions as ax
+import misinformation_game
+import debugging
+import domain
+import gambit
+import parsers
+
+suite_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(suite_dir, "solver_stand_ins"))
+import stand_ins
+
+
+#############
+# Constants #
+#############
+
+rand_seed	= 2
+max_util	= 10
+
+num_repeats		= 5
+target_repeat_t	= 0.05
+
+regression_tolerance = 0.25
+
+## The number of the adaptation paths, and of the random mixed
+## strategies of every player, of every shape
+num_paths				= 100
+num_random_strategies	= 20
+
+## The CLINGO encodings of the answer sets
+adaptation_lp		= os.path.join(suite_dir, "adaptation.lp")
+adaptation_delta_lp	= os.path.join(suite_dir, "adaptation_delta.lp")
+
+
+#############
+# Functions #
+#############
+
+## The (native) NE method of the shape, i.e. the extreme point
+## enumeration for 2-player games, for mixed NMEs, or the pure
+## Nash Equilibria, otherwise
+def gambit_package(num_players):
+	if num_players <= gambit.method_max_players.nxpe:
+		return gambit.Gambit(8, gambit.method_vals.nxpe_val)
+
+	return gambit.Gambit(8, gambit.method_vals.nenp_val)
+
+
+## The position vectors of all the NMEs of the MG
+def position_vectors(MG):
+	return [pos_vec for pos_vecs in MG.get_position_vectors() for pos_vec in pos_vecs]
+
+
+## A MG, of the shape of the template, without utilities
+def empty_MG(template_MG, game_id = 0):
+	return misinformation_game.MisinformationGame(
+		template_MG.gambit_pac,
+		template_MG.debugging,
+		template_MG.domain,
+		game_id,
+		template_MG.get_num_players(),
+		template_MG.get_strategies()
+	)
+
+
+## A MG, with the utilities and the Nash Equilibria of the
+## template, where the position vectors are not computed
+def MG_before_pos_vecs(template_MG):
+	MG = empty_MG(template_MG)
+	MG.utilities_from_tensor(template_MG.get_utilities_tensor().copy())
+
+	for NFG, template_NFG in zip(MG.get_games(), template_MG.get_games()):
+		NFG.restore_nash_equilibria(template_NFG.get_nash_equilibria())
+
+	MG.compute_nme_dict()
+	return MG
+
+
+## The answer set of the adaptation step of the MG on the
+## position vector, for the given encoding
+def synthesize_answer_set(MG, pos_vec, encoding):
+	f = open(encoding, "r")
+	program = MG.get_clingo_format() + ax.pos_vec2clingo(pos_vec) + "\n" + f.read()
+	f.close()
+
+	return " ".join(stand_ins.answer_set(program))
+
+
+## The GAMBIT output (see parsers.parse_gambit_out_file()) of
+## the Nash Equilibria of a NFG
+def gambit_out_file(NFG):
+	return [
+		"NE," + ",".join(str(probability) for strategy in NE for probability in strategy)
+		for NE in NFG.get_nash_equilibria()
+	]
+
+
+#############################################################
+# Inputs
+# ----------------------------------------------------------
+# The inputs of a shape are generated from a random MG (see
+# MisinformationGame.generate_random_utilities()), with the
+# Nash Equilibria, the NMEs and the position vectors
+# computed, i.e.
+#
+#	1. The strategy profiles, enumerated from the first to
+#		the last one.
+#	2. num_paths random adaptation paths, i.e. lists of
+#		position vectors, of length 1 up to the number of
+#		strategy profiles.
+#	3. The n+1 NFGs of the MG.
+#	4. The GAMBIT output of every NFG.
+#	5. The answer sets, full and delta, of the adaptation
+#		step on the first position vector of the MG.
+#	6. The mixed strategies of every player, i.e. the ones
+#		of the Nash Equilibria of the MG, and
+#		num_random_strategies random ones.
+#############################################################
+
+def generate_inputs(strategies):
+	random.seed(rand_seed)
+	np.random.seed(rand_seed)
+
+	num_players = len(strategies)
+
+	strat_prof_domain = domain.SPDomain()
+	strat_prof_domain.initialise(num_players, strategies)
+
+	MG = misinformation_game.MisinformationGame(
+		gambit_package(num_players),
+		debugging.Debugging(),
+		strat_prof_domain,
+		0,
+		num_players,
+		strategies
+	)
+	MG.generate_random_utilities(max_util)
+	MG.compute_nme_dict()
+	MG.compute_pos_vecs()
+	MG.clingo_compile_format()
+	MG.clingo_compile_nme()
+
+	strategy_profiles = ax.enumerate_vecs(
+		[0] * num_players,
+		[s - 1 for s in strategies],
+		strategies,
+		lambda vec : tuple(s + 1 for s in vec)
+	)
+
+	paths = [
+		[random.choice(strategy_profiles) for i in range(random.randint(1, len(strategy_profiles)))]
+		for path in range(num_paths)
+	]
+
+	## the first position vector, or any strategy profile, if there
+	## is no NME
+	pos_vecs = position_vectors(MG)
+	pos_vec = pos_vecs[0] if pos_vecs != [] else strategy_profiles[0]
+
+	mixed_strategies = []
+	for player in range(num_players):
+		player_strategies = [
+			NE[player] for NFG in MG.get_games() for NE in NFG.get_nash_equilibria()
+		]
+		player_strategies += [
+			tuple(np.random.dirichlet([1] * strategies[player]))
+			for i in range(num_random_strategies)
+		]
+		mixed_strategies.append(player_strategies)
+
+	return {
+		"MG":					MG,
+		"strategies":			strategies,
+		"strategy_profiles":	strategy_profiles,
+		"paths":				paths,
+		"gambit_out_files":		[gambit_out_file(NFG) for NFG in MG.get_games()],
+		"answer_set":			synthesize_answer_set(MG, pos_vec, adaptation_lp),
+		"delta_answer_set":		synthesize_answer_set(MG, pos_vec, adaptation_delta_lp),
+		"voronoi_domains":		[
+			domain.VectorDomain(s, domain.domain_methods_vals.voronoi) for s in strategies
+		],
+		"mixed_strategies":		mixed_strategies
+	}
+
+
+#############################################################
+# Benchmarks
+# ----------------------------------------------------------
+# A benchmark is a tuple (name, number of inputs, prepare,
+# call), where prepare() returns the argument of call(),
+# e.g. a fresh MG, and is not timed.
+#############################################################
+
+def no_preparation():
+	return None
+
+
+def benchmarks(inputs):
+	MG			= inputs["MG"]
+	strategies	= inputs["strategies"]
+	num_players	= len(strategies)
+	games		= MG.get_games()
+
+	first_vec	= [0] * num_players
+	last_vec	= [s - 1 for s in strategies]
+
+	return [
+		(
+			"enumerate_vecs",
+			len(inputs["strategy_profiles"]),
+			no_preparation,
+			lambda arg : ax.enumerate_vecs(first_vec, last_vec, strategies)
+		),
+		(
+			"path_to_set",
+			len(inputs["paths"]),
+			no_preparation,
+			lambda arg : [ax.path_to_set(path) for path in inputs["paths"]]
+		),
+		(
+			"pos_vec2clingo",
+			len(inputs["strategy_profiles"]),
+			no_preparation,
+			lambda arg : [ax.pos_vec2clingo(pos_vec) for pos_vec in inputs["strategy_profiles"]]
+		),
+		(
+			"gambit_str_file",
+			len(games),
+			no_preparation,
+			lambda arg : [NFG.gambit_str_file() for NFG in games]
+		),
+		(
+			"clingo_str_file",
+			len(games),
+			no_preparation,
+			lambda arg : [NFG.clingo_str_file() for NFG in games]
+		),
+		(
+			"parse_gambit_out_file",
+			sum(len(out_file) for out_file in inputs["gambit_out_files"]),
+			no_preparation,
+			lambda arg : [
+				parsers.parse_gambit_out_file(num_players, strategies, out_file)
+				for out_file in inputs["gambit_out_files"]
+			]
+		),
+		(
+			"utilities_from_clingo",
+			1,
+			lambda : empty_MG(MG),
+			lambda new_MG : new_MG.utilities_from_clingo(inputs["answer_set"])
+		),
+		(
+			"utilities_from_clingo_delta",
+			1,
+			lambda : empty_MG(MG),
+			lambda new_MG : new_MG.utilities_from_clingo_delta(MG, inputs["delta_answer_set"])
+		),
+		(
+			"compute_pos_vecs",
+			len(position_vectors(MG)),
+			lambda : MG_before_pos_vecs(MG),
+			lambda new_MG : new_MG.compute_pos_vecs()
+		),
+		(
+			"voronoi_mapping",
+			sum(len(player_strategies) for player_strategies in inputs["mixed_strategies"]),
+			no_preparation,
+			lambda arg : [
+				vector_domain.voronoi_mapping(mixed_strategy)
+				for vector_domain, player_strategies in zip(inputs["voronoi_domains"], inputs["mixed_strategies"])
+				for mixed_strategy in player_strategies
+			]
+		)
+	]
+
+
+## The average time (s) of number calls, where only the calls
+## are timed
+def average_time(prepare, call, number):
+	total_t = 0
+	for i in range(number):
+		arg = prepare()
+
+		start_t = time.perf_counter()
+		call(arg)
+		total_t += time.perf_counter() - start_t
+
+	return total_t / number
+
+
+## The minimum and the median time (us) of a call, over the
+## repeats, and the number of calls of every repeat
+def measure(prepare, call):
+	call_t = average_time(prepare, call, 1)
+	number = max(1, int(target_repeat_t / max(call_t, 1e-9)))
+
+	times = [average_time(prepare, call, number) for repeat in range(num_repeats)]
+
+	return 10**6 * min(times), 10**6 * float(np.median(times)), number
+
+
+## The key of a result, for comparing against the baseline
+def result_key(result):
+	return (result["experiment"], result["benchmark"])
+
+
+## Compares a result against its baseline result. Returns the verdict,
+## i.e. a string, and whether it is a regression.
+def compare(result, baseline):
+	if baseline is None: return "new", False
+
+	if result["num_inputs"] != baseline["num_inputs"]: return "MISMATCH (inputs)", True
+
+	ratio = result["min_us"] / max(baseline["min_us"], 1e-9)
+	if ratio > 1 + regression_tolerance:
+		return "REGRESSION (time x" + str(round(ratio, 2)) + ")", True
+
+	return "ok (" + str(round(ratio, 2)) + ")", False
+
+
+def environment():
+	return {
+		"python":		platform.python_version(),
+		"numpy":		np.__version__,
+		"platform":		platform.platform(),
+		"cpu_count":	os.cpu_count(),
+		"date":			time.strftime("%Y-%m-%d %H:%M:%S")
+	}
+
+
+##################
+# The Experiment #
+##################
+
+if __name__ == "__main__":
+
+	#############
+	# Arguments #
+	#############
+
+	assert len(sys.argv) == 4 or len(sys.argv) == 5
+
+	min_exp = int(sys.argv[1])
+	assert 0 <= min_exp and min_exp <= len(experiments) - 1
+	max_exp = int(sys.argv[2])
+	assert 0 <= max_exp and max_exp <= len(experiments) - 1
+	assert min_exp <= max_exp
+
+	results_path = sys.argv[3]
+
+	baselines = dict()
+	if len(sys.argv) == 5:
+		f = open(sys.argv[4], "r")
+		baselines = {result_key(result): result for result in json.load(f)["results"]}
+		f.close()
+
+	##############
+	# Benchmarks #
+	##############
+
+	start_t = time.time()
+
+	results		= []
+	regressions	= 0
+
+	print("Exp\tStrategies\tBenchmark\t\t\tInputs\tMin(us)\t\tMedian(us)\tBaseline")
+
+	for experiment in range(min_exp, max_exp + 1):
+		strategies = experiments[experiment]
+		inputs = generate_inputs(strategies)
+
+		for name, num_inputs, prepare, call in benchmarks(inputs):
+			min_t, median_t, number = measure(prepare, call)
+
+			result = {
+				"experiment":	experiment,
+				"strategies":	strategies,
+				"benchmark":	name,
+				"num_inputs":	num_inputs,
+				"number":		number,
+				"repeats":		num_repeats,
+				"min_us":		min_t,
+				"median_us":	median_t
+			}
+			results.append(result)
+
+			verdict, is_regression = compare(result, baselines.get(result_key(result)))
+			if is_regression: regressions += 1
+
+			print(
+				str(experiment) + "\t" +
+				str(strategies) + "\t\t" +
+				name.ljust(28) + "\t" +
+				str(num_inputs) + "\t" +
+				str(round(min_t, 1)).ljust(8) + "\t" +
+				str(round(median_t, 1)).ljust(8) + "\t" +
+				verdict
+			)
+
+	###########
+	# Results #
+	###########
+
+	f = open(results_path, "w")
+	json.dump({
+		"environment":	environment(),
+		"results":		results
+	}, f, indent=1)
+	f.close()
+
+	print("\nElapsed Time: " + str(round(time.time() - start_t, 2)) + "(s)")
+	if baselines:
+		print("Regressions: " + str(regressions))
+
+	sys.exit(1 if regressions > 0 else 0)
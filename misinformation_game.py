@@ -40,10 +40,17 @@
 # Methods:
 #	1. generate_random_utilities(Int: max_utility)
 #	2. utilities_from_clingo(String: answer_set)
+#	   utilities_from_clingo_delta(MisinformationGame: parent_MG, String: answer_set)
 #	3. compute_nme_dict()
 #	4. compute_pos_vecs()
 #	5. clingo_compile_format()
 #	6. clingo_compile_nme_list()
+#	7. spill(MGStore: store)
+#
+# A spilled MG (see mg_store.py) keeps only its id, its NMEs and its
+# knowledge in memory. Its NFGs, its utilities tensor and its clingo
+# format are read from the store on demand, see get_games(). The
+# clingo format of the recently expanded MGs is cached by the store.
 #
 # author: Merkouris Papamichail
 # email: mercoyris@ics.forth.gr
@@ -60,16 +67,19 @@
 ## Custom Libraries
 import game
 import auxiliary_functions as ax
+import parsers
+from debugging import histogram_names
 
 
 ## Python Libraries
 import pprint
-import re		# regular expressions
 import itertools
 import threading
+import time
 
 ## 3rd party libraries
 from termcolor import colored, cprint
+import numpy as np
 
 
 #########
@@ -118,8 +128,19 @@ class MisinformationGame:
 		# during the Adaptation Procedure
 		self.sme = set()
 		
+		## Utilities tensor (see get_utilities_tensor())
+		self.utilities_tensor = None
+		
+		## (Optional) The out-of-core store and the slot of the MG,
+		## see spill()
+		self.store		= None
+		self.store_slot	= None
+		
 		## Initialize clingo format
-		self.clingo_format = ""
+		# The clingo format is compiled lazily, on the first call of
+		# get_clingo_format(), i.e. only if a clingo backend needs it
+		self.clingo_format = b""
+		self.clingo_format_lock = threading.Lock()
 		
 		## Dictionary: NMEs --> PositionVectors
 		self.nme_clingo = dict()	# this will be a list of strings
@@ -142,7 +163,6 @@ class MisinformationGame:
 		return 	self.utilities_generated	== True 	and\
 				self.nme_computed			== True		and\
 				self.pos_vecs_computed 		== True		and\
-				self.clingo_format_compiled	== True		and\
 				self.nmes_clingo_compiled 	== True		#and\
 				#self.knowledge_computed 	== True
 	
@@ -151,25 +171,25 @@ class MisinformationGame:
 	
 	def get_num_nmes(self):
 		assert self.initialization_completed()
-		assert len(self.nme_clingo) == len(self.nme)
+		assert self.is_spilled() or len(self.nme_clingo) == len(self.nme)
 		
 		return len(self.nme.keys())
 	
 	def get_nme_dict(self):
 		assert self.initialization_completed()
-		assert len(self.nme_clingo) == len(self.nme)
+		assert self.is_spilled() or len(self.nme_clingo) == len(self.nme)
 		
 		return self.nme
 	
 	def get_nme_list(self):
 		assert self.initialization_completed()
-		assert len(self.nme_clingo) == len(self.nme)
+		assert self.is_spilled() or len(self.nme_clingo) == len(self.nme)
 		
 		return self.nme.keys()
 	
 	def get_position_vectors(self):
 		assert self.initialization_completed()
-		assert len(self.nme_clingo) == len(self.nme)
+		assert self.is_spilled() or len(self.nme_clingo) == len(self.nme)
 		
 		return self.nme.values()
 	
@@ -178,8 +198,9 @@ class MisinformationGame:
 	
 	def get_nme_clingo(self):
 		assert self.initialization_completed()
-		assert len(self.nme_clingo) == len(self.nme)
-	
+		assert self.is_spilled() or len(self.nme_clingo) == len(self.nme)
+		
+		if self.is_spilled(): return self._nme_clingo_dict()
 		return self.nme_clingo
 	
 	def get_game_id(self):
@@ -192,15 +213,102 @@ class MisinformationGame:
 		return self.strategies
 	
 	def get_clingo_format(self):
-		assert self.clingo_format_compiled == True
+		return self.get_clingo_format_bytes().decode()
+	
+	# The clingo format, encoded, as written to the stdin of clingo
+	# (see clingo_subprocess.py). Compiled once. The clingo format of a
+	# spilled MG is rendered from the store, and cached by the store,
+	# i.e. once for all the children of the MG (see mg_store.py).
+	def get_clingo_format_bytes(self):
+		assert self.utilities_generated == True
+		
+		if self.is_spilled():
+			clingo_format = self.store.get_clingo_format(self.store_slot)
+			if clingo_format is None:
+				clingo_format = self._clingo_format_bytes(self._read_games())
+				self.store.cache_clingo_format(self.store_slot, clingo_format)
+			
+			return clingo_format
+		
+		with self.clingo_format_lock:
+			if not self.clingo_format_compiled: self.clingo_compile_format()
 		
 		return self.clingo_format
 	
 	def get_clingo_nme_dict(self):
 		assert self.nmes_clingo_compiled == True
 		
+		if self.is_spilled(): return self._nme_clingo_dict()
 		return self.nme_clingo
 	
+	def is_spilled(self):
+		return self.store is not None
+	
+	# The n+1 NFGs of the MG. The NFGs of a spilled MG are read from
+	# the store, every time, i.e. they are not kept in memory.
+	# NOTE: the NFGs of a spilled MG should not be modified.
+	def get_games(self):
+		if not self.is_spilled(): return self.games
+		
+		return self._read_games(self.store.get_nash_equilibria(self.store_slot))
+	
+	# The NFGs of a spilled MG, from the utilities of the store, and
+	# with the given Nash Equilibria, if any
+	def _read_games(self, nash_equilibria = None):
+		utilities_tensor = self.store.get_utilities(self.store_slot)
+		
+		games = []
+		for player in range(0, self.num_players + 1):
+			NFG = game.NormalFormGame(self.gambit_pac, self.debugging, self.domain, str(player), self.num_players, self.strategies)
+			NFG.generate_strategy_profiles()
+			NFG.utilities_from_array(utilities_tensor[player])
+			if nash_equilibria is not None: NFG.restore_nash_equilibria(nash_equilibria[player])
+			games.append(NFG)
+		
+		return games
+	
+	# The Nash Equilibria of the n+1 NFGs, a list per NFG. The Nash
+	# Equilibria of a spilled MG are read from the store, without
+	# building its NFGs.
+	def get_nash_equilibria(self):
+		if self.is_spilled(): return self.store.get_nash_equilibria(self.store_slot)
+		
+		return [NFG.get_nash_equilibria() for NFG in self.games]
+	
+	# Returns the MG, after compute_pos_vecs(), in a compact picklable
+	# form, i.e. the tuple
+	#	(game_id, utilities tensor, [NE of each game], NME dictionary,
+	#	 knowledge, total knowledge)
+	# e.g. in order to send the MG to another process.
+	# See also: from_payload()
+	def export_payload(self):
+		assert self.utilities_generated == True
+		assert self.pos_vecs_computed == True
+		
+		return (
+			self.game_id,
+			self.get_utilities_tensor(),
+			self.get_nash_equilibria(),
+			self.nme,
+			self.knowledge,
+			self.total_knowledge
+		)
+	
+	# Returns the utilities of the MG as an integer array of shape
+	# (n+1, S_1, ..., S_n, n), i.e. the array [g, s_1, ..., s_n, p] is
+	# the utility of player p+1, at the strategy profile (s_1, ..., s_n),
+	# in the game g. The tensor is computed once, the utilities of an
+	# MG do not change after they are generated.
+	def get_utilities_tensor(self):
+		assert self.utilities_generated == True
+		
+		if self.is_spilled(): return self.store.get_utilities(self.store_slot)
+		
+		if self.utilities_tensor is None:
+			self.utilities_tensor = np.stack([NFG.get_utilities_array() for NFG in self.games])
+		
+		return self.utilities_tensor
+	
 	
 	#############
 	# Modifiers #
@@ -209,6 +317,36 @@ class MisinformationGame:
 	def insert_sme(self, sme):
 		self.sme.add(sme)
 	
+	# Sets the agents' social (total) knowledge, when it is not computed
+	# from a CLINGO answer set (see compute_knowledge_from_answer_set()).
+	def set_knowledge(self, knowledge, total_knowledge):
+		self.knowledge = knowledge
+		self.total_knowledge = total_knowledge
+		self.knowledge_percentage = round((self.knowledge / self.total_knowledge) * 100, 2)
+		
+		self.knowledge_computed = True
+	
+	
+	# Moves the utilities and the Nash Equilibria of the (completed)
+	# MG to the out-of-core store (see mg_store.py), and drops the
+	# NFGs, the utilities tensor and the clingo format from memory.
+	# The MG should not be visible to other threads, yet.
+	def spill(self, store):
+		assert self.initialization_completed()
+		assert self.is_spilled() == False
+		
+		self.store_slot = store.put(
+			self.get_utilities_tensor(),
+			[NFG.get_nash_equilibria() for NFG in self.games]
+		)
+		self.store = store
+		
+		self.games					= None
+		self.utilities_tensor		= None
+		self.clingo_format			= b""
+		self.clingo_format_compiled	= False
+		self.nme_clingo				= None
+	
 	
 	#####################
 	# Convert to String	#
@@ -232,9 +370,10 @@ class MisinformationGame:
 		output += "\n\n"
 		
 		# Write the games
+		games = self.get_games()
 		for i in range(0, self.get_num_players() + 1):
 			#output += "# game " + str(i) + " utilities\n"
-			output += self.games[i].export_utilities()
+			output += games[i].export_utilities()
 			output += "\n\n"
 		
 		return output
@@ -266,182 +405,183 @@ class MisinformationGame:
 	
 	
 	## Utilities from Clingo
-	def _SP_string_to_tuple(self, clingo_sp_string):
-		
-		# remove th "sp" prefix
-		sp_str = re.sub("sp", "", clingo_sp_string)
-		
-		# remove the "nul" token
-		sp_str = re.sub("nul", "", sp_str)
-		
-		# remove parenthesis
-		sp_str = re.sub("\(", "", sp_str)
-		sp_str = re.sub("\)", "", sp_str)
-		
-		# tokenize
-		sp_str_list = sp_str.split("-")
-		
-		# remove the empty tokens, if any
-		while "" in sp_str_list:
-			sp_str_list.remove("")
-		
-		sp_int_list = map(lambda strategy : int(strategy) - 1 , sp_str_list)
-		
-		## return a tuple
-		return tuple(sp_int_list)
-		
 	
-	# This function is a *mutator* and it is *automatically* called when the
-	# utilities are generated form the CLINGO answer set, i.e. the
+	# This function is a *mutator*, the knowledge is also set *automatically*
+	# when the utilities are generated form the CLINGO answer set, i.e. the
 	# utilities_from_clingo() method is invoked.
 	#
 	# Thus, we compute the agents' social (total) knowledge in this
 	# misinformation game.
 	def compute_knowledge_from_answer_set(self, answer_set):
-		## tokenize the answer set
-		# split the tokens by space " ".
-		tokens = answer_set.split(" ")
-		
-		# discard the empty tokens, if any
-		tokens = list(filter(lambda token: token != "", tokens))
-		
-		
-		knowledge_predicate = "new_frac_knowledge\(.*\)"
-		knowledge_token = None
-		for token in tokens:
-			if re.search(knowledge_predicate, token) != None:
-				knowledge_token = token
-				break
-		
-		knowledge_token = re.sub("new_frac_knowledge\(", "", knowledge_token)
-		knowledge_token = re.sub("\)", "", knowledge_token)
-		knowledge_token = knowledge_token.split(",")
-		self.knowledge = int(knowledge_token[0])
-		self.total_knowledge = int(knowledge_token[1])
-		self.knowledge_percentage = round((self.knowledge / self.total_knowledge) * 100, 2)
-		
-		self.knowledge_computed = True
-	
+		knowledge, total_knowledge = parsers.parse_answer_set_knowledge(answer_set)
+		self.set_knowledge(knowledge, total_knowledge)
 	
 	
-	##########################################################
-	# Input: 	The "raw" answer set as given by clingo, as 
-	#			string of predicates.
-	#
-	# Output:	The processed AS as list of lists of the form
-	#			[[Game, Player, StrategyProfile, Utility]]
-	#			Types [[Int, Int, (Int), Int]]
-	##########################################################
-	def _answer_set_to_utilities_info_list(self, answer_set):
-		## determine the knowledge
-		self.compute_knowledge_from_answer_set(answer_set)
-		
-		## tokenize the answer set
-		# split the tokens by space " ".
-		tokens = answer_set.split(" ")
-		
-		# discard the empty tokens, if any
-		tokens = list(filter(lambda token: token != "", tokens))
-		
-		
-		# a regular expression (roughly) describing a utility
-		# predicate
-		utilities_predicate = "v\(.*\)"
-		
-		
-		## remove other predicates, if any
-		other_predicates = []
-		for token in tokens:
-			if re.search(utilities_predicate, token) == None:
-				other_predicates.append(token)
-		for remove_token in other_predicates:
-			tokens.remove(remove_token)
-
-		
-		## remove the prefix "v" and keep the relation
-		tokens = list(map(lambda token: re.sub("v", "", token), tokens))
-		
-		
-		## remove parenthesis
-		tokens = list(map(lambda token: re.sub("^\(", "", token), tokens))
-		tokens = list(map(lambda token: re.sub("\)$", "", token), tokens))
-		
-		## change the entries splitting commas ',' to dashes '-',
-		# while maintaining the commas in strategy profiles
-		tokens = list(map(lambda token: re.sub("sp\(([0-9]+),", r"sp(\1-", token), tokens))
-
-		
-		## get the utilities as list of lists
-		# this list of list will be of the form
-		# [["Game", "Player", "SP", "Util"]]
-		utilities_list = list(map(lambda token: token.split(","), tokens))
-
-		## getting from list of lists of string to a int and
-		# int tuple list of list.
-		# given the list [["Game", "Player", "SP", "Util"]]
-		# we want to get [[Game, Player, (Int), Util]]
-		# for the entries Game, Player, Util the conversion is
-		# straight forward, for the strategy profile, we have to
-		# utilize some more elaborate method!
-		
-		# we define (again roughly) a regular expression
-		# for the strategy profile. Remember, we represent
-		# the strategy profiles in clingo with a list, e.g.
-		# sp(1, sp(2, sp(3, nul)))
-		# is representing the strategy profile (1, 2, 3).
-		sp_regex = "sp\(.*\)"
-		
-		utilities_info = []
-		for util in utilities_list:
-			util_info = []
-			for entry in util:
-				# easy conversion from string to int
-				if re.search(sp_regex, entry) == None:
-					util_info.append(int(entry))
-				# strategy profile entry, a little more
-				# work is needed to convert to (Int)
-				else:
-					util_info.append(self._SP_string_to_tuple(entry))
-			
-			utilities_info.append(util_info)
+	# The utilities and the knowledge, in a single pass over the
+	# answer set, see parsers.parse_answer_set()
+	def utilities_from_clingo(self, answer_set):
+		assert self.utilities_generated == False
 		
-		## return list of lists
-		return utilities_info
+		parsing_start_t = time.time()
+		utilities_tensor, knowledge, total_knowledge = \
+			parsers.parse_answer_set(self.num_players, self.strategies, answer_set)
+		self.debugging.observe(histogram_names.answer_set_parsing, time.time() - parsing_start_t)
+		
+		assert knowledge is not None, "Error: No new_frac_knowledge/2 in the answer set!"
+		self.set_knowledge(knowledge, total_knowledge)
+		
+		self.utilities_from_tensor(utilities_tensor)
 	
 	
-	def utilities_from_clingo(self, answer_set):
+	# The utilities and the knowledge from a delta answer set (see
+	# adaptation_delta.lp), i.e. the utilities of the parent MG,
+	# where only the overwritten utilities are replaced, see
+	# parsers.parse_answer_set_delta()
+	def utilities_from_clingo_delta(self, parent_MG, answer_set):
 		assert self.utilities_generated == False
 		
-		utilities_info = self._answer_set_to_utilities_info_list(answer_set)
+		parsing_start_t = time.time()
+		index, utilities, knowledge, total_knowledge = \
+			parsers.parse_answer_set_delta(self.num_players, answer_set)
+		self.debugging.observe(histogram_names.answer_set_parsing, time.time() - parsing_start_t)
 		
-		# create Dict:Player's Game --> Utilities Info
-		game_info = dict()
-		for player in range(0, self.num_players+1):
-			game_info[player] = []
+		assert knowledge is not None, "Error: No new_frac_knowledge/2 in the answer set!"
+		self.set_knowledge(knowledge, total_knowledge)
 		
-		for util_info in utilities_info:
-			game = ax.head(util_info)
-			game_info[game].append(util_info)
-
+		utilities_tensor = parent_MG.get_utilities_tensor().copy()
+		utilities_tensor[index] = utilities
 		
+		self.utilities_from_tensor(utilities_tensor)
+
+	
+	## Utilities from a tensor of shape (n+1, S_1, ..., S_n, n)
+	# See also: get_utilities_tensor()
+	def utilities_from_tensor(self, utilities_tensor):
+		assert self.utilities_generated == False
+		assert utilities_tensor.shape == (self.num_players + 1,) + tuple(self.strategies) + (self.num_players,)
 		
-		for game in range(0, self.num_players + 1):
-			self.games[game].utilities_from_list(game_info[game])
+		for player in range(0, self.num_players + 1):
+			self.games[player].utilities_from_array(utilities_tensor[player])
 		
+		self.utilities_tensor = utilities_tensor
 		
 		## update state
 		self.utilities_generated = True
 	
 	
+	## The MG from its payload, see export_payload(). The Nash
+	# Equilibria, the NMEs and the position vectors are restored,
+	# not computed again.
+	def from_payload(self, payload):
+		game_id, utilities_tensor, nash_equilibria, nme, knowledge, total_knowledge = payload
+		assert game_id == self.game_id
+		assert self.nme_computed == False
+		
+		self.utilities_from_tensor(utilities_tensor)
+		
+		for NFG, game_nash_equilibria in zip(self.games, nash_equilibria):
+			NFG.restore_nash_equilibria(game_nash_equilibria)
+		
+		self.nme = nme
+		self.nme_computed		= True
+		self.pos_vecs_computed	= True
+		
+		if total_knowledge is not None: self.set_knowledge(knowledge, total_knowledge)
+	
+	
 	##################################
 	# Natural Misinformed Equilibria #
 	##################################
 
 
-	def _compute_nash_equilibria(self, player):
+	def _compute_nash_equilibria(self, player, cache = True):
 		assert 0 <= player and player <= self.num_players
 
-		self.games[player].compute_nash_equilibria()
+		self.games[player].compute_nash_equilibria(cache)
+
+
+	# An adaptation step on the parent_MG at pos_vec only changes
+	# the player's games that disagree with the actual game at
+	# pos_vec. The actual game (games[0]) and every other player's
+	# game are the same as the parent's, thus they inherit the
+	# parent's Nash Equilibria, instead of computing them again.
+	def inherit_nash_equilibria(self, parent_MG, pos_vec):
+		assert self.utilities_generated == True
+		assert self.nme_computed == False
+
+		parent_tensor = parent_MG.get_utilities_tensor()
+
+		## NOTE: the NFGs of a spilled parent are not built, its
+		## Nash Equilibria are read from the store
+		if parent_MG.is_spilled():	parent_nash_equilibria = parent_MG.get_nash_equilibria()
+		else:						parent_games = parent_MG.get_games()
+
+		# from the position vector (starting from 1) to the
+		# index of the strategy profile (starting from 0)
+		index = tuple(strategy - 1 for strategy in pos_vec)
+		in_range = all(0 <= s and s < S for s, S in zip(index, self.strategies))
+
+		for i in range(self.num_players + 1):
+			unchanged = (i == 0) or (not in_range) or \
+				np.array_equal(parent_tensor[(i,) + index], parent_tensor[(0,) + index])
+
+			if unchanged:
+				if parent_MG.is_spilled():	self.games[i].restore_nash_equilibria(parent_nash_equilibria[i])
+				else:						self.games[i].inherit_nash_equilibria(parent_games[i])
+				self.debugging.inherited_nash_equilibria()
+
+
+	# The Nash Equilibria of all the n+1 games, in a single
+	# call on the utilities tensor, except for the games found
+	# in the Nash Equilibria cache (if any)
+	def _compute_stacked_nash_equilibria(self):
+		games = []
+		for i in range(self.num_players + 1):
+			if self.games[i].is_nash_equilibria_computed(): continue
+			if self.games[i].load_cached_nash_equilibria(): continue
+			games.append(i)
+		if games == []: return
+
+		gambit_start_t = time.time()
+		nash_equilibria = self.gambit_pac.compute_stacked_nash_equilibria(self.get_utilities_tensor()[games])
+		gambit_end_t = time.time()
+
+		self.debugging.gambit_call(gambit_end_t - gambit_start_t)
+
+		for i, game_nash_equilibria in zip(games, nash_equilibria):
+			self.games[i].set_nash_equilibria(game_nash_equilibria)
+
+
+	# The n+1 games in parallel, on the (shared) workers of the
+	# gambit package, see Gambit.set_num_workers(). The Nash
+	# Equilibria cache (if any) is looked up and updated by the
+	# calling thread, in the order of the games, as in the sequential
+	# case. Thus, the cache hits (and the cached Nash Equilibria) do
+	# not depend on the order the workers finish. A game with the
+	# same utilities as a game being solved is not solved again, it
+	# hits the cache after that game is solved.
+	def _compute_parallel_nash_equilibria(self):
+		has_cache = self.gambit_pac.has_nash_equilibria_cache()
+
+		futures	= dict()	# game --> future
+		keys	= set()		# the cache keys of the games being solved
+		for i in range(self.num_players + 1):
+			if self.games[i].is_nash_equilibria_computed(): continue
+
+			if has_cache:
+				key = self.games[i].get_nash_equilibria_cache_key()
+				if key in keys: continue
+				if self.games[i].load_cached_nash_equilibria(): continue
+				keys.add(key)
+
+			futures[i] = self.gambit_pac.submit(self._compute_nash_equilibria, i, False)
+
+		for i in range(self.num_players + 1):
+			if i in futures:
+				futures[i].result()
+				self.games[i].cache_nash_equilibria()
+			elif not self.games[i].is_nash_equilibria_computed():
+				self.games[i].compute_nash_equilibria()
 
 
 	# Computing the nme dictionary, i.e.
@@ -452,8 +592,16 @@ class MisinformationGame:
 		assert self.nme_computed == False
 
 
-		for i in range(self.num_players + 1):
-			self.games[i].compute_nash_equilibria()
+		# NOTE: the games with inherited Nash Equilibria
+		# (see inherit_nash_equilibria()) are not computed again
+		if self.gambit_pac.is_stacked_method():
+			self._compute_stacked_nash_equilibria()
+		elif self.gambit_pac.has_executor():
+			self._compute_parallel_nash_equilibria()
+		else:
+			for i in range(self.num_players + 1):
+				if not self.games[i].is_nash_equilibria_computed():
+					self.games[i].compute_nash_equilibria()
 
 
 		# a Dict:Players -->[mixed strategies]
@@ -521,19 +669,24 @@ class MisinformationGame:
 		assert self.utilities_generated == True
 		assert self.clingo_format_compiled == False
 		
+		self.clingo_format = self._clingo_format_bytes(self.games)
+		
+		# update state
+		self.clingo_format_compiled = True
+	
+	def _clingo_format_bytes(self, games):
 		## print number of players
-		self.clingo_format += "num_players(" + str(self.num_players) + ").\n"
+		clingo_format = ["num_players(" + str(self.num_players) + ").\n"]
 		
 		## print strategies
 		for player in range(1, self.num_players + 1):
-			self.clingo_format += "s(" + str(player) + ", 1.." + str(self.strategies[player-1]) + ").\n"
+			clingo_format.append("s(" + str(player) + ", 1.." + str(self.strategies[player-1]) + ").\n")
 		
 		## print utilities
 		for player in range(0, self.num_players + 1):
-			self.clingo_format += self.games[player].clingo_str_file()
+			clingo_format.append(games[player].clingo_str_file())
 		
-		# update state
-		self.clingo_format_compiled = True
+		return "".join(clingo_format).encode()
 	
 	
 	def clingo_compile_nme(self):
@@ -541,9 +694,18 @@ class MisinformationGame:
 		assert self.pos_vecs_computed == True
 		assert self.nmes_clingo_compiled == False
 		
+		self.nme_clingo = self._nme_clingo_dict()
+			
+		# update state
+		self.nmes_clingo_compiled = True
+	
+	# The position vectors of the NMEs, as clingo predicates. Not kept
+	# in memory by a spilled MG, see get_clingo_nme_dict().
+	def _nme_clingo_dict(self):
 		## Initialize nme_clingo dictionary
+		nme_clingo = dict()
 		for nme in self.nme.keys():
-			self.nme_clingo[nme] = []
+			nme_clingo[nme] = []
 		
 		for nme in self.nme.keys():
 			for pos_vec in self.nme[nme]:
@@ -558,7 +720,6 @@ class MisinformationGame:
 
 				clingo_pos_vec = ax.pos_vec2clingo(pos_vec)
 
-				self.nme_clingo[nme].append(clingo_pos_vec)
-			
-		# update state
-		self.nmes_clingo_compiled = True
+				nme_clingo[nme].append(clingo_pos_vec)
+		
+		return nme_clingo
@@ -0,0 +1,92 @@
+#####################################################################
+# nash_equilibria_cache.py
+# ------------------------------------------------------------------
+# A thread-safe, size-bounded (LRU) cache of Nash Equilibria, shared
+# by all the Normal Form Games (NFGs) of an adaptation procedure.
+#
+# An adaptation step only changes the utilities at a single strategy
+# profile, thus many NFGs across the misinformation games have the
+# same utilities, and (without the cache) the same Nash Equilibria are
+# computed again and again.
+#
+# The key of an NFG is a hash (blake2b) of,
+#	1. the strategies vector,
+#	2. the utilities array (see NormalFormGame.get_utilities_array()),
+#	3. the method computing the NE and the decimal points (see
+#		gambit.py), and
+#	4. the method of the domain mapping (see domain.py).
+#
+# The cached value is the list of the Nash Equilibria, after the
+# domain mapping, i.e. NormalFormGame.get_nash_equilibria().
+#
+# See also: NormalFormGame.compute_nash_equilibria()
+#####################################################################
+
+
+#############
+# Libraries #
+#############
+
+## Python Libraries
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+
+## 3rd party libraries
+import numpy as np
+
+
+###########
+# Classes #
+###########
+
+class NashEquilibriaCache:
+
+	def __init__(self, max_size):
+		assert max_size > 0
+
+		self.max_size	= max_size
+		self.entries	= OrderedDict()		# key --> tuple of NE, in LRU order
+		self.lock		= Lock()
+
+	#############
+	# Accessors #
+	#############
+
+	def get_max_size(self):
+		return self.max_size
+
+	def get_size(self):
+		with self.lock:
+			return len(self.entries)
+
+	###########
+	# Methods #
+	###########
+
+	## The key of an NFG, see the header
+	def key(self, strategies, utilities_array, method_val, decimal, domain_method_val):
+		key_hash = hashlib.blake2b(digest_size=16)
+
+		key_hash.update(np.asarray(strategies, dtype=np.int64).tobytes())
+		key_hash.update(np.ascontiguousarray(utilities_array, dtype=np.int64).tobytes())
+		key_hash.update(np.asarray([method_val, decimal, domain_method_val], dtype=np.int64).tobytes())
+
+		return key_hash.digest()
+
+	## Returns the list of the cached Nash Equilibria,
+	## or None, if the key is not cached
+	def get(self, key):
+		with self.lock:
+			if key not in self.entries: return None
+
+			self.entries.move_to_end(key)
+			return list(self.entries[key])
+
+	def put(self, key, nash_equilibria):
+		with self.lock:
+			self.entries[key] = tuple(nash_equilibria)
+			self.entries.move_to_end(key)
+
+			if len(self.entries) > self.max_size:
+				self.entries.popitem(last=False)
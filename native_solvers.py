@@ -0,0 +1,189 @@
+#####################################################################
+# native_solvers.py
+# ------------------------------------------------------------------
+# In-process (NumPy) methods for computing the Nash Equilibria of a
+# Normal Form Game (NFG), i.e. without the system call to GAMBIT and
+# the round trip of the game and the equilibria as text.
+#
+# The input of every method is the utilities array of the NFG, i.e.
+# an integer array of shape (S_1, ..., S_n, n), see
+# NormalFormGame.get_utilities_array(). The output follows the format
+# of parsers.parse_gambit_out_file(), namely a list of strategy
+# profiles, where each strategy profile is a tuple of mixed
+# strategies, and each mixed strategy is a tuple of floats, e.g.
+# [((0.5, 0.5), (1.0, 0.0, 0.0))].
+#
+# Functions:
+#
+#	1) extreme_point_enumeration():
+#		For 2-player games. Enumerates the vertices of the two best
+#		response polytopes, and returns the completely labeled pairs,
+#		i.e. the extreme Nash Equilibria, as gambit-enummixed does.
+#		Works for degenerate games too.
+#
+#	2) pure_nash_equilibria():
+#		For n-player games. The pure Nash Equilibria, as
+#		gambit-enumpure computes them, via best response masks.
+#
+#	3) stacked_pure_nash_equilibria():
+#		As pure_nash_equilibria(), for a stack of NFGs of the same
+#		shape, e.g. the n+1 games of a misinformation game, in a
+#		single call. See MisinformationGame.get_utilities_tensor().
+#####################################################################
+
+
+#############
+# Libraries #
+#############
+
+## Python Libraries
+import itertools
+
+## 3rd party libraries
+import numpy as np
+
+
+#############
+# Constants #
+#############
+
+# Numerical tolerance for the feasibility and the tight constraints
+# of a vertex
+tolerance = 1e-9
+
+
+#############
+# Functions #
+#############
+
+## The vertices of the polytope {z : G z <= h}, of dimension dim,
+## together with their labels. The label of a vertex is the set of its
+## tight constraints (rows of G), encoded as a bitmask. The origin is
+## excluded. Every vertex is the solution of dim tight constraints,
+## thus we solve (in a single batch) every dim x dim subsystem.
+def _polytope_vertices(G, h, dim):
+	combinations = np.array(list(itertools.combinations(range(G.shape[0]), dim)))
+
+	G_sub = G[combinations]		# shape (K, dim, dim)
+	h_sub = h[combinations]		# shape (K, dim)
+
+	nonsingular = np.abs(np.linalg.det(G_sub)) > tolerance
+	if not np.any(nonsingular): return []
+
+	z = np.linalg.solve(G_sub[nonsingular], h_sub[nonsingular][..., np.newaxis])[..., 0]
+
+	slack = h[np.newaxis, :] - z @ G.T		# shape (K', rows)
+	feasible = np.all(slack >= -tolerance, axis=1) & np.any(np.abs(z) > tolerance, axis=1)
+
+	vertices = dict()
+	for vertex, vertex_slack in zip(z[feasible], slack[feasible]):
+		key = tuple(np.round(vertex, 12))
+		if key in vertices: continue
+
+		label = 0
+		for row in np.flatnonzero(np.abs(vertex_slack) <= tolerance):
+			label |= 1 << int(row)
+
+		vertices[key] = (vertex, label)
+
+	return list(vertices.values())
+
+
+## The best response mask of a stack of NFGs, i.e. from the utilities
+## tensor of shape (G, S_1, ..., S_n, n), to the boolean array of shape
+## (G, S_1, ..., S_n), where the entry [g, s_1, ..., s_n] is True, iff
+## (s_1, ..., s_n) is a pure Nash Equilibrium of the NFG g.
+def _pure_nash_equilibria_mask(utilities_tensor):
+	num_players = utilities_tensor.shape[-1]
+
+	mask = np.ones(utilities_tensor.shape[:-1], dtype=bool)
+	for player in range(num_players):
+		utilities = utilities_tensor[..., player]
+
+		# the strategies of player are on the axis player + 1,
+		# the best responses, given the strategies of the others,
+		# are the maximum utilities along this axis.
+		mask &= utilities == utilities.max(axis=player + 1, keepdims=True)
+
+	return mask
+
+
+## From a pure strategy profile (s_1, ..., s_n), starting from 0, to the
+## tuple of (degenerate) mixed strategies, e.g. (0, 1) --> ((1.0, 0.0), (0.0, 1.0))
+def _pure_strategy_profile(strategy_profile, strategies):
+	return tuple(
+		tuple(1.0 if strategy == played else 0.0 for strategy in range(num_strategies))
+		for played, num_strategies in zip(strategy_profile, strategies)
+	)
+
+
+## From a vertex of a best response polytope, to a mixed strategy
+def _mixed_strategy(vertex, decimal):
+	strategy = vertex / vertex.sum()
+
+	# + 0.0 converts -0.0 to 0.0
+	return tuple(round(float(probability), decimal) + 0.0 for probability in strategy)
+
+
+## Extreme Point Enumeration, for 2-player games.
+#
+# Let A, B be the (positive) utilities of player 1 and 2,
+# of shape (m, n). The best response polytopes are,
+#	P = {x in R^m : x >= 0, B^T x <= 1}
+#	Q = {y in R^n : A y <= 1, y >= 0}
+# with labels 0, ..., m-1 for the strategies of player 1 and
+# m, ..., m+n-1 for the strategies of player 2. A pair of
+# vertices (x, y) is a Nash Equilibrium (after normalization),
+# iff it is completely labeled.
+def extreme_point_enumeration(utilities_array, decimal=8):
+	assert utilities_array.ndim == 3 and utilities_array.shape[-1] == 2
+
+	m, n = utilities_array.shape[0], utilities_array.shape[1]
+
+	# shift the utilities to positive values, the equilibria
+	# remain the same
+	shift = 1 - int(utilities_array.min())
+	A = utilities_array[:, :, 0].astype(float) + shift
+	B = utilities_array[:, :, 1].astype(float) + shift
+
+	P_vertices = _polytope_vertices(
+		np.vstack([-np.eye(m), B.T]),
+		np.concatenate([np.zeros(m), np.ones(n)]),
+		m
+	)
+	Q_vertices = _polytope_vertices(
+		np.vstack([A, -np.eye(n)]),
+		np.concatenate([np.ones(m), np.zeros(n)]),
+		n
+	)
+
+	all_labels = (1 << (m + n)) - 1
+
+	nash_equilibria = set()
+	for x, x_label in P_vertices:
+		for y, y_label in Q_vertices:
+			if x_label | y_label == all_labels:
+				nash_equilibria.add((_mixed_strategy(x, decimal), _mixed_strategy(y, decimal)))
+
+	return sorted(nash_equilibria)
+
+
+## Pure Nash Equilibria, for n-player games.
+def pure_nash_equilibria(utilities_array):
+	return stacked_pure_nash_equilibria(utilities_array[np.newaxis])[0]
+
+
+## Pure Nash Equilibria of a stack of NFGs, given the utilities tensor
+## of shape (G, S_1, ..., S_n, n). Returns a list of G lists of Nash
+## Equilibria, one for every NFG of the stack.
+def stacked_pure_nash_equilibria(utilities_tensor):
+	strategies = utilities_tensor.shape[1:-1]
+
+	mask = _pure_nash_equilibria_mask(utilities_tensor)
+
+	nash_equilibria = [[] for game in range(utilities_tensor.shape[0])]
+	for index in np.argwhere(mask):
+		game, strategy_profile = int(index[0]), index[1:]
+		nash_equilibria[game].append(_pure_strategy_profile(strategy_profile, strategies))
+
+	return [sorted(game_nash_equilibria) for game_nash_equilibria in nash_equilibria]
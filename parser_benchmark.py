@@ -0,0 +1,271 @@
+###########################################################
+# parser_benchmark.py
+# --------------------------------------------------------
+# A micro-benchmark of the parsing of the CLINGO answer
+# sets, i.e. of MisinformationGame.utilities_from_clingo().
+# The single-pass parser (see parsers.parse_answer_set())
+# is compared against the former regex pipeline, which is
+# kept below as the baseline. The parsing runs
+# under the GIL for every new MG.
+#
+# The answer sets are synthesized from random utilities,
+# in the format of the CLINGO output (see adaptation.lp),
+# and the atoms are shuffled. Both parsers must agree, on
+# every answer set.
+#
+# Input: 	(Optionally) The number of answer sets, per
+#			shape. By default, 200.
+#
+# Output:	For every shape, the average time (in micro
+#			seconds) of each parser, and the speedup.
+#
+# Example call:
+#	python parser_benchmark.py 200
+#
+#	Output to example:
+#
+#		| Shape		Atoms	Regex(us)	Single(us)	Speedup
+#		| 4x4		100		2538.0		216.3		11.73
+#		| 2x2x2x2	324		10244.0		849.3		12.06
+###########################################################
+
+
+#############
+# Libraries #
+#############
+
+## Python
+import re
+import sys
+import random
+import timeit
+
+## 3rd party
+import numpy as np
+
+## Custom
+import parsers
+
+
+#############
+# Constants #
+#############
+
+rand_seed = 2
+
+default_num_answer_sets = 200
+
+## shape name --> strategies
+shapes = {
+	"4x4":		[4, 4],
+	"2x2x2x2":	[2, 2, 2, 2]
+}
+
+max_util = 10
+
+
+#############
+# Functions #
+#############
+
+## The clingo list of a strategy profile, e.g.
+## sp(1,sp(2,nul)) for the (1-based) profile (1, 2)
+def clingo_sp(strategy_profile):
+	return "".join("sp(" + str(s) + "," for s in strategy_profile) + \
+		"nul" + ")" * len(strategy_profile)
+
+
+## A random answer set, as given by CLINGO, together with
+## its utilities tensor, knowledge and total knowledge
+def random_answer_set(strategies):
+	num_players = len(strategies)
+	tensor_shape = (num_players + 1,) + tuple(strategies) + (num_players,)
+
+	utilities_tensor = np.random.randint(-max_util, max_util + 1, size=tensor_shape)
+	total_knowledge = num_players * int(np.prod(strategies))
+	knowledge = random.randint(0, total_knowledge)
+
+	atoms = []
+	for index in np.ndindex(*tensor_shape):
+		game, strategy_profile, player = index[0], index[1:-1], index[-1]
+		atoms.append(
+			"v(" + str(game) + "," + str(player + 1) + "," +
+			clingo_sp([s + 1 for s in strategy_profile]) + "," +
+			str(utilities_tensor[index]) + ")"
+		)
+	atoms += [
+		"changed",
+		"old_frac_knowledge(" + str(random.randint(0, knowledge)) + "," + str(total_knowledge) + ")",
+		"new_frac_knowledge(" + str(knowledge) + "," + str(total_knowledge) + ")",
+		"answer_set"
+	]
+	random.shuffle(atoms)
+
+	return " ".join(atoms), utilities_tensor, knowledge, total_knowledge
+
+
+#################################
+# The Regex Pipeline (Baseline) #
+#################################
+
+def _SP_string_to_tuple(clingo_sp_string):
+
+	# remove th "sp" prefix
+	sp_str = re.sub("sp", "", clingo_sp_string)
+
+	# remove the "nul" token
+	sp_str = re.sub("nul", "", sp_str)
+
+	# remove parenthesis
+	sp_str = re.sub(r"\(", "", sp_str)
+	sp_str = re.sub(r"\)", "", sp_str)
+
+	# tokenize
+	sp_str_list = sp_str.split("-")
+
+	# remove the empty tokens, if any
+	while "" in sp_str_list:
+		sp_str_list.remove("")
+
+	sp_int_list = map(lambda strategy : int(strategy) - 1 , sp_str_list)
+
+	## return a tuple
+	return tuple(sp_int_list)
+
+
+def compute_knowledge_from_answer_set(answer_set):
+	## tokenize the answer set
+	tokens = answer_set.split(" ")
+	tokens = list(filter(lambda token: token != "", tokens))
+
+	knowledge_predicate = r"new_frac_knowledge\(.*\)"
+	knowledge_token = None
+	for token in tokens:
+		if re.search(knowledge_predicate, token) != None:
+			knowledge_token = token
+			break
+
+	knowledge_token = re.sub(r"new_frac_knowledge\(", "", knowledge_token)
+	knowledge_token = re.sub(r"\)", "", knowledge_token)
+	knowledge_token = knowledge_token.split(",")
+	return int(knowledge_token[0]), int(knowledge_token[1])
+
+
+def answer_set_to_utilities_info_list(answer_set):
+	## tokenize the answer set
+	tokens = answer_set.split(" ")
+	tokens = list(filter(lambda token: token != "", tokens))
+
+	utilities_predicate = r"v\(.*\)"
+
+	## remove other predicates, if any
+	other_predicates = []
+	for token in tokens:
+		if re.search(utilities_predicate, token) == None:
+			other_predicates.append(token)
+	for remove_token in other_predicates:
+		tokens.remove(remove_token)
+
+	## remove the prefix "v" and keep the relation
+	tokens = list(map(lambda token: re.sub("v", "", token), tokens))
+
+	## remove parenthesis
+	tokens = list(map(lambda token: re.sub(r"^\(", "", token), tokens))
+	tokens = list(map(lambda token: re.sub(r"\)$", "", token), tokens))
+
+	## change the entries splitting commas ',' to dashes '-',
+	# while maintaining the commas in strategy profiles
+	tokens = list(map(lambda token: re.sub(r"sp\(([0-9]+),", r"sp(\1-", token), tokens))
+
+	## [["Game", "Player", "SP", "Util"]]
+	utilities_list = list(map(lambda token: token.split(","), tokens))
+
+	sp_regex = r"sp\(.*\)"
+
+	utilities_info = []
+	for util in utilities_list:
+		util_info = []
+		for entry in util:
+			if re.search(sp_regex, entry) == None:
+				util_info.append(int(entry))
+			else:
+				util_info.append(_SP_string_to_tuple(entry))
+
+		utilities_info.append(util_info)
+
+	return utilities_info
+
+
+## The former MisinformationGame.utilities_from_clingo(), the
+## games are filled as in NormalFormGame.utilities_from_list()
+def regex_parse_answer_set(num_players, strategies, answer_set):
+	knowledge, total_knowledge = compute_knowledge_from_answer_set(answer_set)
+	utilities_info = answer_set_to_utilities_info_list(answer_set)
+
+	game_info = dict()
+	for player in range(0, num_players + 1):
+		game_info[player] = []
+
+	for util_info in utilities_info:
+		game_info[util_info[0]].append(util_info[1:])
+
+	games = []
+	for game in range(0, num_players + 1):
+		utilities = np.zeros(tuple(strategies) + (num_players,), dtype=np.int64)
+		for util_info in game_info[game]:
+			utilities[util_info[1] + (util_info[0] - 1,)] = util_info[2]
+		games.append(utilities)
+
+	return np.stack(games), knowledge, total_knowledge
+
+
+## The average time, in micro seconds, of a parser over the
+## answer sets
+def average_time(parse, strategies, answer_sets):
+	num_players = len(strategies)
+
+	total_t = timeit.timeit(
+		lambda: [parse(num_players, strategies, answer_set) for answer_set in answer_sets],
+		number=1
+	)
+
+	return 10**6 * total_t / len(answer_sets)
+
+
+##################
+# The Experiment #
+##################
+
+if __name__ == "__main__":
+
+	num_answer_sets = default_num_answer_sets
+	if len(sys.argv) > 1: num_answer_sets = int(sys.argv[1])
+	assert num_answer_sets >= 1
+
+	random.seed(rand_seed)
+	np.random.seed(rand_seed)
+
+	print("Shape\t\tAtoms\tRegex(us)\tSingle(us)\tSpeedup")
+
+	for shape_name, strategies in shapes.items():
+		instances = [random_answer_set(strategies) for i in range(num_answer_sets)]
+		answer_sets = [instance[0] for instance in instances]
+
+		## Both parsers must agree
+		for answer_set, utilities_tensor, knowledge, total_knowledge in instances:
+			for parse in [regex_parse_answer_set, parsers.parse_answer_set]:
+				parsed_tensor, parsed_knowledge, parsed_total_knowledge = \
+					parse(len(strategies), strategies, answer_set)
+				assert np.array_equal(parsed_tensor, utilities_tensor)
+				assert (parsed_knowledge, parsed_total_knowledge) == (knowledge, total_knowledge)
+
+		regex_t		= average_time(regex_parse_answer_set, strategies, answer_sets)
+		single_t	= average_time(parsers.parse_answer_set, strategies, answer_sets)
+
+		print(
+			shape_name + "\t\t" +
+			str(len(answer_sets[0].split(" "))) + "\t" +
+			str(round(regex_t, 1)) + "\t\t" +
+			str(round(single_t, 1)) + "\t\t" +
+			str(round(regex_t / single_t, 2))
+		)
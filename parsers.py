@@ -1,3 +1,11 @@
+## Python Libraries
+import re			# regex
+import functools	# lru_cache
+
+## 3rd party libraries
+import numpy as np
+
+
 def parse_gambit_out_file(num_players, strategies_vec, gambit_out_file):
 	assert  num_players >= 2
 	assert len(strategies_vec) == num_players
@@ -41,4 +49,104 @@ def parse_gambit_out_line(num_players, strategies_vec, line):
 
 	tup_strategy_prof = tuple(strategy_prof)
 
-	return tup_strategy_prof
\ No newline at end of file
+	return tup_strategy_prof
+
+
+#############################################################
+# CLINGO Answer Sets
+# ----------------------------------------------------------
+# The answer set of an adaptation step (see adaptation.lp) is
+# a string of atoms, separated by spaces, e.g.
+#
+#	v(0,1,sp(1,sp(2,nul)),3) ... new_frac_knowledge(5,8) answer_set
+#
+# where v(Game, Player, StrategyProfile, Utility) is a utility,
+# and the strategies of the profile start from 1. A single
+# (precompiled) regular expression finds every utility and the
+# knowledge, in one pass over the string, and the utilities
+# are scattered to the tensor in a single (numpy) assignment.
+#
+# In the delta mode (see adaptation_delta.lp), the answer set
+# has the same form, but only the overwritten utilities are
+# given, as delta/4 atoms.
+#############################################################
+
+utility_predicate		= "v"
+delta_utility_predicate	= "delta"
+
+knowledge_atom	= r"new_frac_knowledge\((\d+),(\d+)\)"
+knowledge_regex	= re.compile(knowledge_atom)
+
+## The regular expression of the atoms of an answer set of a
+## num_players-player MG. The groups of a utility are
+## Game, Player, s_1, ..., s_n, Utility, the groups of the
+## knowledge are the last two.
+@functools.lru_cache(maxsize=None)
+def answer_set_regex(num_players, predicate=utility_predicate):
+	assert num_players >= 2
+
+	utility_atom = \
+		r"(?<![\w])" + predicate + r"\((\d+),(\d+)," + \
+		r"sp\((\d+)," * num_players + "nul" + r"\)" * num_players + \
+		r",(-?\d+)\)"
+
+	return re.compile(utility_atom + "|" + knowledge_atom)
+
+
+## Returns the index (in the utilities tensor) and the value of
+## every utility of the answer set, together with the knowledge
+## and the total knowledge. The knowledge is None, if the answer
+## set has no new_frac_knowledge/2 atom.
+def _parse_utilities(num_players, answer_set, predicate):
+	atoms = answer_set_regex(num_players, predicate).findall(answer_set)
+
+	## Knowledge, the first atom that is not a utility
+	knowledge, total_knowledge = None, None
+	for atom in atoms:
+		if atom[0] == "":
+			knowledge, total_knowledge = int(atom[-2]), int(atom[-1])
+			break
+
+	## Utilities, the groups are joined and converted to integers
+	## at once, by numpy
+	utilities = " ".join(" ".join(atom[:num_players + 3]) for atom in atoms if atom[0] != "")
+	utilities = np.array(utilities.split(), dtype=np.int64).reshape(-1, num_players + 3)
+
+	index = \
+		(utilities[:, 0],) + \
+		tuple(utilities[:, 2 + player] - 1 for player in range(num_players)) + \
+		(utilities[:, 1] - 1,)
+
+	return index, utilities[:, num_players + 2], knowledge, total_knowledge
+
+
+## Returns the utilities tensor, of shape (n+1, S_1, ..., S_n, n)
+## (see MisinformationGame.get_utilities_tensor()), the knowledge
+## and the total knowledge of the answer set.
+def parse_answer_set(num_players, strategies, answer_set):
+	assert len(strategies) == num_players
+
+	index, utilities, knowledge, total_knowledge = \
+		_parse_utilities(num_players, answer_set, utility_predicate)
+
+	utilities_tensor = np.zeros((num_players + 1,) + tuple(strategies) + (num_players,), dtype=np.int64)
+	utilities_tensor[index] = utilities
+
+	return utilities_tensor, knowledge, total_knowledge
+
+
+## Returns the index (in the utilities tensor) and the value of the
+## overwritten utilities of a delta answer set (see adaptation_delta.lp),
+## the knowledge and the total knowledge. The utilities of the new MG
+## are the utilities of its parent, where tensor[index] = utilities.
+def parse_answer_set_delta(num_players, answer_set):
+	return _parse_utilities(num_players, answer_set, delta_utility_predicate)
+
+
+## Returns the knowledge and the total knowledge of the answer set,
+## see parse_answer_set()
+def parse_answer_set_knowledge(answer_set):
+	knowledge_match = knowledge_regex.search(answer_set)
+	assert knowledge_match is not None, "Error: No new_frac_knowledge/2 in the answer set!"
+
+	return int(knowledge_match.group(1)), int(knowledge_match.group(2))
@@ -0,0 +1,175 @@
+#####################################################################
+# process_traversal.py
+# ------------------------------------------------------------------
+# The worker side of the process pool traversal of the adaptation
+# procedure (see AdaptationProcedure._process_pool_traversal()).
+#
+# The traversal threads (-mtt) spend most of their time in python
+# code, under the GIL, e.g. parsing the CLINGO answer sets, compiling
+# the CLINGO format of the MGs and computing the NMEs. Only the waits
+# on the GAMBIT and CLINGO subprocesses run in parallel. In the
+# process pool traversal (-mtp), the main process keeps the
+# adaptation tree, the pool of the MGs, the terminal set and the
+# SMEs, while the worker processes compute the new MGs, i.e. the
+# adaptation step, the Nash Equilibria and the NMEs.
+#
+# Each worker process creates its own computational environment,
+# i.e. GAMBIT package, debugging, domain and adaptation backend, once,
+# from a picklable configuration (see worker_config()). The MGs are
+# sent to and from the workers as payloads, see
+# MisinformationGame.export_payload(). The counters and the latency
+# histograms of the worker's debugging instance are sent back with
+# every new MG, and added to the debugging instance of the main
+# process.
+#
+# NOTE: The workers are forked, thus the process pool traversal is
+# available only on POSIX systems. (The main.py module is not guarded
+# by if __name__ == "__main__", thus it cannot be spawned.)
+#
+# Functions:
+#
+#	1) worker_config():	The configuration of the workers, given the
+#						computational environment of the main process.
+#
+#	2) init_worker():	The initializer of a worker process.
+#
+#	3) warm_up():		A no-op task, in order to start the workers,
+#						before the traversal.
+#
+#	4) new_mis_game():	The task of the workers, computes a new MG,
+#						given the payload of its parent and the
+#						position vector of the update.
+#####################################################################
+
+
+#############
+# Libraries #
+#############
+
+## Custom Libraries
+from misinformation_game import MisinformationGame
+import adaptation_backend as ab
+import nash_equilibria_cache
+import debugging
+from debugging import histogram_names
+import domain
+import gambit
+
+## Python Libraries
+import os
+import time
+
+
+#############
+# Constants #
+#############
+
+# The computational environment of the worker process,
+# see init_worker()
+_worker = None
+
+
+#############
+# Functions #
+#############
+
+## The (picklable) configuration of the workers
+def worker_config(gambit_pac, debugging, domain, adaptation_backend, num_players, strategies):
+	cache_size = None
+	if gambit_pac.has_nash_equilibria_cache():
+		cache_size = gambit_pac.get_nash_equilibria_cache().get_max_size()
+
+	return (
+		gambit_pac.get_decimal(),
+		gambit_pac.get_default_method_val(),
+		gambit_pac.get_timeout(),
+		gambit_pac.get_num_workers(),
+		cache_size,
+		debugging.print_warnings,
+		debugging.die_after_warning,
+		domain.get_default_method_val(),
+		adaptation_backend.get_backend_val(),
+		adaptation_backend.is_delta(),
+		num_players,
+		list(strategies)
+	)
+
+
+def init_worker(config):
+	global _worker
+
+	decimal, method_val, timeout, num_workers, cache_size, \
+		print_warnings, die_after_warning, domain_method_val, backend_val, \
+		delta, num_players, strategies = config
+
+	gambit_pac = gambit.Gambit(decimal, method_val, timeout)
+	gambit_pac.set_num_workers(num_workers)
+	if cache_size is not None:
+		gambit_pac.set_nash_equilibria_cache(nash_equilibria_cache.NashEquilibriaCache(cache_size))
+
+	worker_debugging = debugging.Debugging(print_warnings, die_after_warning)
+
+	strat_prof_domain = domain.SPDomain(domain_method_val)
+	strat_prof_domain.initialise(num_players, strategies)
+
+	_worker = {
+		"gambit_pac"			: gambit_pac,
+		"debugging"				: worker_debugging,
+		"domain"				: strat_prof_domain,
+		"adaptation_backend"	: ab.create_backend(backend_val, worker_debugging, delta),
+		"num_players"			: num_players,
+		"strategies"			: strategies
+	}
+
+
+def warm_up(task):
+	return os.getpid()
+
+
+## A MG of the worker's environment, with the given id
+def _mis_game(game_id):
+	return MisinformationGame(
+		_worker["gambit_pac"],
+		_worker["debugging"],
+		_worker["domain"],
+		game_id,
+		_worker["num_players"],
+		_worker["strategies"]
+	)
+
+
+## Computes the new MG, i.e. the update of the parent MG at pos_vec,
+## as AdaptationProcedure._new_mis_game() does. Returns the payload
+## of the new MG, and the counters and the histograms of the
+## debugging instance, during the computation.
+def new_mis_game(parent_payload, mg_uniq_id, pos_vec):
+	assert _worker is not None
+
+	construction_start_t = time.time()
+
+	worker_debugging = _worker["debugging"]
+	counters_before = worker_debugging.get_counters()
+
+	parent_MG = _mis_game(parent_payload[0])
+	parent_MG.from_payload(parent_payload)
+
+	MG = _mis_game(mg_uniq_id)
+
+	## compute utilities (and knowledge) from the adaptation backend
+	_worker["adaptation_backend"].adaptation_step(parent_MG, MG, pos_vec)
+
+	## the games that the adaptation step did not change,
+	## inherit the Nash Equilibria of the parent
+	MG.inherit_nash_equilibria(parent_MG, pos_vec)
+
+	## compute nmes
+	MG.compute_nme_dict()
+	MG.compute_pos_vecs()
+
+	worker_debugging.observe(histogram_names.MG_construction, time.time() - construction_start_t)
+
+	counters = worker_debugging.get_counters()
+	for name in counters.keys():
+		counters[name] -= counters_before[name]
+
+	return MG.export_payload(), counters, worker_debugging.take_histograms()
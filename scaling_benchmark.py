@@ -0,0 +1,109 @@
+###########################################################
+# scaling_benchmark.py
+# --------------------------------------------------------
+# Measures the scaling of the process pool traversal of
+# the Adaptation Procedure (-mtp), from 1 to N processes.
+# For comparison, the same instances are also run with the
+# multithreading traversal (-mtt), from 1 to N threads.
+# Calls the Application class of application.py repeatedly.
+#
+# Input: 	1. The maximum number of processes (and threads) N.
+#
+#			2. (Optionally) The random instance, as in the -r
+#				argument of main.py, i.e.
+#				<num_players> <strat_1> ... <strat_n> <max_util>
+#				By default, 2 3 3 10.
+#
+# Output:	For every number of workers k = 1, ..., N, the
+#			average total time of the instances, the speedup
+#			T(1) / T(k), and the efficiency speedup / k.
+#
+# Example call:
+#	python scaling_benchmark.py 4 2 3 3 10
+#
+#	Output to example:
+#
+#		| Instance: -r 2 3 3 10, Seeds: [2, 3, 5]
+#		|
+#		| Mode	Workers	Time(s)	Speedup	Efficiency
+#		| -mtp	1		3.412	1.00	1.00
+#		| -mtp	2		1.873	1.82	0.91
+#		| ...
+#
+# NOTE: The process pool traversal is only available on
+# POSIX systems.
+###########################################################
+
+
+#############
+# Libraries #
+#############
+
+## Python
+import sys
+import time
+
+## Custom
+import application
+
+
+#############
+# Constants #
+#############
+
+rand_seed = [2, 3, 5]
+
+default_instance = ["2", "3", "3", "10"]
+
+modes = ["-mtp", "-mtt"]
+
+
+#############
+# Functions #
+#############
+
+## The average total time of the instance, over the seeds
+def average_time(mode, num_workers, instance):
+	total_t = 0
+
+	for seed in rand_seed:
+		ad_argv = ["-fm", mode, str(num_workers), "-q", "-no", "-se", str(seed), "-r"] + instance
+
+		app = application.Application(ad_argv)
+		start_t = time.time()
+		app.exec()
+		total_t += time.time() - start_t
+
+	return total_t / len(rand_seed)
+
+
+##################
+# The Experiment #
+##################
+
+if __name__ == "__main__":
+
+	max_workers = int(sys.argv[1])
+	assert max_workers >= 1
+
+	instance = sys.argv[2:]
+	if instance == []: instance = default_instance
+
+	print("Instance: -r " + " ".join(instance) + ", Seeds: " + str(rand_seed) + "\n")
+	print("Mode\tWorkers\tTime(s)\tSpeedup\tEfficiency")
+
+	for mode in modes:
+		serial_t = None
+
+		for num_workers in range(1, max_workers + 1):
+			avg_t = average_time(mode, num_workers, instance)
+			if serial_t is None: serial_t = avg_t
+
+			speedup = serial_t / avg_t
+			print(
+				mode + "\t" +
+				str(num_workers) + "\t" +
+				str(round(avg_t, 3)) + "\t" +
+				str(round(speedup, 2)) + "\t" +
+				str(round(speedup / num_workers, 2))
+			)
@@ -0,0 +1,283 @@
+#####################################################################
+# scheduler.py
+# ------------------------------------------------------------------
+# This module provides the schedulers of the adaptation procedure,
+# i.e. the policies that decide which adaptation node (see
+# adaptation_procedure.AdaptationNode) is expanded next. The
+# AdaptationProcedure class only talks to a scheduler through the
+# following methods:
+#
+#	1. register_worker(worker_id):
+#		Called once by every traversal thread, before the traversal.
+#		The threads that are not registered (e.g. the main thread,
+#		when the root is pushed) are considered as the worker 0.
+#
+#	2. push(node):
+#		Adds a node to be expanded.
+#
+#	3. pop():
+#		Returns the next node to be expanded, or None if no node is
+#		available. The call never blocks, waiting for new nodes is
+#		left to the AdaptationProcedure class.
+#
+#	4. is_empty()
+#
+#	5. get_nodes():
+#		A snapshot of the nodes to be expanded, e.g. for a checkpoint
+#		(see AdaptationProcedure.export_checkpoint()). Only called
+#		while the traversal is paused.
+#
+# All the schedulers are thread safe.
+#
+# Classes:
+#
+#	1) BFSScheduler:			A FIFO queue (collections.deque).
+#
+#	2) DFSScheduler:			A LIFO stack (collections.deque).
+#								This was the (only) behaviour of the
+#								adaptation procedure, before the
+#								schedulers, i.e. list.pop().
+#
+#	3) BestFirstScheduler:		A max heap (heapq) on the knowledge
+#								percentage of the node's MG, see
+#								MisinformationGame.get_knowledge_percentage().
+#								Reaches the high-knowledge, and
+#								usually the terminal, games sooner.
+#								Ties are broken in FIFO order.
+#
+#	4) WorkStealingScheduler:	A deque per traversal thread. A thread
+#								pushes and pops the nodes at the back
+#								of its own deque (DFS), and, when its
+#								deque is empty, steals from the front
+#								of the other threads' deques. The
+#								append(), pop() and popleft() of a
+#								deque are atomic (in CPython), thus no
+#								lock is needed.
+#####################################################################
+
+
+#############
+# Libraries #
+#############
+
+## Python Libraries
+import heapq
+import itertools		# count
+from collections import deque
+from threading import Lock, local
+
+
+#############
+# Constants #
+#############
+
+class scheduler_vals:
+	dfs				= 0
+	bfs				= 1
+	best_first		= 2
+	work_stealing	= 3
+
+scheduler_vals_list = [
+	scheduler_vals.dfs,
+	scheduler_vals.bfs,
+	scheduler_vals.best_first,
+	scheduler_vals.work_stealing
+]
+
+class scheduler_names:
+	dfs				= "DFS"
+	bfs				= "BFS"
+	best_first		= "Best-First (Knowledge)"
+	work_stealing	= "Work Stealing"
+
+scheduler_names_list = [
+	scheduler_names.dfs,
+	scheduler_names.bfs,
+	scheduler_names.best_first,
+	scheduler_names.work_stealing
+]
+
+
+#############
+# Functions #
+#############
+
+## Create a scheduler, given its value (see scheduler_vals) and
+## the number of traversal threads
+def create_scheduler(scheduler_val, num_workers = 1):
+	assert scheduler_val in scheduler_vals_list
+	assert num_workers >= 1
+
+	if scheduler_val == scheduler_vals.dfs:
+		return DFSScheduler()
+
+	if scheduler_val == scheduler_vals.bfs:
+		return BFSScheduler()
+
+	if scheduler_val == scheduler_vals.best_first:
+		return BestFirstScheduler()
+
+	if scheduler_val == scheduler_vals.work_stealing:
+		return WorkStealingScheduler(num_workers)
+
+
+###########
+# Classes #
+###########
+
+class DFSScheduler:
+
+	def __init__(self):
+		self.nodes	= deque()
+		self.lock	= Lock()
+
+	def get_name(self):
+		return scheduler_names.dfs
+
+	def get_scheduler_val(self):
+		return scheduler_vals.dfs
+
+	def register_worker(self, worker_id):
+		pass
+
+	def push(self, node):
+		with self.lock:
+			self.nodes.append(node)
+
+	def pop(self):
+		with self.lock:
+			if not self.nodes: return None
+			return self.nodes.pop()
+
+	def is_empty(self):
+		return len(self.nodes) == 0
+
+	def get_nodes(self):
+		with self.lock:
+			return list(self.nodes)
+
+
+class BFSScheduler:
+
+	def __init__(self):
+		self.nodes	= deque()
+		self.lock	= Lock()
+
+	def get_name(self):
+		return scheduler_names.bfs
+
+	def get_scheduler_val(self):
+		return scheduler_vals.bfs
+
+	def register_worker(self, worker_id):
+		pass
+
+	def push(self, node):
+		with self.lock:
+			self.nodes.append(node)
+
+	def pop(self):
+		with self.lock:
+			if not self.nodes: return None
+			return self.nodes.popleft()
+
+	def is_empty(self):
+		return len(self.nodes) == 0
+
+	def get_nodes(self):
+		with self.lock:
+			return list(self.nodes)
+
+
+class BestFirstScheduler:
+
+	def __init__(self):
+		self.heap		= []
+		self.counter	= itertools.count()		# FIFO tie break
+		self.lock		= Lock()
+
+	def get_name(self):
+		return scheduler_names.best_first
+
+	def get_scheduler_val(self):
+		return scheduler_vals.best_first
+
+	def register_worker(self, worker_id):
+		pass
+
+	## heapq is a min heap, thus the knowledge is negated
+	def push(self, node):
+		knowledge = node.get_mg_pointer().get_knowledge_percentage()
+		with self.lock:
+			heapq.heappush(self.heap, (-knowledge, next(self.counter), node))
+
+	def pop(self):
+		with self.lock:
+			if not self.heap: return None
+			return heapq.heappop(self.heap)[2]
+
+	def is_empty(self):
+		return len(self.heap) == 0
+
+	## In the order of the expansion
+	def get_nodes(self):
+		with self.lock:
+			return [item[2] for item in sorted(self.heap)]
+
+
+class WorkStealingScheduler:
+
+	def __init__(self, num_workers):
+		assert num_workers >= 1
+
+		self.num_workers	= num_workers
+		self.deques			= [deque() for i in range(num_workers)]
+		self.worker			= local()		# the worker id of the current thread
+
+	def get_name(self):
+		return scheduler_names.work_stealing
+
+	def get_scheduler_val(self):
+		return scheduler_vals.work_stealing
+
+	def register_worker(self, worker_id):
+		assert 0 <= worker_id and worker_id < self.num_workers
+
+		self.worker.id = worker_id
+
+	def _worker_id(self):
+		return getattr(self.worker, "id", 0)
+
+	def push(self, node):
+		self.deques[self._worker_id()].append(node)
+
+	def pop(self):
+		worker_id = self._worker_id()
+
+		## own deque, LIFO
+		try:
+			return self.deques[worker_id].pop()
+		except IndexError:
+			pass
+
+		## steal, FIFO, starting from the next worker
+		for i in range(1, self.num_workers):
+			victim = (worker_id + i) % self.num_workers
+			try:
+				return self.deques[victim].popleft()
+			except IndexError:
+				continue
+
+		return None
+
+	def is_empty(self):
+		for nodes in self.deques:
+			if nodes: return False
+
+		return True
+
+	def get_nodes(self):
+		nodes = []
+		for worker_nodes in self.deques: nodes += list(worker_nodes)
+
+		return nodes
@@ -0,0 +1,214 @@
+#####################################################################
+# stand_ins.py
+# ------------------------------------------------------------------
+# Deterministic, local stand-ins for the solver executables, i.e.
+# clingo and gambit-*, so that the benchmark suite (see
+# benchmark_suite.py) runs on a plain Linux box. The executables of
+# this directory (clingo, gambit-enumpure, gambit-enummixed,
+# gambit-gnm, gambit-enumpoly) only call the functions below, thus,
+# prepending this directory to the PATH replaces the solvers.
+#
+# The stand-ins read the same stdin and print the same format as the
+# solvers, i.e.
+#
+#	1. clingo:	The program is one of adaptation.lp,
+#				adaptation_delta.lp and preprocessing.lp, together
+#				with the facts of a MG (see
+#				MisinformationGame.get_clingo_format()). The rules
+#				of the encoding (recognised by its #show directives)
+#				are evaluated with numpy, and the single answer set
+#				is printed.
+#
+#	2. gambit-*:	The program is a .nfg file (see
+#				NormalFormGame.gambit_str_file()). gambit-enumpure
+#				and gambit-enummixed are reproduced by
+#				native_solvers.py. gambit-gnm and gambit-enumpoly
+#				return the extreme Nash Equilibria, for 2-player
+#				games, or the pure Nash Equilibria, otherwise, i.e.
+#				a (deterministic) subset of the equilibria of the
+#				real solvers.
+#
+# The stand-ins do NOT reproduce the performance of the solvers.
+# They are meant for measuring the rest of the pipeline and for
+# catching its regressions.
+#####################################################################
+
+
+#############
+# Libraries #
+#############
+
+## Python Libraries
+import os
+import re
+import sys
+
+## 3rd party libraries
+import numpy as np
+
+## Custom Libraries, from the parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import native_solvers
+
+
+#############
+# Constants #
+#############
+
+## clingo facts, one per line, e.g.
+##	num_players(2).
+##	s(1, 1..3).
+##	u(0, 1, sp(1, sp(2, nul)), 3).
+##	pos(sp(1, sp(2, nul))).
+num_players_regex	= re.compile(r"^num_players\((\d+)\)\.", re.MULTILINE)
+strategies_regex	= re.compile(r"^s\((\d+),\s*1\.\.(\d+)\)\.", re.MULTILINE)
+utility_regex		= re.compile(r"^u\((\d+),\s*(\d+),\s*((?:sp\(\d+,\s*)+nul\)+),\s*(-?\d+)\)\.", re.MULTILINE)
+pos_regex			= re.compile(r"^pos\(((?:sp\(\d+,\s*)+nul\)+)\)\.", re.MULTILINE)
+
+## The encodings, by their #show directives
+class encodings:
+	adaptation			= "#show v/4."
+	adaptation_delta	= "#show delta/4."
+	preprocessing		= "#show unchanged_at/1."
+
+clingo_prologue		= "clingo version 5.6.2 (stand-in)\nReading from stdin\nSolving...\nAnswer: 1"
+clingo_epilogue		= "SATISFIABLE\n\nModels       : 1\nCalls        : 1"
+
+## The strategies of a .nfg file, the last {...} of its prologue,
+## e.g. { "Player 1" "Player 2" }{ 3 3 }
+nfg_strategies_regex = re.compile(r"\{\s*([\d\s]+)\}")
+
+
+#############
+# Functions #
+#############
+
+## sp(1, sp(2, nul)) --> (1, 2)
+def _strategy_profile(clingo_sp):
+	return tuple(int(strategy) for strategy in re.findall(r"\d+", clingo_sp))
+
+
+## (1, 2) --> sp(1,sp(2,nul)), as clingo prints it
+def _clingo_sp(strategy_profile):
+	return "".join("sp(" + str(strategy) + "," for strategy in strategy_profile) + \
+		"nul" + ")" * len(strategy_profile)
+
+
+## The utilities tensor of the MG, of shape (n+1, S_1, ..., S_n, n),
+## and the position vector (or None) of the program
+def _read_mg(program):
+	num_players	= int(num_players_regex.search(program).group(1))
+	strategies	= [0] * num_players
+	for player, num_strategies in strategies_regex.findall(program):
+		strategies[int(player) - 1] = int(num_strategies)
+
+	tensor = np.zeros((num_players + 1,) + tuple(strategies) + (num_players,), dtype=np.int64)
+	for game, player, clingo_sp, utility in utility_regex.findall(program):
+		index = tuple(strategy - 1 for strategy in _strategy_profile(clingo_sp))
+		tensor[(int(game),) + index + (int(player) - 1,)] = int(utility)
+
+	pos_vec = None
+	pos_match = pos_regex.search(program)
+	if pos_match is not None: pos_vec = _strategy_profile(pos_match.group(1))
+
+	return tensor, pos_vec
+
+
+## The knowledge atom, see adaptation.lp
+def _frac_knowledge(name, tensor):
+	knowledge		= int(np.count_nonzero(tensor[1:] == tensor[0]))
+	total_knowledge	= tensor[0].size * tensor.shape[-1]
+
+	return name + "(" + str(knowledge) + "," + str(total_knowledge) + ")"
+
+
+## The atoms of the answer set of the program, also used by
+## microbenchmarks.py for synthesizing answer sets
+def answer_set(program):
+	tensor, pos_vec = _read_mg(program)
+
+	if encodings.preprocessing in program:
+		unchanged = np.all(tensor[1:] == tensor[0], axis=(0, tensor.ndim - 1))
+		atoms = [
+			"unchanged_at(" + _clingo_sp([s + 1 for s in index]) + ")"
+			for index in np.ndindex(*unchanged.shape) if unchanged[index]
+		]
+		return atoms + ["answer_set"]
+
+	new_tensor = tensor.copy()
+	if pos_vec is not None:
+		index = tuple(strategy - 1 for strategy in pos_vec)
+		new_tensor[(slice(None),) + index] = tensor[(0,) + index]
+
+	atoms = []
+	if encodings.adaptation_delta in program:
+		for index in zip(*np.nonzero(new_tensor != tensor)):
+			atoms.append(
+				"delta(" + str(index[0]) + "," + str(index[-1] + 1) + "," +
+				_clingo_sp([s + 1 for s in index[1:-1]]) + "," + str(new_tensor[index]) + ")"
+			)
+	else:
+		for index in np.ndindex(*new_tensor.shape):
+			atoms.append(
+				"v(" + str(index[0]) + "," + str(index[-1] + 1) + "," +
+				_clingo_sp([s + 1 for s in index[1:-1]]) + "," + str(new_tensor[index]) + ")"
+			)
+
+	if np.array_equal(new_tensor, tensor):	atoms.append("unchanged")
+	else:									atoms.append("changed")
+
+	return atoms + [
+		"answer_set",
+		_frac_knowledge("new_frac_knowledge", new_tensor),
+		_frac_knowledge("old_frac_knowledge", tensor)
+	]
+
+
+def clingo_main():
+	program = sys.stdin.read()
+
+	print(clingo_prologue)
+	print(" ".join(answer_set(program)))
+	print(clingo_epilogue)
+
+
+## The utilities array of a .nfg file, of shape (S_1, ..., S_n, n).
+## The utilities are in the gambit order, i.e. the strategy of the
+## first player changes the fastest.
+def _read_nfg(nfg_file):
+	prologue, body = nfg_file.split("\n", 1)
+
+	strategies	= [int(s) for s in nfg_strategies_regex.findall(prologue)[-1].split()]
+	num_players	= len(strategies)
+
+	utilities = np.array(body.split(), dtype=np.int64)
+	utilities = utilities.reshape(tuple(reversed(strategies)) + (num_players,))
+
+	return utilities.transpose(tuple(reversed(range(num_players))) + (num_players,))
+
+
+## The -d <decimal> argument, given either as "-d 8" or "-d", "8"
+def _decimal(argv, default = 8):
+	for i, arg in enumerate(argv):
+		if arg.startswith("-d"):
+			value = arg[2:].strip()
+			if value == "" and i + 1 < len(argv): value = argv[i + 1]
+			return int(value)
+
+	return default
+
+
+## method in {"enumpure", "enummixed", "gnm", "enumpoly"}
+def gambit_main(method):
+	utilities_array = _read_nfg(sys.stdin.read())
+	num_players = utilities_array.ndim - 1
+
+	if method == "enumpure" or (method != "enummixed" and num_players > 2):
+		nash_equilibria = native_solvers.pure_nash_equilibria(utilities_array)
+	else:
+		nash_equilibria = native_solvers.extreme_point_enumeration(utilities_array, _decimal(sys.argv[1:]))
+
+	for nash_equilibrium in nash_equilibria:
+		print("NE," + ",".join(
+			str(probability) for strategy in nash_equilibrium for probability in strategy
+		))